@@ -6,6 +6,8 @@
     If the application is already running, it will be brought to the foreground.
 .PARAMETER AppName
     The name of the application to open.
+.PARAMETER AppID
+    The Start-menu AppID, when the caller already resolved the app (skips the Get-StartApps scan).
 #>
 
 <#
@@ -26,6 +28,10 @@ parameters:
     type: string
     description: The name of the application to open (supports fuzzy matching with installed apps).
     required: true
+  - name: AppID
+    type: string
+    description: The Start-menu AppID of the application, if already known.
+    required: false
 examples:
   - description: Open the Grok application
     args: { AppName: "Grok" }
@@ -36,10 +42,17 @@ examples:
 #>
 
 param (
-    [string]$AppName
+    [string]$AppName,
+    [string]$AppID = ""
 )
 
 try {
+    if ($AppID) {
+        & "$PSScriptRoot/../../say.ps1" "Opening $AppName."
+        Start-Process "shell:AppsFolder\$AppID"
+        exit 0
+    }
+
     & "$PSScriptRoot/../../say.ps1" "Okay, looking for $AppName."
 
     $allApps = Get-StartApps
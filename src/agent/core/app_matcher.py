@@ -0,0 +1,300 @@
+"""
+App Matcher - Resolves spoken application names against the Start-menu inventory.
+
+"open X" goes to open-app-by-name, and the fuzzy part of finding X used to be
+left to Gemini or to a Get-StartApps scan in PowerShell. This index works on
+tmp/startapps.csv (written by bin/list-startapps-csv.ps1):
+1. Names are reduced to a compact key: lowercase, symbols that tell apps
+   apart spelled out the way they are spoken ("Notepad++" and "notepad plus
+   plus" -> "notepadplusplus"), spoken numbers as digits ("paint three d" ->
+   "paint3d"), separators ("blackbox dot ai"), other punctuation and spaces
+   dropped. A spoken name is also looked up with its numbers as said, so
+   "one note" still finds "OneNote"
+2. Keys are indexed by character trigram; a lookup ranks the apps sharing the
+   most trigrams and scores only those: exact key, whole words ("edge" in
+   "Microsoft Edge"), prefix ("calc") or Levenshtein similarity, computed
+   last and cut off once it can't reach the leader
+3. resolve() returns an app only when it clears the threshold and isn't tied
+   with a different app ("python" with two Python versions installed)
+4. refresh() re-reads the CSV when its size or mtime changes and patches only
+   the rows that were added or removed
+"""
+import csv
+import heapq
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+DEFAULT_INVENTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "tmp", "startapps.csv"
+)
+
+# Symbols that tell apps apart ("Notepad++", "C#"), folded into the word
+# spoken for them on both sides; "&" meets the filler word "and"
+_SYMBOL_WORDS = {'+': 'plus', '#': 'sharp', '@': 'at', '&': 'and'}
+_SYMBOL_RE = re.compile(r"[+#@&]")
+_SPOKEN_ALIASES = {'ampersand': 'and'}
+# Spoken separators, dropped like the punctuation they stand for
+_SPOKEN_SEPARATORS = frozenset({'dot', 'dash', 'hyphen', 'underscore'})
+_SPOKEN_NUMBERS = {
+    'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
+    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
+}
+# Dropped from both sides so "movies and tv" meets "Movies & TV"
+_FILLER_WORDS = frozenset({'and', 'the', 'app', 'application'})
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# Apps scored in full per lookup, taken from the trigram ranking
+CANDIDATES = 10
+# Two different apps closer than this are ambiguous
+TIE_MARGIN = 0.03
+# Edit-distance matches below this similarity aren't worth reporting
+MIN_FUZZY = 0.5
+
+
+def app_words(text: str, numbers: bool = True) -> List[str]:
+    """Lowercased words of a name, with symbols spelled out, spoken numbers as
+    digits (unless numbers is False) and separators and filler dropped."""
+    words = []
+    text = _SYMBOL_RE.sub(lambda m: f" {_SYMBOL_WORDS[m.group()]} ", text.lower())
+    for token in text.split():
+        if token in _SPOKEN_SEPARATORS:
+            continue
+        token = _SPOKEN_ALIASES.get(token, token)
+        if numbers:
+            token = _SPOKEN_NUMBERS.get(token, token)
+        for word in _WORD_RE.findall(token):
+            if word not in _FILLER_WORDS:
+                words.append(word)
+    return words
+
+
+def compact_key(text: str, numbers: bool = True) -> str:
+    """Spelling- and spacing-insensitive key ("Note pad", "NotePad" -> "notepad")."""
+    return ''.join(app_words(text, numbers))
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"${key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Edit distance; stops early and returns max_distance + 1 once it must exceed max_distance."""
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class AppMatcher:
+    """Trigram index over the Start-menu apps, with edit-distance scoring."""
+
+    def __init__(self, inventory: Optional[str] = None, threshold: Optional[float] = None):
+        self.inventory = inventory or os.getenv('TALK2WINDOWS_STARTAPPS_CSV', DEFAULT_INVENTORY)
+        if threshold is None:
+            threshold = float(os.getenv('TALK2WINDOWS_APP_MATCH_THRESHOLD', '0.8'))
+        self.threshold = threshold
+        self.logger = logging.getLogger(__name__)
+        self.apps: Dict[Tuple[str, str], Dict] = {}
+        self._exact: Dict[str, List[Dict]] = {}
+        self._postings: Dict[str, Set[Tuple[str, str]]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._stats = {'lookups': 0, 'resolved': 0, 'ambiguous': 0, 'unmatched': 0}
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.apps)
+
+    @property
+    def available(self) -> bool:
+        """True when an inventory was loaded (without one, callers keep the raw name)."""
+        return bool(self.apps)
+
+    def _read_rows(self) -> List[Tuple[str, str]]:
+        with open(self.inventory, 'r', encoding='utf-8-sig', newline='') as f:
+            return [
+                (row['Name'].strip(), (row.get('AppID') or '').strip())
+                for row in csv.DictReader(f)
+                if row.get('Name') and row['Name'].strip()
+            ]
+
+    def _add(self, row: Tuple[str, str]) -> None:
+        key = compact_key(row[0])
+        if not key:
+            return
+        app = {'name': row[0], 'app_id': row[1], 'key': key, 'words': app_words(row[0])}
+        self.apps[row] = app
+        self._exact.setdefault(key, []).append(app)
+        for gram in trigrams(key):
+            self._postings.setdefault(gram, set()).add(row)
+
+    def _remove(self, row: Tuple[str, str]) -> None:
+        app = self.apps.pop(row, None)
+        if app is None:
+            return
+        same_key = [a for a in self._exact.get(app['key'], []) if a is not app]
+        if same_key:
+            self._exact[app['key']] = same_key
+        else:
+            self._exact.pop(app['key'], None)
+        for gram in trigrams(app['key']):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(row)
+                if not postings:
+                    del self._postings[gram]
+
+    def refresh(self) -> Dict[str, int]:
+        """Re-read the inventory if it changed; returns counts of added/removed apps."""
+        counts = {'added': 0, 'removed': 0}
+        try:
+            stat = os.stat(self.inventory)
+        except OSError:
+            if self._signature is not None:
+                self.logger.warning(f"App inventory disappeared: {self.inventory}")
+            return counts
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return counts
+        try:
+            rows = set(self._read_rows())
+        except (OSError, csv.Error, KeyError, UnicodeDecodeError) as e:
+            self.logger.warning(f"Could not read app inventory {self.inventory}: {e}")
+            return counts
+        self._signature = signature
+        for row in [r for r in self.apps if r not in rows]:
+            self._remove(row)
+            counts['removed'] += 1
+        for row in rows:
+            if row not in self.apps:
+                self._add(row)
+                counts['added'] += 1
+        if any(counts.values()):
+            self.logger.info(
+                "App inventory refreshed: {added} added, {removed} removed".format(**counts)
+                + f" ({len(self.apps)} apps)"
+            )
+        return counts
+
+    @staticmethod
+    def _score(key: str, app: Dict) -> Optional[Tuple[float, str]]:
+        """Score one candidate without edit distance: (score in 0..1, how it matched), or None."""
+        target = app['key']
+        if key == target:
+            return 1.0, 'exact'
+        coverage = len(key) / len(target)
+        app_words_ = app['words']
+        # The spoken words are a run of the app's words ("edge" in "Microsoft Edge")
+        for start in range(len(app_words_)):
+            run = ''
+            for word in app_words_[start:]:
+                run += word
+                if run == key:
+                    return 0.85 + 0.1 * coverage, 'words'
+                if len(run) >= len(key):
+                    break
+        if len(key) >= 3 and target.startswith(key):
+            return 0.75 + 0.2 * coverage, 'prefix'
+        return None
+
+    def match(self, spoken: str, limit: int = 5) -> List[Dict]:
+        """Best matching apps for a spoken name, as {'name', 'app_id', 'score', 'method'}."""
+        self.refresh()
+        if not self.apps:
+            return []
+        # "one note" is "1note" with numbers folded, but "OneNote" keeps its word
+        best: Dict[int, Tuple[Dict, float, str]] = {}
+        for key in {compact_key(spoken), compact_key(spoken, numbers=False)}:
+            if not key:
+                continue
+            for app, score, method in self._match_key(key):
+                if id(app) not in best or score > best[id(app)][1]:
+                    best[id(app)] = (app, score, method)
+        results = [
+            {'name': app['name'], 'app_id': app['app_id'], 'score': round(score, 3), 'method': method}
+            for app, score, method in best.values()
+        ]
+        results.sort(key=lambda r: (-r['score'], r['name']))
+        return results[:limit]
+
+    def _match_key(self, key: str) -> List[Tuple[Dict, float, str]]:
+        """(app, score, method) for the candidates of one compact key."""
+        shared: Dict[Tuple[str, str], int] = {}
+        for gram in trigrams(key):
+            for row in self._postings.get(gram, ()):
+                shared[row] = shared.get(row, 0) + 1
+        candidates = [app for app in self._exact.get(key, [])]
+        seen = {id(app) for app in candidates}
+        for row, _ in heapq.nlargest(CANDIDATES, shared.items(), key=lambda item: (item[1], item[0])):
+            app = self.apps[row]
+            if id(app) not in seen:
+                candidates.append(app)
+        scored, fuzzy = [], []
+        for app in candidates:
+            cheap = self._score(key, app)
+            if cheap is None:
+                fuzzy.append(app)
+            else:
+                scored.append((app, cheap[0], cheap[1]))
+        # Edit distance last, bounded by what could still make the list or tie the leader
+        best = max((score for _, score, _ in scored), default=0.0)
+        for app in fuzzy:
+            longest = max(len(key), len(app['key']))
+            floor = max(MIN_FUZZY, best - TIE_MARGIN)
+            max_distance = int((1.0 - floor) * longest)
+            distance = levenshtein(key, app['key'], max_distance)
+            if distance <= max_distance:
+                similarity = 1.0 - distance / longest
+                scored.append((app, similarity, 'fuzzy'))
+                best = max(best, similarity)
+        return scored
+
+    def resolve(self, spoken: str) -> Optional[Dict]:
+        """The one app a spoken name refers to, or None if none is close or it's ambiguous."""
+        start = time.perf_counter()
+        self._stats['lookups'] += 1
+        results = self.match(spoken, limit=3)
+        best = results[0] if results else None
+        outcome = 'resolved'
+        if best is None or best['score'] < self.threshold:
+            outcome, best = 'unmatched', None
+        elif len(results) > 1 and results[1]['name'].lower() != best['name'].lower() \
+                and best['score'] - results[1]['score'] < TIE_MARGIN:
+            outcome, best = 'ambiguous', None
+        self._stats[outcome] += 1
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                f"App '{spoken}': {outcome} {best['name'] if best else results[:2]} "
+                f"({(time.perf_counter() - start) * 1000:.3f}ms)"
+            )
+        return best
+
+    def stats(self) -> Dict:
+        return dict(self._stats, apps=len(self.apps))
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    matcher = AppMatcher()
+    print(f"{len(matcher)} apps in {matcher.inventory}")
+    for query in sys.argv[1:] or ["blackbox dot ai", "calc", "chrome", "note pad", "python"]:
+        start = time.perf_counter()
+        resolved = matcher.resolve(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n'{query}' -> {resolved['name'] if resolved else None} ({elapsed:.3f}ms)")
+        for result in matcher.match(query):
+            print(f"   {result['score']:.3f} {result['method']:<6} {result['name']}")
@@ -0,0 +1,370 @@
+"""
+Binary Index - Compact, versioned, memory-mappable form of the semantic index.
+
+semantic_index.json has to be parsed in full on every process start. The binary
+form is mapped with mmap and queried in place:
+1. Every string (ids, names, keywords, terms, paths) is interned once in a string table
+2. Scripts, keyword lists, postings and the file manifest are flat typed arrays
+3. Terms are sorted, so lookups and prefix expansion are binary searches
+4. Only the top-k hits are decoded into dicts; to_dict() rebuilds the full JSON form
+
+Layout (native little-endian): a fixed header, then 8-byte aligned sections whose
+offsets and lengths are recorded in the header.
+"""
+import heapq
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .search_engine import InvertedIndex, tokenize
+
+MAGIC = b'T2WIDX\x00\x01'
+FORMAT_VERSION = 1
+
+# magic, format version, index version string, counts, BM25 parameters
+_HEADER = struct.Struct('<8sII6I d5d')
+_SECTION = struct.Struct('<QQ')
+_SECTIONS = (
+    'string_offsets',   # u32[n_strings + 1]
+    'string_blob',      # utf-8 bytes
+    'docs',             # u32[n_docs * 8]: id, name, description, category, risk, has_metadata, kw_start, kw_count
+    'keyword_refs',     # u32 string ids
+    'term_strings',     # u32[n_terms], sorted by term
+    'term_starts',      # u32[n_terms + 1] into the postings arrays
+    'posting_docs',     # u32 doc indexes
+    'posting_tfs',      # f64 weighted term frequencies
+    'doc_lengths',      # f64[n_docs]
+    'file_strings',     # u32[n_files * 3]: path, id, hash
+    'file_stats',       # i64[n_files * 2]: mtime_ns, size
+)
+_DOC_FIELDS = 8
+
+
+def _align(length: int) -> int:
+    return (length + 7) & ~7
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value) -> int:
+        value = '' if value is None else str(value)
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+
+def write_binary_index(path: str, index: Dict, engine: Optional[InvertedIndex] = None) -> None:
+    """Serialize a semantic index dict (and its search engine) to path atomically."""
+    if sys.byteorder != 'little':
+        raise ValueError("Binary index is only supported on little-endian hosts")
+    scripts = index['scripts']
+    if engine is None:
+        engine = InvertedIndex.from_scripts(scripts)
+
+    strings = _StringTable()
+    # Docs are stored sorted by id so index order doubles as the id tie-break
+    doc_ids = sorted(scripts)
+    doc_index = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+
+    docs = array('I')
+    keyword_refs = array('I')
+    for doc_id in doc_ids:
+        info = scripts[doc_id]
+        keywords = [k for k in info.get('keywords', []) if isinstance(k, str)]
+        docs.extend((
+            strings.intern(doc_id),
+            strings.intern(info.get('name', doc_id)),
+            strings.intern(info.get('description', '')),
+            strings.intern(info.get('category', 'general')),
+            strings.intern(info.get('risk_level', 'low')),
+            1 if info.get('has_metadata') else 0,
+            len(keyword_refs),
+            len(keywords),
+        ))
+        keyword_refs.extend(strings.intern(k) for k in keywords)
+
+    terms = sorted(engine.postings)
+    term_strings = array('I', (strings.intern(term) for term in terms))
+    term_starts = array('I', [0])
+    posting_docs = array('I')
+    posting_tfs = array('d')
+    for term in terms:
+        for doc_id, tf in sorted(engine.postings[term].items(), key=lambda item: doc_index[item[0]]):
+            posting_docs.append(doc_index[doc_id])
+            posting_tfs.append(tf)
+        term_starts.append(len(posting_docs))
+
+    doc_lengths = array('d', (engine.doc_lengths.get(doc_id, 0.0) for doc_id in doc_ids))
+
+    file_strings = array('I')
+    file_stats = array('q')
+    for rel_path, record in index.get('files', {}).items():
+        file_strings.extend((
+            strings.intern(rel_path),
+            strings.intern(record['id']),
+            strings.intern(record['hash']),
+        ))
+        file_stats.extend((record['mtime'], record['size']))
+
+    version_id = strings.intern(index.get('version', ''))
+    blobs = [s.encode('utf-8') for s in strings.strings]
+    string_offsets = array('I', [0])
+    for blob in blobs:
+        string_offsets.append(string_offsets[-1] + len(blob))
+
+    sections = [
+        string_offsets.tobytes(), b''.join(blobs), docs.tobytes(), keyword_refs.tobytes(),
+        term_strings.tobytes(), term_starts.tobytes(), posting_docs.tobytes(),
+        posting_tfs.tobytes(), doc_lengths.tobytes(), file_strings.tobytes(), file_stats.tobytes(),
+    ]
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, version_id,
+        len(strings.strings), len(doc_ids), len(terms), len(file_stats) // 2,
+        len(posting_docs), 0,
+        sum(doc_lengths), engine.k1, engine.b, engine.prefix_weight,
+        float(engine.max_prefix_expansions), engine.phrase_boost,
+    )
+    offset = _align(_HEADER.size + _SECTION.size * len(sections))
+    table = []
+    for section in sections:
+        table.append(_SECTION.pack(offset, len(section)))
+        offset = _align(offset + len(section))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(b''.join(table))
+        for section, entry in zip(sections, table):
+            start, _ = _SECTION.unpack(entry)
+            f.write(b'\x00' * (start - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, path)
+
+
+class BinaryIndex:
+    """Read-only, memory-mapped semantic index with the same ranking as InvertedIndex."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._string_cache: Dict[int, str] = {}
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        if sys.byteorder != 'little':
+            raise ValueError("Binary index is only supported on little-endian hosts")
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Truncated binary index: {self.path}")
+        (magic, version, version_id, n_strings, n_docs, n_terms, n_files, n_postings, _,
+         total_length, self.k1, self.b, self.prefix_weight, max_expansions,
+         self.phrase_boost) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary index format in {self.path}")
+        self.max_prefix_expansions = int(max_expansions)
+        self.doc_count = n_docs
+        self.avg_length = (total_length / n_docs) if n_docs else 1.0
+
+        view = self._view = memoryview(self._mmap)
+        sections = {}
+        for i, name in enumerate(_SECTIONS):
+            start, length = _SECTION.unpack_from(self._mmap, _HEADER.size + i * _SECTION.size)
+            if start + length > len(self._mmap):
+                raise ValueError(f"Corrupt binary index section '{name}': {self.path}")
+            sections[name] = view[start:start + length]
+        self._views = sections
+
+        self._string_offsets = sections['string_offsets'].cast('I')
+        self._string_blob = sections['string_blob']
+        self._docs = sections['docs'].cast('I')
+        self._keyword_refs = sections['keyword_refs'].cast('I')
+        self._term_strings = sections['term_strings'].cast('I')
+        self._term_starts = sections['term_starts'].cast('I')
+        self._posting_docs = sections['posting_docs'].cast('I')
+        self._posting_tfs = sections['posting_tfs'].cast('d')
+        self._doc_lengths = sections['doc_lengths'].cast('d')
+        self._file_strings = sections['file_strings'].cast('I')
+        self._file_stats = sections['file_stats'].cast('q')
+        if (len(self._string_offsets) != n_strings + 1 or len(self._docs) != n_docs * _DOC_FIELDS
+                or len(self._term_strings) != n_terms or len(self._posting_docs) != n_postings
+                or len(self._file_stats) != n_files * 2):
+            raise ValueError(f"Corrupt binary index counts: {self.path}")
+        self.version = self._string(version_id)
+
+    def close(self) -> None:
+        """Release the views and the mapping."""
+        for name in ('_string_offsets', '_docs', '_keyword_refs', '_term_strings', '_term_starts',
+                     '_posting_docs', '_posting_tfs', '_doc_lengths', '_file_strings', '_file_stats'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self.__dict__.pop('_string_blob', None)
+        for view in self.__dict__.pop('_views', {}).values():
+            view.release()
+        view = self.__dict__.pop('_view', None)
+        if view is not None:
+            view.release()
+        if not self._mmap.closed:
+            self._mmap.close()
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    def _string(self, string_id: int) -> str:
+        value = self._string_cache.get(string_id)
+        if value is None:
+            start = self._string_offsets[string_id]
+            end = self._string_offsets[string_id + 1]
+            value = self._string_cache[string_id] = bytes(self._string_blob[start:end]).decode('utf-8')
+        return value
+
+    def _doc_field(self, doc: int, field: int) -> int:
+        return self._docs[doc * _DOC_FIELDS + field]
+
+    def doc_id(self, doc: int) -> str:
+        return self._string(self._doc_field(doc, 0))
+
+    def find(self, script_id: str) -> Optional[int]:
+        """Doc index of a script id, or None (docs are sorted by id)."""
+        position = bisect_left(_DocIdSequence(self), script_id)
+        if position < self.doc_count and self.doc_id(position) == script_id:
+            return position
+        return None
+
+    def script(self, doc: int) -> Dict:
+        """Decode one script entry into the JSON index shape."""
+        kw_start = self._doc_field(doc, 6)
+        kw_count = self._doc_field(doc, 7)
+        return {
+            'id': self.doc_id(doc),
+            'name': self._string(self._doc_field(doc, 1)),
+            'description': self._string(self._doc_field(doc, 2)),
+            'category': self._string(self._doc_field(doc, 3)),
+            'keywords': [self._string(self._keyword_refs[i]) for i in range(kw_start, kw_start + kw_count)],
+            'risk_level': self._string(self._doc_field(doc, 4)),
+            'has_metadata': bool(self._doc_field(doc, 5)),
+        }
+
+    def files(self) -> Iterator[Tuple[str, Dict]]:
+        """Yield (rel_path, {'id', 'mtime', 'size', 'hash'}) manifest entries."""
+        for i in range(len(self._file_stats) // 2):
+            yield self._string(self._file_strings[i * 3]), {
+                'id': self._string(self._file_strings[i * 3 + 1]),
+                'mtime': self._file_stats[i * 2],
+                'size': self._file_stats[i * 2 + 1],
+                'hash': self._string(self._file_strings[i * 3 + 2]),
+            }
+
+    def to_dict(self) -> Dict:
+        """Rebuild the full JSON-form index (for refreshing, export and debugging)."""
+        index = {'scripts': {}, 'categories': {}, 'keywords': {}, 'files': {}, 'version': self.version}
+        for doc in range(self.doc_count):
+            info = self.script(doc)
+            script_id = info['id']
+            index['scripts'][script_id] = info
+            index['categories'].setdefault(info['category'], []).append(script_id)
+            for keyword in info['keywords']:
+                index['keywords'].setdefault(keyword.lower(), []).append(script_id)
+        index['files'] = dict(self.files())
+        return index
+
+    def terms(self) -> Iterator[Tuple[str, int]]:
+        """Yield (term, document count) for every indexed term, in sorted order."""
+        starts = self._term_starts
+        for i in range(len(self._term_strings)):
+            yield self._term(i), starts[i + 1] - starts[i]
+
+    def _term(self, term_index: int) -> str:
+        return self._string(self._term_strings[term_index])
+
+    def _expand(self, token: str) -> List[Tuple[int, float]]:
+        """Return (term index, weight) pairs: exact match plus prefix matches."""
+        terms = []
+        term_count = len(self._term_strings)
+        position = bisect_left(_TermSequence(self), token)
+        if position < term_count and self._term(position) == token:
+            terms.append((position, 1.0))
+            position += 1
+        if len(token) < 3:
+            return terms
+        expansions = 0
+        while position < term_count and expansions < self.max_prefix_expansions:
+            if not self._term(position).startswith(token):
+                break
+            terms.append((position, self.prefix_weight))
+            expansions += 1
+            position += 1
+        return terms
+
+    def search(self, query: str, max_results: int = 10) -> List[Tuple[str, float]]:
+        """Return up to max_results (doc_id, score) pairs, best first."""
+        return [(self.doc_id(doc), score) for doc, score in self.search_docs(query, max_results)]
+
+    def search_docs(self, query: str, max_results: int = 10) -> List[Tuple[int, float]]:
+        """Like search, but returns doc indexes for use with script()."""
+        query_tokens = tokenize(query)
+        if not query_tokens or not self.doc_count or max_results <= 0:
+            return []
+
+        k1, b, avg_length = self.k1, self.b, self.avg_length
+        saturation = k1 + 1.0
+        starts, docs, tfs, lengths = self._term_starts, self._posting_docs, self._posting_tfs, self._doc_lengths
+        scores: Dict[int, float] = {}
+        for token in dict.fromkeys(query_tokens):
+            for term_index, term_weight in self._expand(token):
+                start, end = starts[term_index], starts[term_index + 1]
+                df = end - start
+                idf = math.log(1.0 + (self.doc_count - df + 0.5) / (df + 0.5)) * term_weight * saturation
+                for p in range(start, end):
+                    doc, tf = docs[p], tfs[p]
+                    norm = k1 * (1.0 - b + b * lengths[doc] / avg_length)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf / (tf + norm)
+
+        if len(query_tokens) > 1 and self.phrase_boost:
+            phrase = '-'.join(query_tokens)
+            for doc in scores:
+                if phrase in self.doc_id(doc).lower():
+                    scores[doc] *= self.phrase_boost
+
+        # Docs are stored sorted by id, so the index breaks ties like the id would
+        return heapq.nsmallest(max_results, scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class _TermSequence:
+    """Sequence view of the sorted term strings, for bisect."""
+
+    def __init__(self, index: BinaryIndex):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index._term_strings)
+
+    def __getitem__(self, i: int) -> str:
+        return self._index._term(i)
+
+
+class _DocIdSequence:
+    """Sequence view of the sorted doc ids, for bisect."""
+
+    def __init__(self, index: BinaryIndex):
+        self._index = index
+
+    def __len__(self) -> int:
+        return self._index.doc_count
+
+    def __getitem__(self, i: int) -> str:
+        return self._index.doc_id(i)
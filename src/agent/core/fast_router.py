@@ -0,0 +1,223 @@
+"""
+Fast Router - Resolves high-confidence commands locally instead of asking Gemini.
+
+Commands like "open calculator" or "check battery" name a script almost verbatim,
+yet every one used to pay a Gemini round trip. The router:
+1. Scores the semantic index's top match: 1.0 when the transcript spells the
+   script id, otherwise a margin over the runner-up, and 0 when the transcript
+   doesn't contain every word of the id
+2. Detects open/install intents with precompiled regexes (formerly inline in
+   AgentService._detect_app_command) and maps them to open-app-by-name or an
+   existing install-* script
+3. Resolves the app name of "open <app>" against the Start-menu inventory
+   (AppMatcher), so the script gets the exact name and AppID; when an
+   inventory exists but nothing matches, Gemini gets to interpret the name.
+   Without an inventory the name is only trusted when it names no indexed
+   script ("open street" may mean open-street-map)
+4. Dispatches locally only when confidence clears the threshold
+   (TALK2WINDOWS_FAST_PATH_THRESHOLD) and every required argument is known
+5. Logs every decision with its confidence so the threshold can be tuned
+"""
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+from .search_engine import tokenize
+
+# Words that carry no script identity; they don't count against coverage
+_STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'my', 'me', 'to', 'of', 'for', 'on', 'in', 'please', 'now',
+    'can', 'could', 'would', 'you', 'hey', 'ok', 'okay', 'just', 'i', 'want',
+})
+
+# Website indicators: explicit "website", Google services, magazines, manuals, cities, rates, music, games
+WEBSITE_KEYWORDS = ('website', 'web site', 'google', 'magazine', 'manual', 'city', 'rate', 'music', 'sound', 'game', 'wallpaper')
+_APP_VERB_RE = re.compile(r'\b(open|launch|start|run)\b')
+
+# Patterns for opening/launching apps - [^\s]+ matches any non-whitespace including dots, dashes, etc.
+_OPEN_PATTERNS = [re.compile(pattern) for pattern in (
+    # "open app grok", "open application blackbox.ai", "open program grok" and optional 'the' or 'named'
+    r'\b(open|launch|start|run)\s+(?:the\s+)?(?:app|application|program)\s+(?:named\s+)?([^\s]+(?:\s+[^\s]+)*?)(?:\s+(?:app|application|program|please|now))?\s*$',
+    # "open the grok app", "open the blackbox.ai application"
+    r'\b(open|launch|start|run)\s+the\s+([^\s]+(?:\s+[^\s]+)*?)\s+(?:app|application|program)\b',
+    # "open grok app", "open blackbox.ai application" with optional 'please' or 'now'
+    r'\b(open|launch|start|run)\s+(?:please\s+|now\s+)?([^\s]+(?:\s+[^\s]+)*?)\s+(?:app|application|program)\b',
+    # legacy pattern "open grok" or "open blackbox.ai"
+    r'\b(open|launch|start|run)\s+([^\s]+(?:\s+[^\s]+)*?)\s*$',
+)]
+_INSTALL_PATTERNS = [re.compile(pattern) for pattern in (
+    r'\b(install|download|get)\s+(\w+(?:\s+\w+)*?)(?:\s+app|\s+application)?\b',
+    r'\b(install|download|get)\s+the\s+(\w+(?:\s+\w+)*?)(?:\s+app|\s+application)?\b',
+)]
+_TRAILING_POLITE_RE = re.compile(r'\s+(please|now)$')
+
+
+def is_app_command(transcript: str) -> bool:
+    """True for open/launch/start/run commands that don't mention a website."""
+    transcript_lower = transcript.lower()
+    if any(keyword in transcript_lower for keyword in WEBSITE_KEYWORDS):
+        return False
+    return bool(_APP_VERB_RE.search(transcript_lower))
+
+
+def detect_app_command(transcript: str, scripts_dir: str, matcher=None) -> Optional[Dict]:
+    """Detect if transcript is an app-related command and extract details.
+    With an AppMatcher, open commands carry 'resolved': the inventory app or None."""
+    transcript_lower = transcript.lower()
+
+    for pattern in _OPEN_PATTERNS:
+        match = pattern.search(transcript_lower)
+        if match:
+            # Normalize name and remove common trailing polite words
+            app_name = match.group(2).strip().strip('"\'')
+            app_name = _TRAILING_POLITE_RE.sub('', app_name).strip()
+            # If the app name captured 'the' or 'application', skip to let Gemini handle it
+            if app_name.lower() in ['the', 'application', 'app', 'program', '']:
+                continue
+            command = {'action': 'open', 'app_name': app_name, 'tool': 'open-app-by-name', 'args': {'AppName': app_name}}
+            if matcher is not None and matcher.available:
+                resolved = matcher.resolve(app_name)
+                command['resolved'] = resolved
+                if resolved:
+                    command['args'] = {'AppName': resolved['name']}
+                    if resolved['app_id']:
+                        command['args']['AppID'] = resolved['app_id']
+            return command
+
+    # Also check for install commands - try to find specific install script
+    for pattern in _INSTALL_PATTERNS:
+        match = pattern.search(transcript_lower)
+        if match:
+            app_name = match.group(2).strip()
+            tool_id = f"install-{app_name.replace(' ', '-')}"
+            script_path = os.path.join(scripts_dir, 'apps', 'install', f"{tool_id}.ps1")
+            if os.path.exists(script_path):
+                return {'action': 'install', 'app_name': app_name, 'tool': tool_id, 'args': {}}
+
+    return None
+
+
+class FastPathRouter:
+    """Decides whether a transcript can skip Gemini."""
+
+    def __init__(
+        self,
+        semantic_index,
+        scripts_dir: str,
+        tools: Optional[List[Dict]] = None,
+        threshold: Optional[float] = None,
+        app_confidence: Optional[float] = None,
+        app_matcher=None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.semantic_index = semantic_index
+        self.scripts_dir = scripts_dir
+        if threshold is None:
+            threshold = float(os.getenv('TALK2WINDOWS_FAST_PATH_THRESHOLD', '0.75'))
+        if app_confidence is None:
+            app_confidence = float(os.getenv('TALK2WINDOWS_FAST_PATH_APP_CONFIDENCE', '0.8'))
+        self.threshold = threshold
+        self.app_confidence = app_confidence
+        self.app_matcher = app_matcher
+        # Tools whose schema requires arguments can't be called without Gemini filling them
+        self._required = {
+            tool['name']: set(tool.get('parameters', {}).get('required') or ())
+            for tool in (tools or [])
+        }
+        self.local = 0
+        self.escalated = 0
+
+    def semantic_confidence(self, transcript: str, matches: List[Dict]) -> float:
+        """Confidence that matches[0] is the script the transcript asks for."""
+        if not matches:
+            return 0.0
+        words = tokenize(transcript)
+        top = matches[0]
+        content = [word for word in words if word not in _STOP_WORDS]
+        if top['id'] in ('-'.join(words), '-'.join(content)):
+            return 1.0
+
+        word_set = set(words)
+        covered = [m for m in matches if set(tokenize(m['id'])) <= word_set]
+        if not covered or covered[0] is not top:
+            # The transcript doesn't spell out the top script
+            return 0.0
+        top_score = top['relevance_score']
+        runner_up = matches[1]['relevance_score'] if len(matches) > 1 else 0.0
+        margin = (top_score - runner_up) / top_score if top_score > 0 else 0.0
+        # A second spelled-out candidate makes it genuinely ambiguous
+        confidence = margin if len(covered) > 1 else 0.5 + margin / 2
+        # Each extra content word may change the meaning ("... and then ...")
+        uncovered = len(set(content) - set(tokenize(top['id'])))
+        return confidence * 0.5 ** uncovered
+
+    def names_a_script(self, app_name: str) -> bool:
+        """True when some script id contains every word of app_name (or a word starting with it)."""
+        words = [word for word in tokenize(app_name) if word not in _STOP_WORDS]
+        if not words:
+            return True
+        for script_id in self.semantic_index.script_ids():
+            id_words = tokenize(script_id)
+            if all(any(id_word.startswith(word) for id_word in id_words) for word in words):
+                return True
+        return False
+
+    def route(self, transcript: str, matches: Optional[List[Dict]] = None) -> Optional[Dict]:
+        """
+        Return {'tool', 'args', 'confidence', 'reason'} when the transcript can be
+        handled locally, otherwise None (escalate to Gemini). matches are the
+        semantic search results, if the caller already has them.
+        """
+        start = time.perf_counter()
+        if matches is None:
+            matches = self.semantic_index.search(transcript, max_results=5)
+
+        candidates = []
+        semantic = self.semantic_confidence(transcript, matches)
+        if matches:
+            candidates.append({'tool': matches[0]['id'], 'args': {}, 'confidence': semantic, 'reason': 'semantic'})
+
+        app = detect_app_command(transcript, self.scripts_dir, self.app_matcher)
+        if app and app['action'] == 'install':
+            # The script file exists, so the install intent is unambiguous
+            candidates.append({'tool': app['tool'], 'args': app['args'], 'confidence': 1.0, 'reason': 'install'})
+        elif app and semantic == 0.0 and is_app_command(transcript):
+            # No script is spelled out, so this is a plain "open <app>" request
+            if 'resolved' not in app:
+                # No inventory to check against; trust the spoken name unless
+                # it could be a script the semantic score didn't pick out
+                if not self.names_a_script(app['app_name']):
+                    candidates.append({
+                        'tool': app['tool'], 'args': app['args'], 'confidence': self.app_confidence, 'reason': 'app',
+                    })
+            elif app['resolved']:
+                candidates.append({
+                    'tool': app['tool'], 'args': app['args'],
+                    'confidence': app['resolved']['score'], 'reason': f"app {app['resolved']['method']}",
+                })
+
+        best = max(candidates, key=lambda c: c['confidence'], default=None)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        missing = best and self._required.get(best['tool'], set()) - set(best['args'])
+        if best and best['confidence'] >= self.threshold and not missing:
+            self.local += 1
+            self.logger.info(
+                f"Fast path: local {best['tool']} ({best['reason']}, confidence {best['confidence']:.2f} "
+                f">= {self.threshold:.2f}, {elapsed_ms:.1f}ms)"
+            )
+            return best
+
+        self.escalated += 1
+        if best is None:
+            self.logger.info(f"Fast path: escalate to Gemini (no candidate, {elapsed_ms:.1f}ms)")
+        else:
+            why = f"needs {', '.join(sorted(missing))}" if missing else f"confidence {best['confidence']:.2f} < {self.threshold:.2f}"
+            self.logger.info(
+                f"Fast path: escalate to Gemini (best {best['tool']} via {best['reason']}, {why}, {elapsed_ms:.1f}ms)"
+            )
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {'local': self.local, 'escalated': self.escalated}
@@ -0,0 +1,90 @@
+"""
+Model Cache - Reuses configured GenerativeModel instances across transcripts.
+
+handle_transcript builds a model around the focused tool list returned by the
+semantic search, and the same handful of tools comes back for repeated
+commands. The cache:
+1. Keys each model by a stable hash of its tool declarations
+2. Keeps at most max_size models, evicting the least recently used
+3. Expires models older than ttl seconds so config changes are picked up
+4. Counts hits, misses and evictions for logging and benchmarks
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def tool_set_key(tools: List[Dict]) -> str:
+    """Stable hash of a tool list; order matters because the model sees it in order."""
+    payload = json.dumps(tools, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ModelCache:
+    """Bounded LRU of objects built by a factory, with per-entry TTL."""
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size is None:
+            max_size = int(os.getenv('TALK2WINDOWS_MODEL_CACHE_SIZE', '32'))
+        if ttl is None:
+            ttl = float(os.getenv('TALK2WINDOWS_MODEL_CACHE_TTL', '3600'))
+        self.max_size = max(0, max_size)
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[str, Tuple[Any, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Return the cached object for key, building it with factory on a miss."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created = entry
+                if self.ttl <= 0 or now - created < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+
+        value = factory()
+        if self.max_size == 0:
+            return value
+        with self._lock:
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
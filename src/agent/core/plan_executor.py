@@ -0,0 +1,148 @@
+"""
+Plan Executor - Runs multi-step plans as a dependency graph.
+
+execute_plan used to run every step strictly in order, so a plan like
+"open notepad, open calculator, check battery" took the sum of its steps.
+The executor:
+1. Runs plans that declare no step ids or "depends_on" lists one step at a
+   time, in order, as before; the model didn't say the steps are independent
+2. Otherwise reads the ids and "depends_on" lists (ids or 0-based indexes),
+   treats steps without dependencies as independent and runs them
+   concurrently, at most max_concurrency at a time
+3. Serializes steps marked exclusive (e.g. ones that need confirmation) so
+   prompts never overlap
+4. Skips steps whose dependency failed, was skipped, is unknown or is part
+   of a cycle, and returns results in plan order
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# (observation, succeeded)
+StepResult = Tuple[str, bool]
+
+
+def declares_dependencies(plan: List[Any]) -> bool:
+    """True when any step has an id or a depends_on list (even an empty one)."""
+    return any(isinstance(step, dict) and ('id' in step or 'depends_on' in step) for step in plan)
+
+
+def normalize_plan(plan: List[Any]) -> List[Dict]:
+    """
+    Turn raw plan steps into {'index', 'tool', 'args', 'deps', 'error'} dicts.
+    deps are indexes into the plan; error is set for steps that can't run.
+    """
+    steps = []
+    keys: Dict[str, int] = {}
+    for index, raw in enumerate(plan):
+        step = raw if isinstance(raw, dict) else {}
+        args = step.get('args', {})
+        steps.append({
+            'index': index,
+            'tool': step.get('tool'),
+            'args': args if isinstance(args, dict) else {},
+            'deps': [],
+            'error': None if step.get('tool') else "Skipped step: missing tool identifier",
+            '_raw_deps': step.get('depends_on') or [],
+        })
+        if 'id' in step:
+            keys[str(step['id'])] = index
+
+    for step in steps:
+        raw_deps = step.pop('_raw_deps')
+        if not isinstance(raw_deps, list):
+            raw_deps = [raw_deps]
+        for ref in raw_deps:
+            if str(ref) in keys:
+                dep = keys[str(ref)]
+            elif isinstance(ref, int) and not isinstance(ref, bool) and 0 <= ref < len(steps):
+                dep = ref
+            else:
+                step['error'] = step['error'] or f"Skipped {step['tool']}: unknown dependency {ref!r}"
+                continue
+            if dep == step['index']:
+                step['error'] = step['error'] or f"Skipped {step['tool']}: depends on itself"
+            elif dep not in step['deps']:
+                step['deps'].append(dep)
+
+    # Steps left over by Kahn's algorithm are in (or behind) a cycle
+    remaining = {step['index']: set(step['deps']) for step in steps}
+    ready = [index for index, deps in remaining.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del remaining[done]
+        for index, deps in remaining.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(index)
+    for index in remaining:
+        step = steps[index]
+        step['error'] = step['error'] or f"Skipped {step['tool']}: dependency cycle"
+        step['deps'] = []
+    return steps
+
+
+class PlanExecutor:
+    """Executes normalized plan steps concurrently while honouring dependencies."""
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv('TALK2WINDOWS_PLAN_CONCURRENCY', '4'))
+        self.max_concurrency = max(1, max_concurrency)
+        self.logger = logging.getLogger(__name__)
+
+    async def run(
+        self,
+        plan: List[Any],
+        run_step: Callable[[Dict], Awaitable[StepResult]],
+        is_exclusive: Callable[[Dict], bool] = lambda step: False,
+    ) -> List[StepResult]:
+        """Run every step and return (observation, succeeded) per step, in plan order."""
+        steps = normalize_plan(plan)
+        slots = asyncio.Semaphore(self.max_concurrency)
+        exclusive = asyncio.Lock()
+        tasks: Dict[int, asyncio.Task] = {}
+
+        async def execute(step: Dict) -> StepResult:
+            if step['error']:
+                self.logger.warning(step['error'])
+                return step['error'], False
+            if step['deps']:
+                results = await asyncio.gather(*(tasks[dep] for dep in step['deps']))
+                for dep, (_, succeeded) in zip(step['deps'], results):
+                    if not succeeded:
+                        observation = f"Skipped {step['tool']}: dependency {steps[dep]['tool']} did not succeed"
+                        self.logger.info(observation)
+                        return observation, False
+            if is_exclusive(step):
+                # Take the lock before a slot so queued prompts don't starve other steps
+                async with exclusive, slots:
+                    return await run_step(step)
+            async with slots:
+                return await run_step(step)
+
+        if not declares_dependencies(plan):
+            return [await execute(step) for step in steps]
+
+        # Create tasks dependencies-first so every awaited task already exists
+        for step in self._topological(steps):
+            tasks[step['index']] = asyncio.ensure_future(execute(step))
+        return list(await asyncio.gather(*(tasks[step['index']] for step in steps)))
+
+    @staticmethod
+    def _topological(steps: List[Dict]) -> List[Dict]:
+        ordered, seen = [], set()
+
+        def visit(step: Dict) -> None:
+            if step['index'] in seen:
+                return
+            seen.add(step['index'])
+            for dep in step['deps']:
+                visit(steps[dep])
+            ordered.append(step)
+
+        for step in steps:
+            visit(step)
+        return ordered
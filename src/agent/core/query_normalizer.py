@@ -0,0 +1,218 @@
+"""
+Query Normalizer - Repairs speech-recognition errors in a query before search.
+
+Serenade transcripts split or merge words ("note pad", "calc later") and pick
+homophones ("whether"), and neither retriever matches words it never indexed.
+The normalizer is built from the indexed vocabulary (term -> document count)
+and rewrites only what the index can't match, plus spoken verb variants:
+1. Adjacent words whose concatenation is indexed are joined ("blue tooth" ->
+   "bluetooth"); a pair with an unknown word is also joined by sound
+   ("calc later" -> "calculator")
+2. Unknown words that start an indexed term are kept; the retrievers already
+   expand prefixes ("calc")
+3. Verb variants are mapped to the canonical verb ("launch" -> "open",
+   "terminate" -> "close") when they lead the query, even if a synopsis
+   indexed them, and elsewhere only when they are unknown; a word of a script
+   id is never mapped ("open start settings" names open-start-settings)
+4. Other unknown words are split into two indexed words ("taskmanager" ->
+   "task manager"), or matched by their phonetic key ("whether" -> "weather")
+Phonetic keys (a compact Metaphone) are computed once per indexed term, so a
+query costs a few dict lookups per word.
+"""
+import logging
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .app_matcher import levenshtein
+from .search_engine import tokenize
+
+# Spoken variants -> the word scripts are indexed under
+SYNONYMS = {
+    'launch': 'open', 'start': 'open', 'run': 'open',
+    'kill': 'close', 'quit': 'close', 'exit': 'close', 'terminate': 'close',
+}
+
+# A phonetic match must still be this similar in spelling ("whether" / "weather")
+MIN_PHONETIC_SIMILARITY = 0.5
+# Shorter words are too often real words that just aren't indexed
+MIN_REPAIR_LENGTH = 3
+
+_VOWELS = frozenset('aeiou')
+_INITIAL_SILENT = ('kn', 'gn', 'pn', 'ae', 'wr')
+
+
+def phonetic_key(word: str) -> str:
+    """Metaphone-style key: consonant sounds, with the first vowel kept."""
+    word = ''.join(c for c in word.lower() if c.isalnum())
+    if word[:2] in _INITIAL_SILENT:
+        word = word[1:]
+    elif word.startswith('x'):
+        word = 's' + word[1:]
+    elif word.startswith('wh'):
+        word = 'w' + word[2:]
+    key = []
+    for i, c in enumerate(word):
+        prev = word[i - 1] if i else ''
+        nxt = word[i + 1] if i + 1 < len(word) else ''
+        after = word[i + 2] if i + 2 < len(word) else ''
+        if c == prev and c != 'c':
+            continue
+        if c.isdigit():
+            key.append(c)
+        elif c in _VOWELS:
+            if i == 0:
+                key.append('A')
+        elif c == 'b':
+            if not (prev == 'm' and not nxt):
+                key.append('B')
+        elif c == 'c':
+            if nxt == 'h' or (nxt == 'i' and after == 'a'):
+                key.append('K' if prev == 's' else 'X')
+            elif nxt in ('i', 'e', 'y'):
+                if prev != 's':
+                    key.append('S')
+            else:
+                key.append('K')
+        elif c == 'd':
+            key.append('J' if nxt == 'g' and after in ('e', 'i', 'y') else 'T')
+        elif c == 'g':
+            if nxt == 'h' and after and after not in _VOWELS:
+                continue
+            if nxt == 'n' and (not after or word[i + 1:] == 'ned'):
+                continue
+            if prev == 'd' and nxt in ('e', 'i', 'y'):
+                continue
+            key.append('J' if nxt in ('e', 'i', 'y') else 'K')
+        elif c == 'h':
+            if prev in ('c', 's', 'p', 't', 'g'):
+                continue
+            if prev in _VOWELS and nxt not in _VOWELS:
+                continue
+            key.append('H')
+        elif c == 'k':
+            if prev != 'c':
+                key.append('K')
+        elif c == 'p':
+            key.append('F' if nxt == 'h' else 'P')
+        elif c == 'q':
+            key.append('K')
+        elif c == 's':
+            key.append('X' if nxt == 'h' or (nxt == 'i' and after in ('o', 'a')) else 'S')
+        elif c == 't':
+            if nxt == 'i' and after in ('o', 'a'):
+                key.append('X')
+            elif nxt == 'h':
+                key.append('0')
+            elif not (nxt == 'c' and after == 'h'):
+                key.append('T')
+        elif c == 'v':
+            key.append('F')
+        elif c in ('w', 'y'):
+            if nxt in _VOWELS:
+                key.append(c.upper())
+        elif c == 'x':
+            key.append('KS')
+        elif c == 'z':
+            key.append('S')
+        else:
+            key.append(c.upper())
+    return ''.join(key)
+
+
+class QueryNormalizer:
+    """Rewrites out-of-vocabulary query words into indexed terms."""
+
+    def __init__(self, vocabulary: Dict[str, int], id_words: Iterable[str] = ()):
+        self.logger = logging.getLogger(__name__)
+        self.vocabulary = vocabulary
+        # Words of script ids are meant literally, never as synonyms
+        self.id_words = frozenset(id_words)
+        self._sorted = sorted(vocabulary)
+        self._phonetic: Dict[str, List[str]] = {}
+        for term in vocabulary:
+            if len(term) >= MIN_REPAIR_LENGTH and not term.isdigit():
+                self._phonetic.setdefault(phonetic_key(term), []).append(term)
+        # Synonyms only help when the canonical word is indexed
+        self.synonyms = {word: canonical for word, canonical in SYNONYMS.items() if canonical in vocabulary}
+        self._stats = {'queries': 0, 'rewritten': 0}
+
+    def _is_prefix(self, word: str) -> bool:
+        position = bisect_left(self._sorted, word)
+        return position < len(self._sorted) and self._sorted[position].startswith(word)
+
+    def _sounds_like(self, word: str) -> Optional[str]:
+        """The indexed term with the same phonetic key and the closest spelling."""
+        best: Optional[Tuple[float, int, str]] = None
+        for term in self._phonetic.get(phonetic_key(word), ()):
+            similarity = 1.0 - levenshtein(word, term) / max(len(word), len(term))
+            if similarity < MIN_PHONETIC_SIMILARITY:
+                continue
+            candidate = (similarity, self.vocabulary[term], term)
+            if best is None or candidate > best:
+                best = candidate
+        return best[2] if best else None
+
+    def _split(self, word: str) -> Optional[List[str]]:
+        """Two indexed words that make up word, preferring the most even split."""
+        best = None
+        for cut in range(MIN_REPAIR_LENGTH, len(word) - MIN_REPAIR_LENGTH + 1):
+            head, tail = word[:cut], word[cut:]
+            if head in self.vocabulary and tail in self.vocabulary:
+                evenness = min(len(head), len(tail))
+                if best is None or evenness > best[0]:
+                    best = (evenness, [head, tail])
+        return best[1] if best else None
+
+    def _repair(self, word: str, leading: bool = False) -> List[str]:
+        # A leading "launch" is the verb even when some synopsis indexed it
+        if word in self.synonyms and word not in self.id_words and (leading or word not in self.vocabulary):
+            return [self.synonyms[word]]
+        if word in self.vocabulary or len(word) < MIN_REPAIR_LENGTH or word.isdigit():
+            return [word]
+        if self._is_prefix(word):
+            return [word]
+        split = self._split(word)
+        if split:
+            return split
+        sounds_like = self._sounds_like(word)
+        return [sounds_like] if sounds_like else [word]
+
+    def _join(self, words: List[str], sounds: bool) -> List[str]:
+        """Join adjacent pairs that are indexed as one word (or, with sounds, sound like one)."""
+        joined: List[str] = []
+        i = 0
+        while i < len(words):
+            if i + 1 < len(words):
+                first, second = words[i], words[i + 1]
+                word = None
+                if not sounds:
+                    # "what s" (from "what's") isn't "whats"
+                    if min(len(first), len(second)) >= 2 and first + second in self.vocabulary:
+                        word = first + second
+                elif min(len(first), len(second)) >= MIN_REPAIR_LENGTH and not (
+                        first in self.vocabulary and second in self.vocabulary):
+                    word = self._sounds_like(first + second)
+                if word:
+                    joined.append(word)
+                    i += 2
+                    continue
+            joined.append(words[i])
+            i += 1
+        return joined
+
+    def normalize(self, query: str) -> str:
+        """The query with unmatched words repaired; unchanged if nothing needed repair."""
+        self._stats['queries'] += 1
+        words = tokenize(query)
+        # Exact joins first, so "on blue tooth" isn't read as "onblue tooth"
+        joined = self._join(self._join(words, sounds=False), sounds=True)
+        normalized = [repaired for i, word in enumerate(joined) for repaired in self._repair(word, i == 0)]
+        if normalized == words:
+            return query
+        self._stats['rewritten'] += 1
+        rewritten = ' '.join(normalized)
+        self.logger.debug(f"Normalized query '{query}' -> '{rewritten}'")
+        return rewritten
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, terms=len(self.vocabulary), phonetic_keys=len(self._phonetic))
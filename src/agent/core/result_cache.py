@@ -0,0 +1,214 @@
+"""
+Result Cache - Maps repeated transcripts straight to the tool call Gemini chose.
+
+Most voice traffic is a small set of repeated utterances, and each one used to
+make a full Gemini round trip. The cache:
+1. Normalizes transcripts (case, punctuation, filler words like "please"/"now")
+2. Stores normalized transcript -> (tool name, args) with LRU and TTL eviction
+3. Persists entries to memory/result_cache.json so they survive restarts
+4. Drops every entry when tools.json changes, since tool names/schemas may differ
+5. Optionally matches near-identical transcripts (difflib ratio >= threshold)
+
+Cached calls are still run through AgentService.confirm, so risk levels apply.
+"""
+import difflib
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+FILLER_WORDS = frozenset({
+    'please', 'now', 'hey', 'ok', 'okay', 'um', 'uh', 'just', 'kindly', 'thanks', 'thank',
+})
+# Leading politeness that never changes which tool runs
+_LEADING_PHRASE_RE = re.compile(r'^(?:(?:can|could|would|will)\s+you\s+|i\s+want\s+(?:you\s+)?to\s+)')
+_WORD_RE = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Lowercase, drop punctuation and filler words, collapse whitespace.
+    Dots and apostrophes inside words survive so "blackbox.ai" stays one name."""
+    words = _WORD_RE.findall(transcript.lower())
+    text = _LEADING_PHRASE_RE.sub('', ' '.join(words))
+    return ' '.join(word for word in text.split() if word not in FILLER_WORDS)
+
+
+def default_cache_path() -> str:
+    return os.path.join(os.path.dirname(__file__), "..", "memory", "memory", "result_cache.json")
+
+
+def default_catalog_path() -> str:
+    return os.path.join(os.path.dirname(__file__), "tools.json")
+
+
+class ResultCache:
+    """Persistent LRU/TTL cache of normalized transcript -> tool call."""
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        catalog_path: Optional[str] = None,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        fuzzy_threshold: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.path = path or default_cache_path()
+        self.catalog_path = catalog_path or default_catalog_path()
+        if max_size is None:
+            max_size = int(os.getenv('TALK2WINDOWS_RESULT_CACHE_SIZE', '256'))
+        if ttl is None:
+            ttl = float(os.getenv('TALK2WINDOWS_RESULT_CACHE_TTL', str(7 * 24 * 3600)))
+        if fuzzy_threshold is None:
+            # 0 disables fuzzy matching; e.g. 0.92 accepts small transcription slips
+            fuzzy_threshold = float(os.getenv('TALK2WINDOWS_RESULT_CACHE_FUZZY', '0'))
+        self.max_size = max(0, max_size)
+        self.ttl = ttl
+        self.fuzzy_threshold = fuzzy_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._catalog_stat: Any = False  # never equal to a real stat, so the first check hashes
+        self._catalog_hash = None
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._load()
+
+    # Catalog fingerprint
+
+    def _check_catalog(self) -> None:
+        """Clear the cache if tools.json changed since entries were stored."""
+        try:
+            stat = os.stat(self.catalog_path)
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stat_key = None
+        if stat_key == self._catalog_stat:
+            return
+        self._catalog_stat = stat_key
+        catalog_hash = None
+        if stat_key is not None:
+            with open(self.catalog_path, 'rb') as f:
+                catalog_hash = hashlib.sha256(f.read()).hexdigest()
+        if catalog_hash != self._catalog_hash:
+            if self._entries:
+                self.logger.info("tools.json changed - clearing result cache")
+                self.invalidations += 1
+            self._entries.clear()
+            self._catalog_hash = catalog_hash
+
+    # Persistence
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = None
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Ignoring unreadable result cache {self.path}: {e}")
+            data = None
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self._catalog_hash = data.get('catalog_hash')
+            for key, entry in data.get('entries', []):
+                self._entries[key] = entry
+        with self._lock:
+            self._check_catalog()
+
+    def save(self) -> None:
+        """Write entries (in LRU order) atomically."""
+        with self._lock:
+            data = {
+                'version': self.VERSION,
+                'catalog_hash': self._catalog_hash,
+                'entries': list(self._entries.items()),
+            }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save result cache: {e}")
+
+    # Lookups
+
+    def _live(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl > 0 and now - entry['created'] >= self.ttl:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, transcript: str) -> Optional[Dict[str, Any]]:
+        """Return {'tool', 'args', 'key', 'fuzzy'} for a cached transcript, else None."""
+        key = normalize_transcript(transcript)
+        if not key:
+            return None
+        now = self._clock()
+        with self._lock:
+            self._check_catalog()
+            entry = self._live(key, now)
+            fuzzy = False
+            if entry is None and self.fuzzy_threshold > 0:
+                for candidate in difflib.get_close_matches(key, list(self._entries), n=3, cutoff=self.fuzzy_threshold):
+                    entry = self._live(candidate, now)
+                    if entry is not None:
+                        key, fuzzy = candidate, True
+                        break
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if fuzzy:
+                self.fuzzy_hits += 1
+            else:
+                self.hits += 1
+            return {'tool': entry['tool'], 'args': dict(entry['args']), 'key': key, 'fuzzy': fuzzy}
+
+    def put(self, transcript: str, tool: str, args: Dict[str, Any]) -> None:
+        """Remember the tool call for transcript and persist the cache."""
+        key = normalize_transcript(transcript)
+        if not key or self.max_size == 0:
+            return
+        with self._lock:
+            self._check_catalog()
+            self._entries[key] = {'tool': tool, 'args': dict(args), 'created': self._clock()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        self.save()
+
+    def discard(self, key: str) -> None:
+        """Forget an entry by the normalized key get() returned (e.g. after it failed)."""
+        with self._lock:
+            removed = self._entries.pop(key, None)
+        if removed is not None:
+            self.save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.fuzzy_hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'fuzzy_hits': self.fuzzy_hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': round((self.hits + self.fuzzy_hits) / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,211 @@
+"""
+Script Scanner - One pass over scripts/ that feeds both the catalog and the index.
+
+ToolCatalogManager and SemanticIndex used to walk the tree separately, open every
+file twice and disagree about which comment block holds the metadata. The scanner:
+1. Walks scripts/ once, in a stable (sorted) order
+2. Reads each file once and fingerprints it (mtime, size, sha256)
+3. Parses the YAML header once, using the first <# #> block that contains 'id:'
+4. Emits a plain dict record that tools.json and semantic_index.json are derived from
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .parallel_build import map_chunked
+from ..utils.lazy_import import lazy_import
+
+# Only needed when a script's header is actually parsed
+yaml = lazy_import('yaml')
+
+_COMMENT_BLOCK_RE = re.compile(r'<#(.*?)#>', re.DOTALL)
+
+
+def default_scripts_dir() -> str:
+    return os.path.join(os.path.dirname(__file__), "..", "..", "..", "scripts")
+
+
+def decode_script(data: bytes) -> str:
+    """Decode script bytes; Windows PowerShell scripts without a BOM are often ANSI."""
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('cp1252', errors='replace')
+
+
+def extract_yaml_header(content: str) -> Optional[str]:
+    """Return the first <# ... #> block that contains 'id:', stripped."""
+    for block in _COMMENT_BLOCK_RE.findall(content):
+        if 'id:' in block:
+            return block.strip()
+    return None
+
+
+def extract_synopsis(content: str) -> Optional[str]:
+    """Return the comment-based help .SYNOPSIS text up to the next '.', if any."""
+    start = content.find('.SYNOPSIS')
+    if start < 0:
+        return None
+    start += len('.SYNOPSIS')
+    end = content.find('.', start + 1)
+    if end < 0:
+        return None
+    return content[start:end].strip() or None
+
+
+class ScriptScanner:
+    """Walks the scripts tree and produces one metadata record per script."""
+
+    def __init__(self, scripts_dir: Optional[str] = None):
+        self.scripts_dir = scripts_dir or default_scripts_dir()
+        self.logger = logging.getLogger(__name__)
+
+    def iter_files(self) -> Iterator[Tuple[str, str]]:
+        """Yield (relative posix path, absolute path) for every indexable script."""
+        for root, dirs, files in os.walk(self.scripts_dir):
+            dirs.sort()
+            rel_root = os.path.relpath(root, self.scripts_dir).replace(os.sep, '/')
+            prefix = '' if rel_root == '.' else rel_root + '/'
+            for file in sorted(files):
+                if file.endswith('.ps1') and not file.startswith('_'):
+                    yield prefix + file, os.path.join(root, file)
+
+    def scan_file(self, item: Tuple[str, str], data: Optional[bytes] = None) -> Dict:
+        """
+        Read and parse one (rel_path, path) item. The record always carries
+        id/path/file; fingerprint and header fields are None when unreadable.
+        """
+        rel_path, path = item
+        record = {
+            'id': os.path.splitext(os.path.basename(path))[0],
+            'path': rel_path,
+            'file': path,
+            'mtime': None,
+            'size': None,
+            'hash': None,
+            'metadata': None,
+            'synopsis': None,
+            'error': None,
+        }
+        try:
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            stat = os.stat(path)
+            record['mtime'] = stat.st_mtime_ns
+            record['size'] = stat.st_size
+            record['hash'] = hashlib.sha256(data).hexdigest()
+            content = decode_script(data)
+        except Exception as e:
+            self.logger.error(f"Error processing {path}: {e}")
+            record['error'] = str(e)
+            return record
+
+        record['synopsis'] = extract_synopsis(content)
+        yaml_content = extract_yaml_header(content)
+        if yaml_content:
+            try:
+                metadata = yaml.safe_load(yaml_content)
+            except yaml.YAMLError as e:
+                self.logger.error(f"YAML parsing error in {path}: {e}")
+                record['error'] = str(e)
+            else:
+                if isinstance(metadata, dict):
+                    record['metadata'] = metadata
+        return record
+
+    def scan(self, items: Optional[Iterable[Tuple[str, str]]] = None, workers: int = 1) -> List[Dict]:
+        """Scan every script (or the given items) and return records in scan order."""
+        items = list(self.iter_files() if items is None else items)
+        if workers == 1:
+            return [self.scan_file(item) for item in items]
+        return map_chunked(self.scan_file, items, workers=workers)
+
+
+def find_duplicate_ids(items: Iterable[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """Map each script id found in more than one file to its relative paths."""
+    seen: Dict[str, List[str]] = {}
+    for rel_path, path in items:
+        seen.setdefault(os.path.splitext(os.path.basename(path))[0], []).append(rel_path)
+    return {script_id: paths for script_id, paths in seen.items() if len(paths) > 1}
+
+
+class ScriptPathMap:
+    """
+    Script id -> absolute path, so the executor never has to search scripts/.
+    Built lazily from one directory walk; a miss (unknown id or deleted file)
+    rebuilds it, at most once per min_rebuild_interval seconds.
+    """
+
+    def __init__(self, scripts_dir: Optional[str] = None, min_rebuild_interval: float = 2.0):
+        self.scanner = ScriptScanner(scripts_dir)
+        self.min_rebuild_interval = min_rebuild_interval
+        self.logger = logging.getLogger(__name__)
+        self._paths: Optional[Dict[str, str]] = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self.duplicates: Dict[str, List[str]] = {}
+
+    def build(self) -> Dict[str, str]:
+        """Walk scripts/ and rebuild the map. The first file in walk order wins a duplicate id."""
+        items = list(self.scanner.iter_files())
+        paths: Dict[str, str] = {}
+        for rel_path, path in items:
+            paths.setdefault(os.path.splitext(os.path.basename(path))[0], os.path.abspath(path))
+        self.duplicates = find_duplicate_ids(items)
+        for script_id, rel_paths in self.duplicates.items():
+            self.logger.warning(f"Duplicate script id '{script_id}': {', '.join(rel_paths)} (using {rel_paths[0]})")
+        self._paths = paths
+        self._built_at = time.monotonic()
+        return paths
+
+    def invalidate(self) -> None:
+        """Forget the map; the next resolve() walks scripts/ again."""
+        with self._lock:
+            self._paths = None
+
+    def resolve(self, script_id: str) -> Optional[str]:
+        """Return the absolute path of a script id, or None if there is no such script."""
+        with self._lock:
+            paths = self._paths if self._paths is not None else self.build()
+            path = paths.get(script_id)
+            if path is not None and os.path.exists(path):
+                return path
+            # Stale map: the script was added, moved or deleted since the last walk
+            if time.monotonic() - self._built_at >= self.min_rebuild_interval:
+                path = self.build().get(script_id)
+            else:
+                path = None
+            return path
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._paths if self._paths is not None else self.build())
+
+
+def build_all(scripts_dir: Optional[str] = None, workers: int = 1) -> Tuple[int, int]:
+    """Scan scripts/ once and write both tools.json and semantic_index.json.
+    Returns (tool count, indexed script count)."""
+    from .semantic_index import SemanticIndex
+    from .tool_catalog_manager import ToolCatalogManager
+
+    records = ScriptScanner(scripts_dir).scan(workers=workers)
+    catalog = ToolCatalogManager(scripts_dir=scripts_dir).generate_catalog(records=records)
+    index = SemanticIndex(scripts_dir=scripts_dir, records=records)
+    return len(catalog['tools']), len(index.index['scripts'])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build tools.json and semantic_index.json in one scan")
+    parser.add_argument('--scripts-dir', default=None)
+    parser.add_argument('--workers', type=int, default=1, help="0 = one worker per core")
+    args = parser.parse_args()
+    tools, scripts = build_all(args.scripts_dir, args.workers)
+    print(f"Catalog: {tools} tools, semantic index: {scripts} scripts")
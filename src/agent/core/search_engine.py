@@ -0,0 +1,190 @@
+"""
+Search Engine - Tokenized inverted index with BM25 scoring for script lookup.
+
+The semantic index used to score every script against every query with nested
+substring checks. This engine keeps postings per token instead, so a query only
+touches the scripts that share at least one token (or token prefix) with it:
+1. Every indexed field (id, name, keywords, description) is tokenized
+2. Tokens map to postings of {script_id: weighted term frequency}
+3. Candidates drawn from the postings are scored with BM25
+4. The top N results are selected with a heap instead of a full sort
+"""
+import heapq
+import math
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Matches in the id/name say far more about a script than its description does
+FIELD_WEIGHTS = {
+    'id': 3.0,
+    'name': 3.0,
+    'keywords': 2.0,
+    'description': 1.0,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _field_texts(value) -> Iterable[str]:
+    """Yield the searchable strings of a field (keywords may hold example dicts)."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        description = value.get('description')
+        if isinstance(description, str):
+            yield description
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _field_texts(item)
+
+
+class InvertedIndex:
+    """Inverted index over script entries with BM25-style ranking."""
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        prefix_weight: float = 0.5,
+        max_prefix_expansions: int = 32,
+        phrase_boost: float = 2.0,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.prefix_weight = prefix_weight
+        self.max_prefix_expansions = max_prefix_expansions
+        self.phrase_boost = phrase_boost
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.doc_lengths: Dict[str, float] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._total_length = 0.0
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._norms: Dict[str, float] = {}
+        self._norms_dirty = False
+
+    @classmethod
+    def from_scripts(cls, scripts: Dict[str, Dict], **kwargs) -> 'InvertedIndex':
+        """Build an index from the semantic index 'scripts' map."""
+        engine = cls(**kwargs)
+        for script_id, script_info in scripts.items():
+            engine.add(script_id, script_info)
+        return engine
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: str, entry: Dict) -> None:
+        """Tokenize an entry and add its terms to the postings."""
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        frequencies: Dict[str, float] = {}
+        fields = dict(entry)
+        fields.setdefault('id', doc_id)
+        for field, weight in FIELD_WEIGHTS.items():
+            for text in _field_texts(fields.get(field)):
+                for token in tokenize(text):
+                    frequencies[token] = frequencies.get(token, 0.0) + weight
+
+        for token, frequency in frequencies.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                self._vocabulary_dirty = True
+            postings[doc_id] = frequency
+
+        length = sum(frequencies.values())
+        self.doc_lengths[doc_id] = length
+        self._doc_terms[doc_id] = list(frequencies)
+        self._total_length += length
+        self._norms_dirty = True
+
+    def remove(self, doc_id: str) -> None:
+        """Drop an entry and its postings (no-op if it was never added)."""
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        for token in self._doc_terms.pop(doc_id, []):
+            postings = self.postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[token]
+                self._vocabulary_dirty = True
+        self._total_length -= length
+        self._norms_dirty = True
+
+    def _sorted_vocabulary(self) -> List[str]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        return self._vocabulary
+
+    def _length_norms(self) -> Dict[str, float]:
+        """BM25 length normalization per document, refreshed after changes."""
+        if self._norms_dirty:
+            avg_length = self._total_length / len(self.doc_lengths) or 1.0
+            self._norms = {
+                doc_id: self.k1 * (1.0 - self.b + self.b * length / avg_length)
+                for doc_id, length in self.doc_lengths.items()
+            }
+            self._norms_dirty = False
+        return self._norms
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Return (term, weight) pairs for a query token: exact plus prefix matches."""
+        terms = []
+        if token in self.postings:
+            terms.append((token, 1.0))
+        # Short tokens ("a", "to") would expand to half the vocabulary
+        if len(token) < 3:
+            return terms
+        vocabulary = self._sorted_vocabulary()
+        position = bisect_left(vocabulary, token)
+        expansions = 0
+        while position < len(vocabulary) and expansions < self.max_prefix_expansions:
+            term = vocabulary[position]
+            if not term.startswith(token):
+                break
+            if term != token:
+                terms.append((term, self.prefix_weight))
+                expansions += 1
+            position += 1
+        return terms
+
+    def _idf(self, term: str) -> float:
+        doc_count = len(self.doc_lengths)
+        df = len(self.postings[term])
+        return math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, max_results: int = 10) -> List[Tuple[str, float]]:
+        """Return up to max_results (doc_id, score) pairs, best first."""
+        query_tokens = tokenize(query)
+        if not query_tokens or not self.doc_lengths or max_results <= 0:
+            return []
+
+        norms = self._length_norms()
+        saturation = self.k1 + 1.0
+        scores: Dict[str, float] = {}
+        for token in dict.fromkeys(query_tokens):
+            for term, term_weight in self._expand(token):
+                idf = self._idf(term) * term_weight * saturation
+                for doc_id, tf in self.postings[term].items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf / (tf + norms[doc_id])
+
+        # Reward scripts whose id spells out the whole query ("open calculator")
+        if len(query_tokens) > 1 and self.phrase_boost:
+            phrase = '-'.join(query_tokens)
+            for doc_id in scores:
+                if phrase in doc_id.lower():
+                    scores[doc_id] *= self.phrase_boost
+
+        top = heapq.nsmallest(max_results, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(doc_id, score) for doc_id, score in top]
@@ -4,129 +4,362 @@ Instead of sending 1000+ tools to Gemini, we:
 1. Build a semantic index of all scripts (keywords, descriptions, categories)
 2. When user makes a request, first search the index
 3. Only send the top 5-10 relevant tools to Gemini for final selection
+
+Search scores BM25 over the keywords by default. TALK2WINDOWS_RETRIEVER=hybrid
+blends it with a TF-IDF word and character n-gram retriever (vector_index.py)
+that also finds shortened words ("launch calc"), and 'vector' uses that alone;
+on the tests/natural_language phrases both recall no more than BM25, at about
+2.5x its latency, so 'keyword' stays the default.
+Queries first pass through QueryNormalizer (query_normalizer.py), which repairs
+split, merged and misheard words against the indexed vocabulary;
+TALK2WINDOWS_QUERY_NORMALIZATION=0 turns it off.
 """
+import hashlib
 import json
 import logging
 import os
-from pathlib import Path
-from typing import Dict, List, Optional
-import yaml
+import sys
+from typing import Dict, Iterator, List, Optional
+
+from .binary_index import BinaryIndex, write_binary_index
+from .parallel_build import PhaseTimer
+from .query_normalizer import QueryNormalizer
+from .script_scanner import ScriptScanner
+from .search_engine import InvertedIndex, tokenize
+from .vector_index import VectorIndex, blend, fingerprint, load_numpy
+
+
+INDEX_VERSION = '1.1'
+
+RETRIEVERS = ('hybrid', 'keyword', 'vector')
+
+# Candidates taken from each retriever before blending
+BLEND_POOL = 20
 
 
 class SemanticIndex:
     """Manages a semantic index of all PowerShell scripts."""
     
-    def __init__(self, scripts_dir: Optional[str] = None):
+    def __init__(
+        self,
+        scripts_dir: Optional[str] = None,
+        index_file: Optional[str] = None,
+        incremental: bool = True,
+        workers: int = 1,
+        records: Optional[List[Dict]] = None,
+        index_format: Optional[str] = None,
+        retriever: Optional[str] = None,
+        normalize: Optional[bool] = None,
+    ):
         self.logger = logging.getLogger(__name__)
         self.scripts_dir = scripts_dir or os.path.join(
             os.path.dirname(__file__), "..", "..", "..", "scripts"
         )
-        self.index_file = os.path.join(
+        self.index_file = index_file or os.path.join(
             os.path.dirname(__file__), "..", "config", "semantic_index.json"
         )
-        self.index = self._load_or_build_index()
+        # 'binary' (default) keeps a memory-mapped semantic_index.bin next to the
+        # JSON path; 'json' keeps the old indented JSON file only
+        self.index_format = index_format or os.getenv('TALK2WINDOWS_INDEX_FORMAT', 'binary')
+        self.binary_file = os.path.splitext(self.index_file)[0] + '.bin'
+        self.vector_file = os.path.splitext(self.index_file)[0] + '.vec'
+        self.retriever = retriever or os.getenv('TALK2WINDOWS_RETRIEVER', 'keyword')
+        if self.retriever not in RETRIEVERS:
+            raise ValueError(f"Unknown retriever: {self.retriever}")
+        # Share of the blended score that comes from the vector retriever
+        self.vector_weight = float(os.getenv('TALK2WINDOWS_VECTOR_WEIGHT', '0.5'))
+        if normalize is None:
+            normalize = os.getenv('TALK2WINDOWS_QUERY_NORMALIZATION', '1') != '0'
+        self.normalize = normalize
+        self.incremental = incremental
+        self.workers = workers
+        self.scanner = ScriptScanner(self.scripts_dir)
+        self._engine: Optional[InvertedIndex] = None
+        self._vectors: Optional[VectorIndex] = None
+        self._normalizer: Optional[QueryNormalizer] = None
+        self._binary: Optional[BinaryIndex] = None
+        self._index: Optional[Dict] = None
+        self.last_build_timings: Dict[str, float] = {}
+        if records is not None:
+            # Records from a shared scan (see script_scanner.build_all)
+            self.index = self._build_index(records=records)
+        else:
+            self._index = self._load_or_build_index()
+    
+    @property
+    def index(self) -> Dict:
+        """The index in its JSON form; decoded from the binary file on first access."""
+        if self._index is None:
+            self._index = self._binary.to_dict() if self._binary is not None else self._empty_index()
+        return self._index
+    
+    @index.setter
+    def index(self, value: Dict) -> None:
+        self._index = value
+        self._release_binary()
     
-    def _load_or_build_index(self) -> Dict:
-        """Load existing index or build a new one."""
+    def _release_binary(self) -> None:
+        if self._binary is not None:
+            self._binary.close()
+            self._binary = None
+    
+    def _open_binary(self) -> Optional[BinaryIndex]:
+        try:
+            binary = BinaryIndex(self.binary_file)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable binary index {self.binary_file}: {e}")
+            return None
+        if binary.version != INDEX_VERSION:
+            binary.close()
+            return None
+        return binary
+    
+    def _binary_is_fresh(self, binary: BinaryIndex) -> bool:
+        """True when no script was added, removed or modified since the binary was written."""
+        current = dict(self.scanner.iter_files())
+        manifest = 0
+        for rel_path, record in binary.files():
+            manifest += 1
+            path = current.get(rel_path)
+            if path is None:
+                return False
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if record['mtime'] != stat.st_mtime_ns or record['size'] != stat.st_size:
+                return False
+        return manifest == len(current)
+    
+    def _load_or_build_index(self) -> Optional[Dict]:
+        """Load existing index (refreshing changed scripts) or build a new one.
+        Returns None when a fresh binary index was mapped instead of decoded."""
+        if self.index_format == 'binary' and os.path.exists(self.binary_file):
+            binary = self._open_binary()
+            if binary is not None:
+                if not self.incremental or self._binary_is_fresh(binary):
+                    self._binary = binary
+                    return None
+                # Something changed: decode once and patch it like the JSON index
+                self._index = binary.to_dict()
+                binary.close()
+                self.refresh()
+                return self._index
         if os.path.exists(self.index_file):
             with open(self.index_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return self._build_index()
+                index = json.load(f)
+            if not self.incremental:
+                return index
+            # Indexes written before file tracking can't be patched, rebuild them once
+            if index.get('version') == INDEX_VERSION and 'files' in index:
+                self._index = index
+                self.refresh()
+                return self._index
+            self.logger.info("Semantic index has no file manifest, rebuilding")
+        return self._build_index(workers=self.workers)
     
-    def _build_index(self) -> Dict:
-        """Build semantic index from all scripts."""
-        self.logger.info("Building semantic index from all scripts...")
-        index = {
+    @staticmethod
+    def _empty_index() -> Dict:
+        return {
             'scripts': {},
             'categories': {},
             'keywords': {},
-            'version': '1.0'
+            'files': {},
+            'version': INDEX_VERSION
         }
+    
+    def _build_index(self, workers: int = 1, records: Optional[List[Dict]] = None) -> Dict:
+        """Build semantic index from all scripts (or from already scanned records).
         
-        scripts_path = Path(self.scripts_dir)
-        if not scripts_path.exists():
-            self.logger.warning(f"Scripts directory not found: {self.scripts_dir}")
-            return index
-        
-        # Use recursive glob to find all .ps1 files in subdirectories
-        for script_file in scripts_path.rglob("*.ps1"):
-            if script_file.name.startswith('_'):
-                continue  # Skip internal scripts
-            
-            script_id = script_file.stem
-            script_info = self._extract_script_info(script_file)
-            
-            if script_info:
-                index['scripts'][script_id] = script_info
-                
-                # Index by category
-                category = script_info.get('category', 'general')
-                if category not in index['categories']:
-                    index['categories'][category] = []
-                index['categories'][category].append(script_id)
-                
-                # Index by keywords
-                for keyword in script_info.get('keywords', []):
-                    keyword_lower = keyword.lower()
-                    if keyword_lower not in index['keywords']:
-                        index['keywords'][keyword_lower] = []
-                    index['keywords'][keyword_lower].append(script_id)
+        workers > 1 (or 0 for one per core) scans scripts in a process pool;
+        records are merged in scan order so the saved index is identical to
+        the serial build.
+        """
+        self.logger.info("Building semantic index from all scripts...")
+        timer = PhaseTimer()
+        index = self._empty_index()
         
-        # Save index
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2)
+        if records is None:
+            if not os.path.exists(self.scripts_dir):
+                self.logger.warning(f"Scripts directory not found: {self.scripts_dir}")
+                return index
+            with timer.phase('scan'):
+                items = list(self.scanner.iter_files())
+            with timer.phase('extract'):
+                records = self.scanner.scan(items, workers=workers)
+        with timer.phase('merge'):
+            for record in records:
+                self._merge_record(index, record)
         
-        self.logger.info(f"Built index with {len(index['scripts'])} scripts")
+        with timer.phase('write'):
+            self._save_index(index)
+        self.last_build_timings = timer.report()
+        self.logger.info(f"Built index with {len(index['scripts'])} scripts ({timer.format()})")
         return index
     
-    def _extract_script_info(self, script_file: Path) -> Optional[Dict]:
-        """Extract metadata and generate smart summary from script."""
-        try:
-            with open(script_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Try to extract YAML metadata first
-            metadata = self._extract_yaml_metadata(content)
-            if metadata:
-                return {
-                    'id': script_file.stem,
-                    'name': metadata.get('name', script_file.stem),
-                    'description': metadata.get('description', ''),
-                    'category': metadata.get('category', 'general'),
-                    'keywords': metadata.get('keywords', []) + 
-                                metadata.get('examples', []) +
-                                [script_file.stem.replace('-', ' ')],
-                    'risk_level': metadata.get('risk_level', 'low'),
-                    'has_metadata': True
-                }
-            
-            # Fallback: generate from script name and comments
-            return self._generate_from_script_name(script_file, content)
-            
-        except Exception as e:
-            self.logger.warning(f"Error extracting info from {script_file.name}: {e}")
-            return None
+    def _save_index(self, index: Dict) -> None:
+        """Write the index atomically so a crash never leaves half a file."""
+        if self.index_format == 'binary':
+            engine = self._engine if index is self._index else None
+            write_binary_index(self.binary_file, index, engine)
+        else:
+            self.export_json(index=index)
     
-    def _extract_yaml_metadata(self, content: str) -> Optional[Dict]:
-        """Extract YAML metadata from script comments."""
-        try:
-            if '<#' in content and '#>' in content:
-                start = content.index('<#') + 2
-                end = content.index('#>', start)
-                comment_block = content[start:end]
-                
-                # Try to parse as YAML
-                metadata = yaml.safe_load(comment_block)
-                if isinstance(metadata, dict):
-                    return metadata
-        except:
-            pass
-        return None
+    def export_json(self, path: Optional[str] = None, index: Optional[Dict] = None) -> str:
+        """Write the index as indented JSON (the debugging view of the binary index)."""
+        path = path or self.index_file
+        tmp_file = f"{path}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index if index is None else index, f, indent=2)
+        os.replace(tmp_file, path)
+        return path
+    
+    def _merge_record(self, index: Dict, record: Dict) -> None:
+        """Add a scanned script to the files/scripts/categories/keywords maps."""
+        if record['hash'] is None:
+            return  # Unreadable, the scanner already logged it
+        script_id = record['id']
+        index['files'][record['path']] = {
+            'id': script_id,
+            'mtime': record['mtime'],
+            'size': record['size'],
+            'hash': record['hash']
+        }
+        script_info = self._script_info_from_record(record)
+        
+        if script_id in index['scripts']:
+            self._unindex_script(index, script_id)
+        index['scripts'][script_id] = script_info
+        
+        # Index by category
+        category = script_info.get('category', 'general')
+        index['categories'].setdefault(category, []).append(script_id)
+        
+        # Index by keywords
+        for keyword_lower in self._keyword_terms(script_info):
+            index['keywords'].setdefault(keyword_lower, []).append(script_id)
+        
+        if index is self._index:
+            self._vectors = None
+            self._normalizer = None
+        if self._engine is not None and index is self.index:
+            self._engine.add(script_id, script_info)
+    
+    def _unindex_script(self, index: Dict, script_id: str) -> None:
+        """Remove a script from the scripts/categories/keywords maps."""
+        script_info = index['scripts'].pop(script_id, None)
+        if script_info is None:
+            return
+        
+        category = script_info.get('category', 'general')
+        self._discard(index['categories'], category, script_id)
+        for keyword_lower in self._keyword_terms(script_info):
+            self._discard(index['keywords'], keyword_lower, script_id)
+        
+        if index is self._index:
+            self._vectors = None
+            self._normalizer = None
+        if self._engine is not None and index is self.index:
+            self._engine.remove(script_id)
+    
+    @staticmethod
+    def _keyword_terms(script_info: Dict) -> List[str]:
+        return [k.lower() for k in script_info.get('keywords', []) if isinstance(k, str)]
     
-    def _generate_from_script_name(self, script_file: Path, content: str) -> Dict:
-        """Generate metadata from script name and content analysis."""
-        script_id = script_file.stem
+    @staticmethod
+    def _discard(mapping: Dict[str, List[str]], key: str, script_id: str) -> None:
+        remaining = [s for s in mapping.get(key, []) if s != script_id]
+        if remaining:
+            mapping[key] = remaining
+        else:
+            mapping.pop(key, None)
+    
+    def refresh(self) -> Dict[str, int]:
+        """
+        Re-extract only the scripts added, changed or deleted since the index
+        was written. Unchanged files cost a stat; files whose mtime/size moved
+        are hashed and only re-parsed if the content really changed.
+        Returns counts of added/changed/removed scripts.
+        """
+        counts = {'added': 0, 'changed': 0, 'removed': 0}
+        if not os.path.exists(self.scripts_dir):
+            self.logger.warning(f"Scripts directory not found: {self.scripts_dir}")
+            return counts
+        
+        if self._binary is not None and self._binary_is_fresh(self._binary):
+            return counts
+        index = self.index
+        # The mapped binary no longer matches the tree; work on the decoded dict from now on
+        self._release_binary()
+        files = index.setdefault('files', {})
+        current = dict(self.scanner.iter_files())
+        dirty = False
         
+        # Drop deleted scripts first so a moved script is re-added cleanly
+        for rel_path in [p for p in files if p not in current]:
+            self._unindex_script(index, files.pop(rel_path)['id'])
+            counts['removed'] += 1
+            dirty = True
+        
+        for rel_path, path in current.items():
+            previous = files.get(rel_path)
+            try:
+                stat = os.stat(path)
+                if previous and previous['mtime'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+                    continue
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                self.logger.warning(f"Error reading {os.path.basename(path)}: {e}")
+                continue
+            
+            dirty = True
+            if previous and previous['hash'] == hashlib.sha256(data).hexdigest():
+                # Touched but not modified (e.g. fresh checkout)
+                previous['mtime'] = stat.st_mtime_ns
+                continue
+            if previous:
+                self._unindex_script(index, previous['id'])
+                counts['changed'] += 1
+            else:
+                counts['added'] += 1
+            self._merge_record(index, self.scanner.scan_file((rel_path, path), data))
+        
+        if dirty:
+            self._save_index(index)
+        if any(counts.values()):
+            self.logger.info(
+                "Semantic index refreshed: {added} added, {changed} changed, {removed} removed".format(**counts)
+            )
+        return counts
+    
+    def _script_info_from_record(self, record: Dict) -> Dict:
+        """Build the index entry for a scanned script."""
+        script_id = record['id']
+        metadata = record.get('metadata')
+        if metadata:
+            # Examples are {'description', 'args'} dicts in the YAML header
+            examples = [
+                ex.get('description') if isinstance(ex, dict) else ex
+                for ex in metadata.get('examples') or []
+            ]
+            return {
+                'id': script_id,
+                'name': metadata.get('name', script_id),
+                'description': metadata.get('description', ''),
+                'category': metadata.get('category', 'general'),
+                'keywords': [k for k in metadata.get('keywords') or [] if isinstance(k, str)] +
+                            [e for e in examples if isinstance(e, str)] +
+                            [script_id.replace('-', ' ')],
+                'risk_level': metadata.get('risk_level', 'low'),
+                'has_metadata': True
+            }
+        
+        # Fallback: generate from script name and comments
+        return self._generate_from_script_name(script_id, record.get('synopsis'))
+    
+    def _generate_from_script_name(self, script_id: str, synopsis: Optional[str] = None) -> Dict:
+        """Generate metadata from script name and its .SYNOPSIS, if any."""
         # Generate natural language description from script name
         words = script_id.replace('-', ' ')
         
@@ -152,85 +385,125 @@ class SemanticIndex:
             *script_id.split('-')
         ]
         
-        # Try to extract .SYNOPSIS from PowerShell comment-based help
-        description = words
-        if '.SYNOPSIS' in content:
-            try:
-                start = content.index('.SYNOPSIS') + 9
-                end = content.index('.', start + 1)
-                synopsis = content[start:end].strip()
-                if synopsis:
-                    description = synopsis
-            except:
-                pass
-        
         return {
             'id': script_id,
             'name': words,
-            'description': description,
+            'description': synopsis or words,
             'category': category,
             'keywords': keywords,
             'risk_level': 'low',
             'has_metadata': False
         }
     
+    @property
+    def engine(self) -> InvertedIndex:
+        """Inverted index over the loaded scripts, built on first use."""
+        if self._engine is None:
+            self._engine = InvertedIndex.from_scripts(self.index['scripts'])
+        return self._engine
+
+    def _fingerprint(self) -> bytes:
+        """Identifies the scripts behind the index, from the file manifest."""
+        if self._index is None and self._binary is not None:
+            files = self._binary.files()
+        else:
+            files = self.index.get('files', {}).items()
+        return fingerprint((path, record['hash']) for path, record in files)
+
+    @property
+    def vectors(self) -> VectorIndex:
+        """TF-IDF retriever over the loaded scripts, loaded from disk or built on first use."""
+        if self._vectors is None:
+            digest = self._fingerprint()
+            if os.path.exists(self.vector_file):
+                try:
+                    vectors = VectorIndex.load(self.vector_file)
+                    if vectors.fingerprint == digest:
+                        self._vectors = vectors
+                        return vectors
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"Ignoring unreadable vector index {self.vector_file}: {e}")
+            self._vectors = VectorIndex.from_scripts(self.index['scripts'], fingerprint=digest)
+            try:
+                self._vectors.save(self.vector_file)
+            except OSError as e:
+                self.logger.warning(f"Could not save vector index {self.vector_file}: {e}")
+        return self._vectors
+
+    @property
+    def normalizer(self) -> QueryNormalizer:
+        """Query normalizer over the indexed terms, built on first use."""
+        if self._normalizer is None:
+            if self._binary is not None and self._engine is None:
+                vocabulary = dict(self._binary.terms())
+            else:
+                vocabulary = {term: len(postings) for term, postings in self.engine.postings.items()}
+            id_words = {word for script_id in self.script_ids() for word in tokenize(script_id)}
+            self._normalizer = QueryNormalizer(vocabulary, id_words)
+        return self._normalizer
+
+    def warm_up(self) -> None:
+        """Load the vector retriever (and NumPy, if installed) before the first search."""
+        if self.normalize:
+            _ = self.normalizer
+        if self.retriever != 'keyword':
+            _ = self.vectors
+            load_numpy()
+
+    def _keyword_hits(self, query: str, max_results: int, docs: bool = False) -> List[tuple]:
+        """BM25 (script id, score) pairs. With docs, a mapped index returns its doc
+        numbers instead, so _script decodes the hits without looking the ids up."""
+        if self._binary is not None and self._engine is None:
+            if docs:
+                return self._binary.search_docs(query, max_results)
+            return self._binary.search(query, max_results)
+        return self.engine.search(query, max_results)
+
+    def _script(self, ref) -> Dict:
+        """The index entry for a script id, or for a doc number of the mapped index."""
+        if self._index is None and self._binary is not None:
+            return self._binary.script(ref if isinstance(ref, int) else self._binary.find(ref))
+        return self.index['scripts'][ref].copy()
+
     def search(self, query: str, max_results: int = 10) -> List[Dict]:
         """
         Search the index for scripts matching the query.
-        Returns top N most relevant scripts.
+        Returns top N most relevant scripts. 'keyword' scores BM25 over the
+        postings of the query tokens, 'vector' scores TF-IDF cosine and
+        'hybrid' blends the two (see vector_index.blend).
         """
-        query_lower = query.lower()
-        query_words = query_lower.split()
-        
-        # Score each script
-        scores = {}
-        
-        for script_id, script_info in self.index['scripts'].items():
-            score = 0
-            
-            # Exact match in ID (highest score)
-            if query_lower in script_id.lower():
-                score += 100
-            
-            # Match in keywords
-            for keyword in script_info.get('keywords', []):
-                keyword_lower = keyword.lower()
-                if query_lower == keyword_lower:
-                    score += 50
-                elif query_lower in keyword_lower:
-                    score += 30
-                # Partial word matches
-                for word in query_words:
-                    if word in keyword_lower:
-                        score += 10
-            
-            # Match in description
-            description = script_info.get('description', '').lower()
-            if query_lower in description:
-                score += 40
-            for word in query_words:
-                if word in description:
-                    score += 5
-            
-            # Match in name
-            name = script_info.get('name', '').lower()
-            if query_lower in name:
-                score += 60
-            
-            if score > 0:
-                scores[script_id] = score
-        
-        # Sort by score and return top N
-        sorted_scripts = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        if self.normalize:
+            query = self.normalizer.normalize(query)
+        if self.retriever == 'keyword':
+            hits = self._keyword_hits(query, max_results, docs=True)
+        elif self.retriever == 'vector':
+            hits = self.vectors.search(query, max_results)
+        else:
+            pool = max(max_results, BLEND_POOL)
+            hits = blend(
+                self._keyword_hits(query, pool), self.vectors.search(query, pool),
+                self.vector_weight, max_results,
+            )
         results = []
-        
-        for script_id, score in sorted_scripts[:max_results]:
-            result = self.index['scripts'][script_id].copy()
-            result['relevance_score'] = score
+        for ref, score in hits:
+            result = self._script(ref)
+            result['relevance_score'] = round(score, 3)
             results.append(result)
-        
         return results
     
+    def __len__(self) -> int:
+        """Number of indexed scripts (without decoding a mapped index)."""
+        if self._index is None and self._binary is not None:
+            return len(self._binary)
+        return len(self.index['scripts'])
+    
+    def script_ids(self) -> Iterator[str]:
+        """Ids of every indexed script (without decoding a mapped index)."""
+        if self._index is None and self._binary is not None:
+            binary = self._binary
+            return (binary.doc_id(doc) for doc in range(len(binary)))
+        return iter(list(self.index['scripts']))
+
     def get_category_scripts(self, category: str) -> List[str]:
         """Get all scripts in a category."""
         return self.index['categories'].get(category, [])
@@ -239,9 +512,12 @@ class SemanticIndex:
         """Get all available categories."""
         return list(self.index['categories'].keys())
     
-    def rebuild_index(self):
-        """Force rebuild the index."""
-        self.index = self._build_index()
+    def rebuild_index(self, workers: int = 1, records: Optional[List[Dict]] = None):
+        """Force rebuild the index (workers > 1 scans in a process pool)."""
+        self.index = self._build_index(workers=workers, records=records)
+        self._engine = None
+        self._vectors = None
+        self._normalizer = None
         return len(self.index['scripts'])
 
 
@@ -250,8 +526,10 @@ if __name__ == "__main__":
     
     # Build and test the index
     index = SemanticIndex()
+    if '--export-json' in sys.argv:
+        print(f"Exported JSON index to {index.export_json()}")
     
-    print(f"\nBuilt index with {len(index.index['scripts'])} scripts")
+    print(f"\nBuilt index with {len(index)} scripts")
     print(f"Categories: {', '.join(index.get_all_categories())}")
     
     # Test searches
@@ -1,37 +1,79 @@
 import asyncio
+import contextvars
 import hashlib
 import json
 import logging
 import os
-from typing import Callable, Optional, List, Dict
-
-import google.generativeai as genai
+from typing import Callable, Optional, List, Dict, Tuple
 
 from ..config.config import get_gemini_api_key, setup_environment
-from ..memory.store import MemoryStore
+from ..memory.store import create_memory_store
 from ..execution.powershell_executor import PowerShellExecutor
+from ..execution.powershell_pool import PooledPowerShellExecutor
+from ..execution.argument_validation import ArgumentValidator, to_plain
 from ..core.tool_catalog_manager import ToolCatalogManager
 from ..core.semantic_index import SemanticIndex
-from ..utils.tts import TTS
+from ..core.script_scanner import ScriptPathMap
+from ..core.model_cache import ModelCache, tool_set_key
+from ..core.result_cache import ResultCache
+from ..core.app_matcher import AppMatcher
+from ..core.fast_router import FastPathRouter, detect_app_command, is_app_command
+from ..core.plan_executor import PlanExecutor
+from ..core.worker_pools import WorkerPools
+from ..utils import startup_profile, tracing
+from ..utils.lazy_import import lazy_import
+from ..utils.tts import HIGH, TTS
+
+# Imported on the first Gemini call; cached and fast-path commands never pay for it
+genai = lazy_import('google.generativeai')
 
-# Set up environment variables for consistent operation
-setup_environment()
 
 class AgentService:
     def __init__(
         self,
         api_key: Optional[str] = None,
         prompt_provider: Optional[Callable[[str], str]] = None,
+        model_factory: Optional[Callable[[List[Dict]], object]] = None,
+        executor=None,
+    ):
+        """model_factory(tools) and executor replace Gemini and PowerShell (load tests)."""
+        with startup_profile.phase('AgentService init'):
+            self._init(api_key, prompt_provider, model_factory, executor)
+
+    def _init(
+        self,
+        api_key: Optional[str],
+        prompt_provider: Optional[Callable[[str], str]],
+        model_factory: Optional[Callable[[List[Dict]], object]],
+        executor,
     ):
+        # Set up environment variables for consistent operation
+        setup_environment()
         self.logger = logging.getLogger(__name__)
-        self.catalog_manager = ToolCatalogManager()
-        self.executor = PowerShellExecutor()
-        self.semantic_index = SemanticIndex()  # Smart script discovery
-        catalog = self.catalog_manager.load_catalog()
+        # Stage spans go to the sinks named in TALK2WINDOWS_TRACE_SINKS (none by default)
+        tracing.configure_from_env()
+        with startup_profile.phase('tool catalog'):
+            self.catalog_manager = ToolCatalogManager()
+            catalog = self.catalog_manager.load_catalog()
+        with startup_profile.phase('semantic index'):
+            self.semantic_index = SemanticIndex()  # Smart script discovery
         self.tools = catalog.get('tools', [])
         self.risk_levels = catalog.get('risk_levels', {})
-        self.tts = TTS()
-        self.memory = MemoryStore()
+        with startup_profile.phase('executor'):
+            # Script id -> path, so run-script.ps1 doesn't search scripts/ on every call
+            self.script_paths = ScriptPathMap(self.catalog_manager.scripts_dir)
+            # Arguments are checked against tools.json before PowerShell is started
+            validator = ArgumentValidator(self.tools)
+            # 'pool' keeps warm PowerShell hosts (best with the agent daemon); 'process' spawns per call
+            if executor is not None:
+                self.executor = executor
+            elif os.getenv('TALK2WINDOWS_EXECUTOR', 'process') == 'pool':
+                self.executor = PooledPowerShellExecutor(path_map=self.script_paths, validator=validator)
+            else:
+                self.executor = PowerShellExecutor(path_map=self.script_paths, validator=validator)
+        with startup_profile.phase('tts and memory'):
+            self.tts = TTS()
+            self.memory = create_memory_store()
         self.prompt_provider = prompt_provider or self._default_prompt
         # confirmation policy: 'prompt' (default), 'auto', 'voice'
         self.confirm_policy = os.getenv('TALK2WINDOWS_CONFIRM_POLICY', 'prompt')
@@ -45,8 +87,11 @@ class AgentService:
         with open(planner_path, 'r', encoding='utf-8') as file:
             self.system_instruction = file.read().strip()
 
-        api_key_to_use = api_key or get_gemini_api_key()
-        genai.configure(api_key=api_key_to_use)
+        # Gemini is configured and the full-catalog model built on first use
+        self._api_key = api_key
+        self._gemini_configured = False
+        self._model = None
+        self._model_factory = model_factory or self._gemini_model
         
         # Configure tool config to require function calling
         tool_config = {
@@ -54,58 +99,116 @@ class AgentService:
                 'mode': 'ANY'  # Force function calling instead of natural language responses
             }
         }
-        
-        self.model = genai.GenerativeModel(
+        self.tool_config = tool_config
+        with startup_profile.phase('caches and router'):
+            # Focused models keyed by their tool set, so repeated commands skip construction
+            self.model_cache = ModelCache()
+            # Repeated transcripts replay the tool call Gemini chose last time
+            self.result_cache = None
+            if os.getenv('TALK2WINDOWS_RESULT_CACHE', '1') != '0':
+                self.result_cache = ResultCache()
+            # "open <app>" names are checked against the Start-menu inventory
+            self.app_matcher = None
+            if os.getenv('TALK2WINDOWS_APP_MATCHER', '1') != '0':
+                self.app_matcher = AppMatcher()
+            # Commands that spell out a script (or "open <app>") skip Gemini entirely
+            self.router = None
+            if os.getenv('TALK2WINDOWS_FAST_PATH', '1') != '0':
+                self.router = FastPathRouter(
+                    self.semantic_index, self.catalog_manager.scripts_dir, tools=self.tools,
+                    app_matcher=self.app_matcher,
+                )
+        # Independent plan steps run concurrently; dependent steps wait
+        self.plan_executor = PlanExecutor()
+        # Blocking work runs on per-workload pools instead of the default executor
+        self.pools = WorkerPools()
+
+    def _configure_gemini(self) -> None:
+        if not self._gemini_configured:
+            with startup_profile.phase('configure Gemini'):
+                genai.configure(api_key=self._api_key or get_gemini_api_key())
+            self._gemini_configured = True
+
+    def _gemini_model(self, tools: List[Dict]):
+        self._configure_gemini()
+        return genai.GenerativeModel(
             model_name='gemini-2.5-flash',  # Using faster 2.5 flash model
             system_instruction=self.system_instruction,
-            tools=self.tools,
+            tools=tools,
         )
-        self.tool_config = tool_config
+
+    @property
+    def model(self):
+        """The model with the full tool catalog, built on first use."""
+        if self._model is None:
+            self._model = self._model_factory(self.tools)
+        return self._model
+
+    @model.setter
+    def model(self, value):
+        self._model = value
+
+    def warm_up(self) -> None:
+        """Import and configure Gemini now instead of on the first command (for the daemon)."""
+        _ = self.model
+        self.semantic_index.warm_up()
 
     def _default_prompt(self, prompt_text: str) -> str:
         return input(prompt_text)
 
+    async def _run_blocking(self, pool: str, func: Callable, *args):
+        """Run a blocking call on the named worker pool (llm, script, prompt, cache)."""
+        # run_in_executor drops contextvars; copy them so the request id reaches the pool thread
+        context = contextvars.copy_context()
+        return await asyncio.get_event_loop().run_in_executor(
+            self.pools.get(pool), context.run, func, *args
+        )
+
     async def _prompt_user(self, prompt_text: str) -> str:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.prompt_provider, prompt_text)
+        return await self._run_blocking('prompt', self.prompt_provider, prompt_text)
 
     async def execute_plan(self, plan):
-        """Execute a sequence of steps from the plan."""
-        observations = []
-        for step in plan:
-            tool = step.get('tool') if isinstance(step, dict) else None
-            if not tool:
-                observations.append("Skipped step: missing tool identifier")
-                continue
-            raw_args = step.get('args', {}) if isinstance(step, dict) else {}
-            args = raw_args if isinstance(raw_args, dict) else {}
+        """Execute the steps of a plan, running independent steps concurrently."""
+        actions = []
+
+        async def run_step(step):
+            tool, args = step['tool'], step['args']
             level = self.risk_levels.get(tool, 'low')
-            if not await self.confirm(f"Execute {tool}", level):
+            with tracing.span('confirm', tool=tool):
+                confirmed = await self.confirm(f"Execute {tool}", level)
+            if not confirmed:
                 observation = f"Skipped {tool}: not confirmed"
-                observations.append(observation)
                 self.logger.info(observation)
-                continue
+                return observation, False
             try:
-                exit_code, stdout, stderr = await asyncio.get_event_loop().run_in_executor(
-                    None, self.executor.run, tool, args
-                )
-                observation = self._format_execution_observation(
-                    tool, exit_code, stdout, stderr
-                )
-                observations.append(observation)
-                self.logger.info(observation)
-                # Log to memory
-                self.memory.recent_actions.append(
-                    {'tool': tool, 'args': args, 'result': observation}
-                )
-                self.memory.save('recent_actions', self.memory.recent_actions)
+                with tracing.span('execute', tool=tool):
+                    exit_code, stdout, stderr = await self._run_blocking(
+                        'script', self.executor.run, tool, args
+                    )
             except Exception as e:
                 observation = f"Failed {tool}: {e}"
-                observations.append(observation)
                 self.logger.error(observation)
+                return observation, False
+            observation = self._format_execution_observation(
+                tool, exit_code, stdout, stderr
+            )
+            self.logger.info(observation)
+            actions.append((step['index'], {'tool': tool, 'args': args, 'result': observation}))
+            return observation, exit_code == 0
+
+        # Steps that need confirmation run one at a time so prompts don't overlap
+        with tracing.span('plan', steps=len(plan)):
+            results = await self.plan_executor.run(
+                plan, run_step,
+                is_exclusive=lambda step: self.risk_levels.get(step['tool'], 'low') != 'low',
+            )
+        observations = [observation for observation, _ in results]
+        # Log to memory once per plan, in plan order
+        if actions:
+            self.memory.append_actions([action for _, action in sorted(actions, key=lambda a: a[0])])
         # Summarize
         summary = "Completed plan: " + "; ".join(observations)
-        await asyncio.get_event_loop().run_in_executor(None, self.tts.say, summary)
+        self.tts.say(summary)
         return summary
 
     def _format_execution_observation(
@@ -127,9 +230,7 @@ class AgentService:
             return True
         elif level == 'medium':
             # Ask "Proceed?"
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.tts.say, f"{text}. Proceed?"
-            )
+            self.tts.say(f"{text}. Proceed?", priority=HIGH)
             if self.confirm_policy == 'auto':
                 return True
             if self.confirm_policy == 'voice':
@@ -140,9 +241,7 @@ class AgentService:
             return response == 'yes'
         elif level == 'high':
             # Ask for passphrase
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.tts.say, f"{text}. Confirm with passphrase."
-            )
+            self.tts.say(f"{text}. Confirm with passphrase.", priority=HIGH)
             passphrase = await self._prompt_user("Enter passphrase (or 'setup' to create one): ")
             # If first-run 'setup', ask to set passphrase
             if passphrase.strip().lower() == 'setup':
@@ -150,11 +249,11 @@ class AgentService:
                 first = await self._prompt_user('Enter new passphrase: ')
                 second = await self._prompt_user('Confirm new passphrase: ')
                 if first != second:
-                    await asyncio.get_event_loop().run_in_executor(None, self.tts.say, 'Passphrases do not match')
+                    self.tts.say('Passphrases do not match', priority=HIGH)
                     return False
                 # Save hashed passphrase
                 self.memory.set_passphrase(first)
-                await asyncio.get_event_loop().run_in_executor(None, self.tts.say, 'Passphrase stored')
+                self.tts.say('Passphrase stored', priority=HIGH)
                 passphrase = first
             hashed = hashlib.sha256(passphrase.encode()).hexdigest()
             stored = self.memory.get_passphrase_hash()
@@ -163,105 +262,83 @@ class AgentService:
 
     def _detect_app_command(self, transcript: str) -> Optional[Dict]:
         """Detect if transcript is an app-related command and extract details."""
-        import re
-        transcript_lower = transcript.lower()
-        
-        # Patterns for opening/launching apps - updated to capture dots, dashes, and special chars
-        # Pattern explanation: [^\s]+ matches any non-whitespace including dots, dashes, etc.
-        open_patterns = [
-                # "open app grok", "open application blackbox.ai", "open program grok" and optional 'the' or 'named'
-                r'\b(open|launch|start|run)\s+(?:the\s+)?(?:app|application|program)\s+(?:named\s+)?([^\s]+(?:\s+[^\s]+)*?)(?:\s+(?:app|application|program|please|now))?\s*$',
-                # "open the grok app", "open the blackbox.ai application"
-                r'\b(open|launch|start|run)\s+the\s+([^\s]+(?:\s+[^\s]+)*?)\s+(?:app|application|program)\b',
-                # "open grok app", "open blackbox.ai application" with optional 'please' or 'now'
-                r'\b(open|launch|start|run)\s+(?:please\s+|now\s+)?([^\s]+(?:\s+[^\s]+)*?)\s+(?:app|application|program)\b',
-                # legacy pattern "open grok" or "open blackbox.ai"
-                r'\b(open|launch|start|run)\s+([^\s]+(?:\s+[^\s]+)*?)\s*$'
-            ]
-        
-        for pattern in open_patterns:
-            match = re.search(pattern, transcript_lower)
-            if match:
-                action = match.group(1)
-                app_name = match.group(2).strip()
-                # Normalize name and return
-                app_name = app_name.strip().strip('"\'')
-                # Remove common trailing polite words
-                app_name = re.sub(r'\s+(please|now)$', '', app_name).strip()
-                # If the app name captured 'the' or 'application', skip to let Gemini handle it
-                if app_name.lower() in ['the', 'application', 'app', 'program', '']:
-                    continue
-                if app_name:
-                    return {'action': 'open', 'app_name': app_name, 'tool': 'open-app-by-name', 'args': {'AppName': app_name}}
-        
-        # Also check for install commands - try to find specific install script
-        install_patterns = [
-            r'\b(install|download|get)\s+(\w+(?:\s+\w+)*?)(?:\s+app|\s+application)?\b',
-            r'\b(install|download|get)\s+the\s+(\w+(?:\s+\w+)*?)(?:\s+app|\s+application)?\b'
-        ]
-        
-        for pattern in install_patterns:
-            match = re.search(pattern, transcript_lower)
-            if match:
-                action = match.group(1)
-                app_name = match.group(2).strip()
-                # Check if there's a specific install script
-                install_script = f"install-{app_name.replace(' ', '-')}.ps1"
-                script_path = os.path.join(self.catalog_manager.scripts_dir, 'apps', 'install', install_script)
-                if os.path.exists(script_path):
-                    tool_id = f"install-{app_name.replace(' ', '-')}"
-                    return {'action': 'install', 'app_name': app_name, 'tool': tool_id, 'args': {}}
-        
-        return None
+        return detect_app_command(transcript, self.catalog_manager.scripts_dir, self.app_matcher)
+
+    async def handle_transcript(self, transcript: str, request_id: Optional[str] = None):
+        """Process a voice transcript and execute the appropriate tool or plan.
+        Stage timings are traced under request_id (or the caller's, or a new one)."""
+        with tracing.request(request_id) as request_id:
+            self.logger.info(f"[{request_id}] Transcript: {transcript}")
+            with tracing.span('transcript'):
+                return await self._handle_transcript(transcript)
 
-    async def handle_transcript(self, transcript: str):
-        """Process a voice transcript and execute the appropriate tool or plan."""
+    async def _handle_transcript(self, transcript: str):
+        # Barge-in: a new command cuts off whatever is still being said
+        self.tts.interrupt()
         try:
+            # Repeated commands skip Gemini; the cached call still goes through confirm()
+            if self.result_cache is not None:
+                with tracing.span('result_cache') as span:
+                    cached = self.result_cache.get(transcript)
+                    span['hit'] = bool(cached)
+                if cached:
+                    self.logger.info(
+                        f"Result cache {'fuzzy ' if cached['fuzzy'] else ''}hit: "
+                        f"'{cached['key']}' -> {cached['tool']} ({self.result_cache.stats()})"
+                    )
+                    observation, exit_code = await self._run_tool_call(cached['tool'], cached['args'])
+                    if exit_code not in (0, None):
+                        # Don't keep replaying a call that no longer works
+                        await self._run_blocking('cache', self.result_cache.discard, cached['key'])
+                    return observation
+
             # Send ALL commands to Gemini for intelligent interpretation
             # No more direct pattern matching - let AI handle fuzzy matching with app list
             
             # Check if this is an app-related command - if so, skip semantic search
             # and give Gemini the FULL tool list so it can see open-app-by-name
             # EXCEPTION: If user explicitly says website-related keywords, use semantic search
-            import re
-            transcript_lower = transcript.lower()
-            # Website indicators: explicit "website", Google services, magazines, manuals, cities, rates, music, games
-            website_keywords = ['website', 'web site', 'google', 'magazine', 'manual', 'city', 'rate', 'music', 'sound', 'game', 'wallpaper']
-            has_website_keyword = any(keyword in transcript_lower for keyword in website_keywords)
-            is_app_command = re.search(r'\b(open|launch|start|run)\b', transcript_lower) and not has_website_keyword
+            app_command = is_app_command(transcript)
             
             # Two-stage intelligence: First search semantic index, then ask Gemini
             # Always run the semantic search to prefer website scripts and other focused tools
             relevant_tools = None
+            matches = None
             if self.discovery_mode == 'auto':
                 self.logger.info(f"Searching semantic index for: {transcript}")
-                matches = self.semantic_index.search(transcript, max_results=5)  # Reduced from 10 to 5
+                with tracing.span('semantic_search'):
+                    matches = self.semantic_index.search(transcript, max_results=5)  # Reduced from 10 to 5
                 if matches:
                     self.logger.info(f"Found {len(matches)} relevant scripts: {[m['id'] for m in matches]}")
                     # Build focused tool list from matches
                     relevant_tools = self._build_focused_tool_list(matches)
+
+            # Local fast path: high-confidence commands go straight to the executor
+            if self.router is not None:
+                with tracing.span('fast_path') as span:
+                    routed = self.router.route(transcript, matches)
+                    span['hit'] = bool(routed)
+                if routed:
+                    observation, _ = await self._run_tool_call(routed['tool'], routed['args'])
+                    return observation
+
             # If this is an app-related command and no specific scripts were found,
             # fall back to giving Gemini the full tool list for open-app-by-name fuzzy matching
-            if is_app_command and not relevant_tools:
+            if app_command and not relevant_tools:
                 self.logger.info(f"App command detected - using full tool list for better matching")
             
             # Generate response with focused or full tool list
-            if relevant_tools:
-                # Create temporary model with focused tools
-                focused_model = genai.GenerativeModel(
-                    model_name='gemini-2.5-flash',  # Using faster 2.0 flash model
-                    system_instruction=self.system_instruction,
-                    tools=relevant_tools,
-                )
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None, 
-                    lambda: focused_model.generate_content(transcript, tool_config=self.tool_config)
-                )
-            else:
-                # Use full tool list (direct mode or no matches)
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None, 
-                    lambda: self.model.generate_content(transcript, tool_config=self.tool_config)
+            with tracing.span('model_build', focused=bool(relevant_tools)):
+                if relevant_tools:
+                    # Reuse the model built for this exact focused tool set, if any
+                    model = self._get_focused_model(relevant_tools)
+                else:
+                    # Use full tool list (direct mode or no matches)
+                    model = self.model
+            with tracing.span('gemini'):
+                response = await self._run_blocking(
+                    'llm',
+                    lambda: model.generate_content(transcript, tool_config=self.tool_config)
                 )
             
             # Check for function calls FIRST (before accessing .text which may fail)
@@ -276,31 +353,12 @@ class AgentService:
                     if hasattr(part, 'function_call') and part.function_call:
                         func_call = part.function_call
                         name = func_call.name
-                        args = dict(func_call.args) if func_call.args else {}
-                        level = self.risk_levels.get(name, 'low')
-                        if not await self.confirm(f"Execute {name}", level):
-                            result = f"Skipped {name}: not confirmed"
-                            self.logger.info(result)
-                            await asyncio.get_event_loop().run_in_executor(None, self.tts.say, result)
-                            return result
-                        # Execute the tool
-                        exit_code, stdout, stderr = await asyncio.get_event_loop().run_in_executor(
-                            None, self.executor.run, name, args
-                        )
-                        observation = self._format_execution_observation(
-                            name, exit_code, stdout, stderr
-                        )
-                        self.logger.info(observation)
-                        # Speak the result - ensure it's a string
-                        result_text = str(stdout or stderr or exit_code)
-                        await asyncio.get_event_loop().run_in_executor(
-                            None, self.tts.say, result_text
-                        )
-                        # Log to memory
-                        self.memory.recent_actions.append(
-                            {'tool': name, 'args': args, 'result': observation}
-                        )
-                        self.memory.save('recent_actions', self.memory.recent_actions)
+                        args = to_plain(func_call.args) if func_call.args else {}
+                        observation, exit_code = await self._run_tool_call(name, args)
+                        if exit_code == 0 and self.result_cache is not None:
+                            await self._run_blocking(
+                                'cache', self.result_cache.put, transcript, name, args
+                            )
                         return observation
             
             # Check for plan in text (only if no function call was made)
@@ -318,7 +376,7 @@ class AgentService:
                             self.logger.debug("Response text not valid JSON plan")
                     # Otherwise just speak the text response
                     self.logger.info(f"Gemini response: {response.text}")
-                    await asyncio.get_event_loop().run_in_executor(None, self.tts.say, response.text)
+                    self.tts.say(response.text)
                     return response.text
             except ValueError:
                 # Response may not have .text when function calling is used
@@ -330,6 +388,41 @@ class AgentService:
             self.logger.error(f"Error handling transcript: {e}", exc_info=True)
             return None
 
+    async def _run_tool_call(self, name: str, args: Dict) -> Tuple[str, Optional[int]]:
+        """Confirm, execute and speak a single tool call.
+        Returns (observation, exit code); the exit code is None if not confirmed."""
+        level = self.risk_levels.get(name, 'low')
+        with tracing.span('confirm', tool=name):
+            confirmed = await self.confirm(f"Execute {name}", level)
+        if not confirmed:
+            result = f"Skipped {name}: not confirmed"
+            self.logger.info(result)
+            self.tts.say(result)
+            return result, None
+        # Execute the tool
+        with tracing.span('execute', tool=name):
+            exit_code, stdout, stderr = await self._run_blocking(
+                'script', self.executor.run, name, args
+            )
+        observation = self._format_execution_observation(
+            name, exit_code, stdout, stderr
+        )
+        self.logger.info(observation)
+        # Speak the result - ensure it's a string
+        result_text = str(stdout or stderr or exit_code)
+        self.tts.say(result_text)
+        # Log to memory
+        self.memory.append_action(
+            {'tool': name, 'args': args, 'result': observation}
+        )
+        return observation, exit_code
+
+    def _get_focused_model(self, tools: List[Dict]):
+        """Return a cached GenerativeModel configured with the given focused tools."""
+        model = self.model_cache.get_or_create(tool_set_key(tools), lambda: self._model_factory(tools))
+        self.logger.debug(f"Model cache: {self.model_cache.stats()}")
+        return model
+
     def _build_focused_tool_list(self, matches: List[Dict]) -> List[Dict]:
         """Build a focused tool list from semantic index matches."""
         focused_tools = []
@@ -355,16 +448,49 @@ class AgentService:
         """Main asyncio loop."""
         self.logger.info("Agent Service starting...")
         self.logger.info(f"Discovery mode: {self.discovery_mode}")
-        self.logger.info(f"Semantic index: {len(self.semantic_index.index['scripts'])} scripts indexed")
+        self.logger.info(f"Semantic index: {len(self.semantic_index)} scripts indexed")
         # Placeholder for voice input loop
         while True:
             transcript = input("Enter transcript (or 'quit' to exit): ")
             if transcript.lower() == 'quit':
                 break
             await self.handle_transcript(transcript)
+        self.logger.info(f"Model cache: {self.model_cache.stats()}")
+        if self.result_cache is not None:
+            self.logger.info(f"Result cache: {self.result_cache.stats()}")
+        if self.router is not None:
+            self.logger.info(f"Fast path: {self.router.stats()}")
+        self.logger.info(f"Worker pools: {self.pools.stats()}")
+        self.logger.info(f"Speech: {self.tts.stats()}")
+        self.close()
         self.logger.info("Agent service stopped.")
 
+    def close(self):
+        """Shut down speech, the worker pools, pooled PowerShell hosts and the memory store."""
+        self.pools.shutdown()
+        for resource in (self.tts, self.executor, self.memory):
+            close = getattr(resource, 'close', None)
+            if close:
+                close()
+
+async def _profile_startup(command: Optional[str]) -> None:
+    """--profile-startup: build the service, optionally run one command, print timings."""
+    service = AgentService(prompt_provider=lambda _: 'yes')
+    try:
+        if command:
+            with startup_profile.phase(f"first command: {command}"):
+                await service.handle_transcript(command)
+    finally:
+        service.close()
+    print(startup_profile.report())
+
+
 if __name__ == "__main__":
+    import sys
+
     logging.basicConfig(level=logging.INFO)
-    service = AgentService()
-    asyncio.run(service.run())
\ No newline at end of file
+    if startup_profile.profile_requested(sys.argv):
+        asyncio.run(_profile_startup(' '.join(sys.argv[1:]) or None))
+    else:
+        service = AgentService()
+        asyncio.run(service.run())
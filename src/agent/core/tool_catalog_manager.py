@@ -1,44 +1,51 @@
 import os
-import yaml
 import json
 import logging
 
+from .parallel_build import PhaseTimer
+from .script_scanner import ScriptScanner, extract_yaml_header, find_duplicate_ids
+from ..utils.lazy_import import lazy_import
+
+# Only needed when the catalog is (re)generated, not when tools.json is loaded
+yaml = lazy_import('yaml')
+
 class ToolCatalogManager:
-    def __init__(self, scripts_dir=None):
+    def __init__(self, scripts_dir=None, catalog_path=None):
         if scripts_dir is None:
             scripts_dir = os.path.join(os.path.dirname(__file__), "../../..", "scripts")
+        if catalog_path is None:
+            catalog_path = os.path.join(os.path.dirname(__file__), "tools.json")
         self.scripts_dir = scripts_dir
+        self.catalog_path = catalog_path
         self.logger = logging.getLogger(__name__)
+        self.last_build_timings = {}
+        self.duplicate_ids = {}
 
     def scan_scripts(self, directory):
         """List all .ps1 files in the given directory recursively."""
-        ps1_files = []
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.ps1') and not file.startswith('_'):
-                    ps1_files.append(os.path.join(root, file))
-        return ps1_files
+        return [path for _, path in ScriptScanner(directory).iter_files()]
 
     def extract_yaml_header(self, content):
         """Extract YAML metadata from <# ... #> block that contains 'id:'."""
-        import re
-        # Find all <# ... #> blocks
-        blocks = re.findall(r'<#(.*?)#>', content, re.DOTALL)
-        for block in blocks:
-            if 'id:' in block:
-                return block.strip()
-        return None
+        return extract_yaml_header(content)
+
+    def validate_metadata(self, metadata):
+        """Return metadata if it has every required field, otherwise None."""
+        if not isinstance(metadata, dict):
+            self.logger.warning("Metadata header is not a mapping")
+            return None
+        required_fields = ['id', 'name', 'description', 'category', 'risk_level', 'side_effects', 'parameters', 'examples']
+        for field in required_fields:
+            if field not in metadata:
+                self.logger.warning(f"Missing required field: {field}")
+                return None
+        return metadata
 
     def parse_yaml_metadata(self, yaml_content):
         """Parse YAML content and validate required fields."""
         try:
             metadata = yaml.safe_load(yaml_content)
-            required_fields = ['id', 'name', 'description', 'category', 'risk_level', 'side_effects', 'parameters', 'examples']
-            for field in required_fields:
-                if field not in metadata:
-                    self.logger.warning(f"Missing required field: {field}")
-                    return None
-            return metadata
+            return self.validate_metadata(metadata)
         except yaml.YAMLError as e:
             self.logger.error(f"YAML parsing error: {e}")
             return None
@@ -93,41 +100,69 @@ class ToolCatalogManager:
         }
         return function
 
-    def generate_catalog(self):
-        """Generate the tools catalog and write to tools.json."""
-        scripts = self.scan_scripts(self.scripts_dir)
+    def tool_from_record(self, record):
+        """Return (function_schema, risk_level) for a scanned script, or None."""
+        if record['metadata'] is None:
+            if record['error'] is None:
+                # Skip scripts without proper metadata - don't send to Gemini
+                self.logger.debug(f"No metadata found in {record['file']}, skipping")
+            return None
+        metadata = self.validate_metadata(record['metadata'])
+        if not metadata:
+            self.logger.warning(f"Skipping {record['file']}: invalid metadata")
+            return None
+        try:
+            function_schema = self.transform_to_gemini_schema(metadata)
+        except Exception as e:
+            self.logger.error(f"Error processing {record['file']}: {e}")
+            return None
+        return function_schema, metadata.get('risk_level', 'low')
+
+    def generate_catalog(self, workers=1, records=None):
+        """Generate the tools catalog and write to tools.json.
+
+        records from a shared ScriptScanner pass are used as-is; otherwise
+        the scripts are scanned here, in a process pool when workers > 1
+        (0 for one per core). Results are merged in scan order so tools.json
+        is identical to the serial build.
+        """
+        timer = PhaseTimer()
+        if records is None:
+            with timer.phase('scan'):
+                items = [
+                    (os.path.relpath(path, self.scripts_dir).replace(os.sep, '/'), path)
+                    for path in self.scan_scripts(self.scripts_dir)
+                ]
+            with timer.phase('extract'):
+                records = ScriptScanner(self.scripts_dir).scan(items, workers=workers)
         tools = []
         risk_levels = {}
-        for script_path in scripts:
-            try:
-                with open(script_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                yaml_content = self.extract_yaml_header(content)
-                if yaml_content:
-                    metadata = self.parse_yaml_metadata(yaml_content)
-                    if metadata:
-                        function_schema = self.transform_to_gemini_schema(metadata)
-                        tools.append(function_schema)
-                        risk_levels[metadata['id']] = metadata.get('risk_level', 'low')
-                    else:
-                        self.logger.warning(f"Skipping {script_path}: invalid metadata")
-                else:
-                    # Skip scripts without proper metadata - don't send to Gemini
-                    self.logger.debug(f"No metadata found in {script_path}, skipping")
-            except Exception as e:
-                self.logger.error(f"Error processing {script_path}: {e}")
+        with timer.phase('merge'):
+            # Script ids must be unique: the executor resolves a tool by id alone
+            self.duplicate_ids = find_duplicate_ids((r['path'], r['file']) for r in records)
+            for script_id, rel_paths in self.duplicate_ids.items():
+                self.logger.warning(f"Duplicate script id '{script_id}': {', '.join(rel_paths)} (using {rel_paths[0]})")
+            for record in records:
+                result = self.tool_from_record(record)
+                if result:
+                    function_schema, risk_level = result
+                    if function_schema['name'] in risk_levels:
+                        continue  # Gemini rejects duplicate function names
+                    tools.append(function_schema)
+                    risk_levels[function_schema['name']] = risk_level
         
         catalog = {"tools": tools, "risk_levels": risk_levels}
-        output_path = os.path.join(os.path.dirname(__file__), "tools.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(catalog, f, indent=2)
-        self.logger.info(f"Catalog generated with {len(tools)} tools")
+        with timer.phase('write'):
+            with open(self.catalog_path, 'w', encoding='utf-8') as f:
+                json.dump(catalog, f, indent=2)
+        self.last_build_timings = timer.report()
+        self.logger.info(f"Catalog generated with {len(tools)} tools ({timer.format()})")
+        return catalog
 
     def load_catalog(self):
         """Load the tools catalog from tools.json."""
-        output_path = os.path.join(os.path.dirname(__file__), "tools.json")
-        if os.path.exists(output_path):
-            with open(output_path, 'r', encoding='utf-8') as f:
+        if os.path.exists(self.catalog_path):
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         return {"tools": []}
 
@@ -0,0 +1,301 @@
+"""
+Vector Index - Offline TF-IDF retrieval over words and character n-grams.
+
+BM25 over whole tokens misses shortened and inflected words ("launch calc",
+"kill browsers"), and then handle_transcript sends Gemini the full tool list.
+This index is built locally from the same script entries:
+1. Each script is a document of its id, name, description and keywords,
+   weighted per field like the BM25 engine
+2. Features are word tokens plus character 3- and 4-grams of each word;
+   each part gets sublinear tf * smoothed idf weights and is L2-normalized,
+   so a score is word_weight * word cosine + (1 - word_weight) * char cosine
+   (char n-grams weigh more by default: they carry the partial matches)
+3. The matrix is stored per feature (CSC), so a query only touches the
+   columns of its own features
+4. search_batch() scores many queries at once, with NumPy when it is
+   installed and with a pure-Python accumulator (same scores) otherwise.
+   Importing NumPy takes ~150ms, so a single query only uses it once it is
+   loaded (load_numpy(), called by the daemon's warm-up)
+5. save()/load() persist the matrix with a fingerprint of the scripts it
+   was built from, so it is only rebuilt when scripts change
+"""
+import hashlib
+import heapq
+import math
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .search_engine import FIELD_WEIGHTS, _field_texts, tokenize
+
+MAGIC = b'T2WVEC\x00\x01'
+FORMAT_VERSION = 1
+
+# magic, format version, fingerprint, doc count, feature count, posting count,
+# doc id blob length, feature blob length, word weight, min n, max n
+_HEADER = struct.Struct('<8sI32s5Q d2I')
+
+# Cosines below this are stray n-gram overlaps ("weather" sharing "the" with "the calculator")
+MIN_SCORE = 0.1
+
+WORD_PREFIX = 'w:'
+CHAR_PREFIX = 'c:'
+
+
+def load_numpy():
+    """Import NumPy if it is installed; the index works without it."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _numpy(load: bool):
+    """NumPy if it is already imported, or (with load) if it can be."""
+    numpy = sys.modules.get('numpy')
+    if numpy is None and load:
+        numpy = load_numpy()
+    return numpy
+
+
+def char_ngrams(token: str, min_n: int = 3, max_n: int = 4) -> Iterable[str]:
+    """Character n-grams of one word. Only the start is marked, so a shortened
+    word ("calc") shares all of its n-grams with the full one ("calculator")."""
+    padded = f" {token}"
+    for n in range(min_n, max_n + 1):
+        for i in range(len(padded) - n + 1):
+            yield padded[i:i + n]
+
+
+def fingerprint(items: Iterable[Tuple[str, str]]) -> bytes:
+    """Digest of (path, content hash) pairs identifying the scripts an index covers."""
+    digest = hashlib.sha256()
+    for path, content_hash in sorted(items):
+        digest.update(f"{path}\0{content_hash}\n".encode('utf-8'))
+    return digest.digest()
+
+
+class VectorIndex:
+    """TF-IDF vectors over word and character n-gram features, scored by cosine."""
+
+    def __init__(self, word_weight: float = 0.3, min_n: int = 3, max_n: int = 4):
+        self.word_weight = word_weight
+        self.min_n = min_n
+        self.max_n = max_n
+        self.fingerprint = b'\0' * 32
+        self.doc_ids: List[str] = []
+        self.features: Dict[str, int] = {}
+        self.idf = array('d')
+        self.feature_starts = array('I', [0])
+        self.posting_docs = array('I')
+        self.posting_weights = array('f')
+        self._np_arrays = None
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    # -- building ---------------------------------------------------------
+
+    def _counts(self, texts: Iterable[Tuple[str, float]]) -> Dict[str, float]:
+        """Weighted raw counts of word and char n-gram features."""
+        counts: Dict[str, float] = {}
+        for text, weight in texts:
+            for token in tokenize(text):
+                key = WORD_PREFIX + token
+                counts[key] = counts.get(key, 0.0) + weight
+                for gram in char_ngrams(token, self.min_n, self.max_n):
+                    key = CHAR_PREFIX + gram
+                    counts[key] = counts.get(key, 0.0) + weight
+        return counts
+
+    def _weigh(self, counts: Dict[str, float], idf_of) -> Dict[str, float]:
+        """Sublinear tf * idf, L2-normalized separately for words and char n-grams."""
+        vector = {}
+        for feature, count in counts.items():
+            idf = idf_of(feature)
+            if idf:
+                # Field weights make every count >= 1
+                vector[feature] = (1.0 + math.log(count)) * idf
+        for prefix, share in ((WORD_PREFIX, self.word_weight), (CHAR_PREFIX, 1.0 - self.word_weight)):
+            part = [f for f in vector if f.startswith(prefix)]
+            norm = math.sqrt(sum(vector[f] ** 2 for f in part))
+            scale = math.sqrt(share) / norm if norm else 0.0
+            for f in part:
+                vector[f] *= scale
+        return vector
+
+    @classmethod
+    def from_scripts(cls, scripts: Dict[str, Dict], fingerprint: bytes = b'\0' * 32,
+                     **kwargs) -> 'VectorIndex':
+        """Build the matrix from the semantic index 'scripts' map."""
+        index = cls(**kwargs)
+        index.fingerprint = fingerprint
+        # Docs sorted by id, like the binary index, so ties break the same way
+        index.doc_ids = sorted(scripts)
+        doc_counts = []
+        df: Dict[str, int] = {}
+        for script_id in index.doc_ids:
+            fields = dict(scripts[script_id])
+            fields.setdefault('id', script_id)
+            counts = index._counts(
+                (text, weight)
+                for field, weight in FIELD_WEIGHTS.items()
+                for text in _field_texts(fields.get(field))
+            )
+            doc_counts.append(counts)
+            for feature in counts:
+                df[feature] = df.get(feature, 0) + 1
+
+        n_docs = len(index.doc_ids)
+        features = sorted(df)
+        index.features = {feature: i for i, feature in enumerate(features)}
+        index.idf = array('d', (math.log((1.0 + n_docs) / (1.0 + df[f])) + 1.0 for f in features))
+
+        columns: List[List[Tuple[int, float]]] = [[] for _ in features]
+        idf_of = lambda feature: index.idf[index.features[feature]]
+        for doc, counts in enumerate(doc_counts):
+            for feature, weight in index._weigh(counts, idf_of).items():
+                columns[index.features[feature]].append((doc, weight))
+        for column in columns:
+            for doc, weight in column:
+                index.posting_docs.append(doc)
+                index.posting_weights.append(weight)
+            index.feature_starts.append(len(index.posting_docs))
+        return index
+
+    # -- scoring ----------------------------------------------------------
+
+    def query_vector(self, query: str) -> List[Tuple[int, float]]:
+        """(feature index, weight) pairs of a query; unknown features are ignored."""
+        counts = {f: c for f, c in self._counts([(query, 1.0)]).items() if f in self.features}
+        vector = self._weigh(counts, lambda feature: self.idf[self.features[feature]])
+        return [(self.features[f], w) for f, w in vector.items()]
+
+    def search(self, query: str, max_results: int = 10, min_score: float = MIN_SCORE) -> List[Tuple[str, float]]:
+        """Return up to max_results (doc_id, cosine) pairs with cosine >= min_score, best first."""
+        return self.search_batch([query], max_results, min_score)[0]
+
+    def search_batch(self, queries: Sequence[str], max_results: int = 10,
+                     min_score: float = MIN_SCORE) -> List[List[Tuple[str, float]]]:
+        """Score several queries in one pass over the matrix."""
+        if not self.doc_ids or max_results <= 0:
+            return [[] for _ in queries]
+        vectors = [self.query_vector(query) for query in queries]
+        # A lone query isn't worth importing NumPy for in a short-lived bridge process
+        np = _numpy(load=len(queries) > 1)
+        if np is not None:
+            ranked = self._search_numpy(np, vectors, max_results)
+        else:
+            ranked = [self._search_python(vector, max_results) for vector in vectors]
+        return [[(doc_id, score) for doc_id, score in hits if score >= min_score] for hits in ranked]
+
+    def _search_python(self, vector: List[Tuple[int, float]], max_results: int) -> List[Tuple[str, float]]:
+        starts, docs, weights = self.feature_starts, self.posting_docs, self.posting_weights
+        scores: Dict[int, float] = {}
+        for feature, query_weight in vector:
+            for p in range(starts[feature], starts[feature + 1]):
+                doc = docs[p]
+                scores[doc] = scores.get(doc, 0.0) + query_weight * weights[p]
+        top = heapq.nsmallest(max_results, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.doc_ids[doc], score) for doc, score in top if score > 0]
+
+    def _search_numpy(self, np, vectors: List[List[Tuple[int, float]]], max_results: int):
+        if self._np_arrays is None:
+            self._np_arrays = (
+                np.frombuffer(self.feature_starts, dtype=np.uint32).astype(np.int64),
+                np.frombuffer(self.posting_docs, dtype=np.uint32).astype(np.int64),
+                np.frombuffer(self.posting_weights, dtype=np.float32).astype(np.float64),
+            )
+        starts, docs, weights = self._np_arrays
+        scores = np.zeros((len(vectors), len(self.doc_ids)))
+        for row, vector in enumerate(vectors):
+            if not vector:
+                continue
+            features = np.fromiter((f for f, _ in vector), dtype=np.int64, count=len(vector))
+            query_weights = np.fromiter((w for _, w in vector), dtype=np.float64, count=len(vector))
+            lengths = starts[features + 1] - starts[features]
+            # Posting positions of every query feature, laid end to end
+            positions = np.repeat(starts[features] - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            np.add.at(scores[row], docs[positions], np.repeat(query_weights, lengths) * weights[positions])
+        results = []
+        k = min(max_results, len(self.doc_ids))
+        for row in scores:
+            candidates = np.argpartition(-row, k - 1)[:k]
+            ranked = sorted(candidates.tolist(), key=lambda doc: (-row[doc], doc))
+            results.append([(self.doc_ids[doc], float(row[doc])) for doc in ranked if row[doc] > 0])
+        return results
+
+    # -- persistence ------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Write the matrix atomically."""
+        if sys.byteorder != 'little':
+            raise ValueError("Vector index files are only supported on little-endian hosts")
+        doc_blob = '\n'.join(self.doc_ids).encode('utf-8')
+        features = sorted(self.features, key=self.features.get)
+        feature_blob = '\n'.join(features).encode('utf-8')
+        header = _HEADER.pack(
+            MAGIC, FORMAT_VERSION, self.fingerprint, len(self.doc_ids), len(features),
+            len(self.posting_docs), len(doc_blob), len(feature_blob),
+            self.word_weight, self.min_n, self.max_n,
+        )
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for chunk in (header, doc_blob, feature_blob, self.idf.tobytes(), self.feature_starts.tobytes(),
+                          self.posting_docs.tobytes(), self.posting_weights.tobytes()):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'VectorIndex':
+        """Read a matrix written by save(); raises ValueError if it is unusable."""
+        if sys.byteorder != 'little':
+            raise ValueError("Vector index files are only supported on little-endian hosts")
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Truncated vector index: {path}")
+        (magic, version, digest, n_docs, n_features, n_postings, doc_len, feature_len,
+         word_weight, min_n, max_n) = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector index format in {path}")
+        expected = _HEADER.size + doc_len + feature_len + 8 * n_features + 4 * (n_features + 1) + 8 * n_postings
+        if len(data) != expected:
+            raise ValueError(f"Corrupt vector index: {path}")
+
+        index = cls(word_weight=word_weight, min_n=min_n, max_n=max_n)
+        index.fingerprint = digest
+        offset = _HEADER.size
+        doc_blob = data[offset:offset + doc_len].decode('utf-8')
+        index.doc_ids = doc_blob.split('\n') if n_docs else []
+        offset += doc_len
+        feature_blob = data[offset:offset + feature_len].decode('utf-8')
+        index.features = {f: i for i, f in enumerate(feature_blob.split('\n'))} if n_features else {}
+        offset += feature_len
+        for name, typecode, count in (('idf', 'd', n_features), ('feature_starts', 'I', n_features + 1),
+                                      ('posting_docs', 'I', n_postings), ('posting_weights', 'f', n_postings)):
+            values = array(typecode)
+            size = values.itemsize * count
+            values.frombytes(data[offset:offset + size])
+            offset += size
+            setattr(index, name, values)
+        if len(index.doc_ids) != n_docs or len(index.features) != n_features:
+            raise ValueError(f"Corrupt vector index counts: {path}")
+        return index
+
+
+def blend(keyword: List[Tuple[str, float]], vector: List[Tuple[str, float]],
+          vector_weight: float, max_results: int) -> List[Tuple[str, float]]:
+    """Merge BM25 and cosine rankings: BM25 scores are scaled to the top hit,
+    then each doc scores (1 - vector_weight) * bm25 + vector_weight * cosine."""
+    top = keyword[0][1] if keyword and keyword[0][1] > 0 else 1.0
+    scores: Dict[str, float] = {}
+    for doc_id, score in keyword:
+        scores[doc_id] = (1.0 - vector_weight) * score / top
+    for doc_id, score in vector:
+        scores[doc_id] = scores.get(doc_id, 0.0) + vector_weight * score
+    ranked = heapq.nsmallest(max_results, scores.items(), key=lambda item: (-item[1], item[0]))
+    return list(ranked)
@@ -0,0 +1,131 @@
+"""
+Worker Pools - Separate, bounded thread pools for each kind of blocking work.
+
+Every blocking call used to go through the event loop's default executor, so
+a slow TTS call or a user sitting on a confirmation prompt could hold the
+threads a tool execution needed. Each workload class gets its own pool:
+1. llm    - Gemini generate_content calls
+2. script - PowerShell tool execution
+3. prompt - blocking prompt_provider calls for confirmations
+4. cache  - result cache writes
+(Speech has its own queue and thread in TTS.)
+Sizes come from TALK2WINDOWS_<NAME>_WORKERS, and every pool reports queue
+depth, active workers and how long submitted work waited for a thread.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+DEFAULT_SIZES = {
+    'llm': 4,
+    'script': 4,
+    'prompt': 1,
+    'cache': 1,
+}
+
+
+class InstrumentedThreadPool(ThreadPoolExecutor):
+    """A ThreadPoolExecutor that tracks queue depth and queue wait time."""
+
+    def __init__(self, name: str, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix=f"t2w-{name}")
+        self.name = name
+        self.max_workers = max_workers
+        self._stats_lock = threading.Lock()
+        self._submitted = 0
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        enqueued = time.perf_counter()
+        with self._stats_lock:
+            self._submitted += 1
+            self._queued += 1
+
+        def task():
+            wait = time.perf_counter() - enqueued
+            with self._stats_lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                with self._stats_lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._failed += failed
+
+        try:
+            return super().submit(task)
+        except RuntimeError:
+            with self._stats_lock:
+                self._submitted -= 1
+                self._queued -= 1
+            raise
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            started = self._completed + self._active
+            return {
+                'workers': self.max_workers,
+                'submitted': self._submitted,
+                'queued': self._queued,
+                'active': self._active,
+                'completed': self._completed,
+                'failed': self._failed,
+                'avg_wait_ms': round(self._total_wait / started * 1000, 2) if started else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 2),
+            }
+
+
+class WorkerPools:
+    """Named InstrumentedThreadPools, created lazily and shut down together."""
+
+    def __init__(self, sizes: Optional[Dict[str, int]] = None):
+        self.sizes = dict(DEFAULT_SIZES)
+        for name in self.sizes:
+            self.sizes[name] = int(os.getenv(f'TALK2WINDOWS_{name.upper()}_WORKERS', str(self.sizes[name])))
+        self.sizes.update(sizes or {})
+        self._pools: Dict[str, InstrumentedThreadPool] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, name: str) -> InstrumentedThreadPool:
+        """Return the pool for a workload class, creating it on first use."""
+        if name not in self.sizes:
+            raise KeyError(f"Unknown worker pool: {name}")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Worker pools are shut down")
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = InstrumentedThreadPool(name, max(1, self.sizes[name]))
+                self._pools[name] = pool
+            return pool
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            pools = dict(self._pools)
+        return {name: pool.stats() for name, pool in pools.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all pools; queued work that hasn't started is cancelled."""
+        with self._lock:
+            self._closed = True
+            pools, self._pools = self._pools, {}
+        for name, pool in pools.items():
+            self.logger.debug(f"Shutting down {name} pool: {pool.stats()}")
+            pool.shutdown(wait=wait, cancel_futures=True)
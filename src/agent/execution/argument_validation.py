@@ -0,0 +1,104 @@
+"""
+Argument Validation - Checks tool arguments against their tools.json schema.
+
+Arguments used to be flattened to "k=v,k=v" and split again in PowerShell, so
+commas or '=' in values corrupted them and every value arrived as a string.
+They now travel as JSON, and before a process is started they are:
+1. Checked for unknown and missing required parameters
+2. Type-checked against the Gemini schema types (STRING, INTEGER, NUMBER,
+   BOOLEAN, ARRAY, OBJECT), recursing into items/properties
+3. Normalized where it's lossless (Gemini sends integers as 2.0)
+"""
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, List, Optional
+
+
+class ArgumentValidationError(ValueError):
+    """Raised when tool arguments don't match the tool's parameter schema."""
+
+
+def to_plain(value: Any) -> Any:
+    """Turn mapping/sequence wrappers (e.g. Gemini's proto MapComposite and
+    RepeatedComposite) into plain dicts and lists so they validate and serialize."""
+    if isinstance(value, Mapping):
+        return {str(k): to_plain(v) for k, v in value.items()}
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+        return [to_plain(v) for v in value]
+    return value
+
+
+def _where(path: str) -> str:
+    return f"{path}: " if path else ""
+
+
+def _check(value: Any, schema: Dict, path: str) -> Any:
+    expected = str(schema.get('type', '')).upper()
+    if not expected:
+        return value
+    if expected == 'STRING':
+        if isinstance(value, str):
+            return value
+    elif expected == 'INTEGER':
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+    elif expected == 'NUMBER':
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+    elif expected == 'BOOLEAN':
+        if isinstance(value, bool):
+            return value
+    elif expected == 'ARRAY':
+        if isinstance(value, list):
+            items = schema.get('items')
+            if not items:
+                return list(value)
+            return [_check(item, items, f"{path}[{i}]") for i, item in enumerate(value)]
+    elif expected == 'OBJECT':
+        if isinstance(value, dict):
+            if 'properties' not in schema:
+                return dict(value)
+            return _check_object(value, schema, path)
+    else:
+        return value
+    raise ArgumentValidationError(f"{_where(path)}expected {expected.lower()}, got {type(value).__name__}")
+
+
+def _check_object(args: Dict, schema: Dict, path: str) -> Dict:
+    properties = schema.get('properties') or {}
+    unknown = sorted(set(args) - set(properties))
+    if unknown:
+        raise ArgumentValidationError(f"{_where(path)}unknown parameter(s) {', '.join(unknown)}")
+    missing = [name for name in schema.get('required') or [] if args.get(name) is None]
+    if missing:
+        raise ArgumentValidationError(f"{_where(path)}missing required parameter(s) {', '.join(missing)}")
+    return {
+        name: _check(value, properties[name], f"{path}.{name}" if path else name)
+        for name, value in args.items()
+        if value is not None
+    }
+
+
+def validate_arguments(schema: Optional[Dict], args: Any) -> Dict:
+    """Return args normalized against a tool's parameters schema, or raise."""
+    args = to_plain(args)
+    if not isinstance(args, dict):
+        raise ArgumentValidationError(f"arguments must be an object, got {type(args).__name__}")
+    if not schema:
+        return dict(args)
+    return _check_object(args, schema, '')
+
+
+class ArgumentValidator:
+    """Validates arguments for the tools in a catalog, by tool name."""
+
+    def __init__(self, tools: List[Dict]):
+        self.schemas = {tool['name']: tool.get('parameters') for tool in tools if 'name' in tool}
+
+    def validate(self, tool_name: str, args: Any) -> Dict:
+        """Scripts without catalog metadata have no schema; their args are only shape-checked."""
+        try:
+            return validate_arguments(self.schemas.get(tool_name), args)
+        except ArgumentValidationError as e:
+            raise ArgumentValidationError(f"Invalid arguments for {tool_name}: {e}") from None
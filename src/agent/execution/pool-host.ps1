@@ -0,0 +1,105 @@
+# Long-lived PowerShell host used by PooledPowerShellExecutor.
+# Reads one JSON request per line from stdin:
+#     {"id": 1, "script": "what-is-the-time", "args": {"Name": "value"}, "path": "C:\\...\\what-is-the-time.ps1", "request_id": "3f2a..."}
+# ("path" is optional; without it the script is looked up under scripts/.
+# "request_id" is optional and exposed to the script as $env:TALK2WINDOWS_REQUEST_ID)
+# and answers each with one line on stdout, prefixed so stray console output
+# from scripts can't be mistaken for a response:
+#     T2W {"id": 1, "exit_code": 0, "stdout": "...", "stderr": "", "duration_ms": 12.5}
+
+$ErrorActionPreference = 'Continue'
+$scriptsRoot = Join-Path $PSScriptRoot "../../../scripts"
+$pathCache = @{}
+
+function Write-Response($response) {
+    [Console]::Out.WriteLine("T2W " + ($response | ConvertTo-Json -Compress))
+    [Console]::Out.Flush()
+}
+
+function Resolve-ScriptPath([string]$ScriptID) {
+    if ($pathCache.ContainsKey($ScriptID)) {
+        return $pathCache[$ScriptID]
+    }
+    if ($ScriptID -match '[\\/]') {
+        $scriptPath = Join-Path $scriptsRoot "$ScriptID.ps1"
+    } else {
+        $found = Get-ChildItem -Path $scriptsRoot -Recurse -Filter "$ScriptID.ps1" -ErrorAction SilentlyContinue | Select-Object -First 1
+        if (-not $found) {
+            return $null
+        }
+        $scriptPath = $found.FullName
+    }
+    $pathCache[$ScriptID] = $scriptPath
+    return $scriptPath
+}
+
+Write-Response @{ ready = $true; pid = $PID }
+
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($null -eq $line) {
+        break
+    }
+    if (-not $line.Trim()) {
+        continue
+    }
+
+    $id = $null
+    $stdout = ""
+    $stderr = ""
+    $exit_code = 0
+    $stopwatch = [System.Diagnostics.Stopwatch]::new()
+    try {
+        $request = $line | ConvertFrom-Json
+        $id = $request.id
+        $env:TALK2WINDOWS_REQUEST_ID = $request.request_id
+        if ($request.script -match '\.\.') {
+            throw "Invalid script id: $($request.script)"
+        }
+        if ($request.path) {
+            $scriptPath = $request.path
+        } else {
+            $scriptPath = Resolve-ScriptPath $request.script
+        }
+        if (-not $scriptPath -or -not (Test-Path $scriptPath)) {
+            throw "Script not found: $($request.script)"
+        }
+
+        # Named, typed parameters, like run-script.ps1 -ParamsJson
+        $params = @{}
+        if ($request.args) {
+            foreach ($property in $request.args.PSObject.Properties) {
+                $params[$property.Name] = $property.Value
+            }
+        }
+
+        $global:LASTEXITCODE = 0
+        $output = @()
+        $stopwatch.Start()
+        try {
+            # Capture every stream (including Write-Host) so nothing reaches the protocol channel
+            $output = & $scriptPath @params *>&1
+            $exit_code = if ($LASTEXITCODE) { $LASTEXITCODE } else { 0 }
+        } catch {
+            # A terminating error ends a powershell.exe -File run with exit code 1
+            $output += $_
+            $exit_code = 1
+        }
+        $stopwatch.Stop()
+        $errors = @($output | Where-Object { $_ -is [System.Management.Automation.ErrorRecord] })
+        $rest = @($output | Where-Object { $_ -isnot [System.Management.Automation.ErrorRecord] })
+        $stdout = ($rest | Out-String)
+        $stderr = ($errors | ForEach-Object { $_.ToString() }) -join [Environment]::NewLine
+    } catch {
+        $stderr = $_.Exception.Message
+        $exit_code = -1
+    }
+
+    Write-Response @{
+        id = $id
+        exit_code = $exit_code
+        stdout = $stdout
+        stderr = $stderr
+        duration_ms = $stopwatch.Elapsed.TotalMilliseconds
+    }
+}
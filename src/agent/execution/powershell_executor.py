@@ -1,14 +1,25 @@
 import json
 import os
 import subprocess
-from typing import Dict, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..utils import tracing
+from .argument_validation import ArgumentValidationError, to_plain
 
 
 class PowerShellExecutor:
     """Launches PowerShell scripts through run-script.ps1."""
 
-    def __init__(self, timeout_seconds: int = 60):
+    def __init__(self, timeout_seconds: int = 60, path_map=None, validator=None,
+                 powershell_command: Optional[List[str]] = None):
         self.timeout_seconds = timeout_seconds
+        # The interpreter run-script.ps1 is handed to (a stand-in for benchmarks)
+        self.powershell_command = powershell_command or ["powershell.exe"]
+        # Optional ScriptPathMap; without it run-script.ps1 searches scripts/ itself
+        self.path_map = path_map
+        # Optional ArgumentValidator; bad arguments then fail before PowerShell starts
+        self.validator = validator
         # run-script.ps1 is in the agent directory
         self.executor_path = os.path.abspath(
             os.path.join(os.path.dirname(__file__), "run-script.ps1")
@@ -19,23 +30,80 @@ class PowerShellExecutor:
         if any(sep in tool_name for sep in ("/", "\\")) or ".." in tool_name:
             raise ValueError(f"Invalid tool name: {tool_name}")
 
+    def _resolve_path(self, tool_name: str) -> Optional[str]:
+        return self.path_map.resolve(tool_name) if self.path_map is not None else None
+
+    def _validate_args(self, tool_name: str, args: Optional[Dict[str, object]]) -> Dict[str, object]:
+        args = {} if args is None else args
+        if self.validator is not None:
+            return self.validator.validate(tool_name, args)
+        args = to_plain(args)
+        if not isinstance(args, dict):
+            raise ArgumentValidationError(f"Invalid arguments for {tool_name}: expected an object")
+        return args
+
+    def _prepare(self, tool_name: str, args: Optional[Dict[str, object]]):
+        """Validate the call. Returns (script_path, args, error) where error is
+        an (exit_code, stdout, stderr) result when PowerShell shouldn't be started."""
+        self._validate_tool_name(tool_name)
+        try:
+            args = self._validate_args(tool_name, args)
+        except ArgumentValidationError as e:
+            return None, args, (-1, "", str(e))
+        script_path = self._resolve_path(tool_name)
+        if self.path_map is not None and script_path is None:
+            # No need to start PowerShell just to find out the script doesn't exist
+            return None, args, (-1, "", f"Script not found: {tool_name}")
+        return script_path, args, None
+
+    def _record_script_time(self, tool_name: str, output: Dict, elapsed_ms: float) -> None:
+        """Split a call into script runtime (reported by PowerShell as duration_ms)
+        and the overhead around it (process spawn, run-script.ps1, pipes)."""
+        duration = output.get("duration_ms")
+        if isinstance(duration, (int, float)):
+            tracing.record('script', duration, tool=tool_name)
+            tracing.record('powershell_overhead', max(0.0, elapsed_ms - duration), tool=tool_name)
+
+    @staticmethod
+    def _parse_output(stdout: str) -> Optional[Dict]:
+        try:
+            return json.loads(stdout)
+        except json.JSONDecodeError:
+            # A script writing straight to the console can precede the result line
+            lines = stdout.strip().splitlines()
+            if len(lines) > 1:
+                try:
+                    return json.loads(lines[-1])
+                except json.JSONDecodeError:
+                    pass
+        return None
+
     def run(self, tool_name: str, args: Dict[str, object]) -> Tuple[int, str, str]:
         """Execute a script by ID and return (exit_code, stdout, stderr)."""
-        self._validate_tool_name(tool_name)
-        # Build command with optional ParamsStr
+        script_path, args, error = self._prepare(tool_name, args)
+        if error:
+            return error
+        # Arguments travel as JSON so types survive and values may hold ',' or '='
         command = [
-            "powershell.exe",
+            *self.powershell_command,
             "-NoProfile",
             "-File",
             self.executor_path,
             "-ScriptID",
             tool_name,
+            "-ParamsJson",
+            json.dumps(args),
         ]
-        # Only add ParamsStr if there are parameters
-        if args:
-            params_str = ','.join(f'{k}={v}' for k, v in args.items())
-            command.extend(["-ParamsStr", params_str])
+        if script_path:
+            command.extend(["-ScriptPath", script_path])
 
+        # Scripts can tag their own logs with the request they run for
+        extra = {}
+        request_id = tracing.current_request_id()
+        if request_id:
+            extra["env"] = dict(os.environ, TALK2WINDOWS_REQUEST_ID=request_id)
+
+        start = time.perf_counter()
         try:
             result = subprocess.run(
                 command,
@@ -43,21 +111,26 @@ class PowerShellExecutor:
                 capture_output=True,
                 check=False,
                 timeout=self.timeout_seconds,
+                **extra,
             )
         except subprocess.TimeoutExpired:
+            tracing.record('powershell', (time.perf_counter() - start) * 1000, tool=tool_name, status='timeout')
             return -1, "", "Executor timed out"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        tracing.record('powershell', elapsed_ms, tool=tool_name)
 
         if not result.stdout:
             return result.returncode, "", result.stderr.strip()
 
-        try:
-            output = json.loads(result.stdout)
-        except json.JSONDecodeError:
+        with tracing.span('json_decode'):
+            output = self._parse_output(result.stdout)
+        if not isinstance(output, dict):
             stderr = result.stderr.strip()
             if stderr:
                 return -1, "", f"Executor failed: {stderr}"
             return -1, "", "Executor returned invalid JSON"
 
+        self._record_script_time(tool_name, output, elapsed_ms)
         exit_code = output.get("exit_code", -1)
         stdout = output.get("stdout", "")
         stderr = output.get("stderr", "")
@@ -0,0 +1,241 @@
+"""
+PowerShell Pool - Runs tool scripts in warm, long-lived PowerShell hosts.
+
+PowerShellExecutor starts powershell.exe for run-script.ps1, which starts a
+second powershell.exe for the tool script, so process startup dominates short
+scripts like what-is-the-time. The pool:
+1. Keeps up to `size` pool-host.ps1 processes alive (started on demand)
+2. Sends each request as one JSON line on the host's stdin and reads one
+   "T2W "-prefixed JSON line back from its stdout
+3. Kills and replaces a host that times out, crashes or exceeds max_uses
+4. Returns the same (exit_code, stdout, stderr) tuple as PowerShellExecutor
+
+The host command is configurable, so tests can use a stub host (or pwsh on Linux).
+"""
+import itertools
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..utils import tracing
+from .powershell_executor import PowerShellExecutor
+
+RESPONSE_PREFIX = 'T2W '
+
+
+def default_host_command() -> List[str]:
+    """powershell.exe on Windows, pwsh elsewhere, running pool-host.ps1."""
+    shell = 'powershell.exe' if sys.platform == 'win32' else (shutil.which('pwsh') or 'pwsh')
+    host_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "pool-host.ps1"))
+    return [shell, '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass', '-File', host_path]
+
+
+class HostError(RuntimeError):
+    """Raised when a host process dies or can't be talked to."""
+
+
+class HostTimeout(HostError):
+    """Raised when a host doesn't answer within the timeout."""
+
+
+class _PowerShellHost:
+    """One long-lived host process and the thread that reads its responses."""
+
+    def __init__(self, command: List[str], start_timeout: float):
+        self.uses = 0
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            bufsize=1,
+        )
+        self._responses: 'queue.Queue[Optional[dict]]' = queue.Queue()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        try:
+            ready = self._next_response(start_timeout)
+            if not ready.get('ready'):
+                raise HostError(f"Unexpected host handshake: {ready}")
+        except HostError:
+            self.kill()
+            raise
+
+    def _read_loop(self) -> None:
+        for line in self.process.stdout:
+            # Anything without the prefix is stray console output from a script
+            if line.startswith(RESPONSE_PREFIX):
+                try:
+                    self._responses.put(json.loads(line[len(RESPONSE_PREFIX):]))
+                except json.JSONDecodeError:
+                    continue
+        self._responses.put(None)
+
+    def _next_response(self, timeout: float) -> dict:
+        try:
+            response = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            raise HostTimeout(f"no response within {timeout}s") from None
+        if response is None:
+            raise HostError(f"host exited with code {self.process.poll()}")
+        return response
+
+    def request(self, request_id: int, script: str, args: Dict[str, object], timeout: float,
+                path: Optional[str] = None) -> dict:
+        self.uses += 1
+        payload = {'id': request_id, 'script': script, 'args': args}
+        if path:
+            payload['path'] = path
+        trace_id = tracing.current_request_id()
+        if trace_id:
+            # Exposed to the script as $env:TALK2WINDOWS_REQUEST_ID
+            payload['request_id'] = trace_id
+        try:
+            self.process.stdin.write(json.dumps(payload) + '\n')
+            self.process.stdin.flush()
+        except OSError as e:
+            raise HostError(f"host stdin closed: {e}") from e
+        while True:
+            response = self._next_response(timeout)
+            # Skip answers to earlier requests that already timed out on our side
+            if response.get('id') == request_id:
+                return response
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def kill(self) -> None:
+        if self.alive():
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class PooledPowerShellExecutor(PowerShellExecutor):
+    """Drop-in PowerShellExecutor that reuses warm PowerShell host processes."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_uses: Optional[int] = None,
+        timeout_seconds: int = 60,
+        host_command: Optional[List[str]] = None,
+        start_timeout: float = 30.0,
+        path_map=None,
+        validator=None,
+    ):
+        super().__init__(timeout_seconds=timeout_seconds, path_map=path_map, validator=validator)
+        self.logger = logging.getLogger(__name__)
+        if size is None:
+            size = int(os.getenv('TALK2WINDOWS_PS_POOL_SIZE', '2'))
+        if max_uses is None:
+            max_uses = int(os.getenv('TALK2WINDOWS_PS_POOL_MAX_USES', '100'))
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.host_command = host_command or default_host_command()
+        self.start_timeout = start_timeout
+        self._idle: 'queue.Queue[_PowerShellHost]' = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._ids = itertools.count(1)
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'started': 0, 'recycled': 0, 'crashed': 0, 'timeouts': 0}
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _acquire(self) -> _PowerShellHost:
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    host = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if host.alive():
+                    return host
+                self._count('crashed')
+                host.kill()
+            host = _PowerShellHost(self.host_command, self.start_timeout)
+            self._count('started')
+            self.logger.debug(f"Started PowerShell host pid {host.process.pid}")
+            return host
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, host: _PowerShellHost, healthy: bool) -> None:
+        try:
+            if not healthy or self._closed:
+                host.kill()
+            elif host.uses >= self.max_uses:
+                self._count('recycled')
+                self.logger.debug(f"Recycling PowerShell host pid {host.process.pid} after {host.uses} uses")
+                host.kill()
+            else:
+                self._idle.put(host)
+        finally:
+            self._slots.release()
+
+    def run(self, tool_name: str, args: Dict[str, object]) -> Tuple[int, str, str]:
+        """Execute a script by ID in a pooled host and return (exit_code, stdout, stderr)."""
+        if self._closed:
+            raise RuntimeError("PowerShell pool is closed")
+        script_path, args, error = self._prepare(tool_name, args)
+        if error:
+            return error
+        self._count('requests')
+        try:
+            host = self._acquire()
+        except (OSError, HostError) as e:
+            return -1, "", f"Executor failed: could not start PowerShell host: {e}"
+
+        healthy = False
+        start = time.perf_counter()
+        try:
+            with tracing.span('powershell', tool=tool_name, pooled=True):
+                response = host.request(next(self._ids), tool_name, args, self.timeout_seconds, script_path)
+            healthy = True
+        except HostTimeout:
+            self._count('timeouts')
+            self.logger.warning(f"{tool_name} timed out after {self.timeout_seconds}s; replacing host")
+            return -1, "", "Executor timed out"
+        except HostError as e:
+            self._count('crashed')
+            self.logger.warning(f"PowerShell host failed while running {tool_name}: {e}")
+            return -1, "", f"Executor failed: {e}"
+        finally:
+            self._release(host, healthy)
+
+        self._record_script_time(tool_name, response, (time.perf_counter() - start) * 1000)
+        return (
+            response.get("exit_code", -1),
+            response.get("stdout") or "",
+            response.get("stderr") or "",
+        )
+
+    def close(self) -> None:
+        """Stop every idle host; busy hosts are stopped when released."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
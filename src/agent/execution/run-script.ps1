@@ -2,20 +2,34 @@ param(
     [Parameter(Mandatory=$true)]
     [string]$ScriptID,
 
+    # Arguments as a JSON object, e.g. {"AppName": "grok", "Count": 2}; types are preserved
     [Parameter(Mandatory=$false)]
-    [string]$ParamsStr = ""
+    [string]$ParamsJson = "",
+
+    # Legacy "Name=value,Name=value" form, kept for manual invocations
+    [Parameter(Mandatory=$false)]
+    [string]$ParamsStr = "",
+
+    # Absolute path resolved by the Python side; skips the recursive search
+    [Parameter(Mandatory=$false)]
+    [string]$ScriptPath = ""
 )
 
 try {
     if ($ScriptID -match '\.\.') {
         throw "Invalid script id: $ScriptID"
     }
-    
+
     # If ScriptID contains path separators, use it as-is (relative to scripts/)
     # Otherwise, search recursively in scripts/ directory
     $scriptsRoot = Join-Path $PSScriptRoot "../../../scripts"
-    
-    if ($ScriptID -match '[\\/]') {
+
+    if ($ScriptPath) {
+        # Already resolved ($scriptPath below is the same, case-insensitive variable)
+        if ((Split-Path $ScriptPath -Leaf) -ne "$ScriptID.ps1") {
+            throw "Script path does not match script id: $ScriptPath"
+        }
+    } elseif ($ScriptID -match '[\\/]') {
         # Path provided, use it directly
         $scriptPath = Join-Path $scriptsRoot "$ScriptID.ps1"
     } else {
@@ -27,9 +41,18 @@ try {
             $scriptPath = Join-Path $scriptsRoot "$ScriptID.ps1"
         }
     }
-    # Parse ParamsStr like "AppName=grok"
+
+    # Named parameters for the target script
     $params = @{}
-    if ($ParamsStr) {
+    if ($ParamsJson) {
+        $parsed = $ParamsJson | ConvertFrom-Json -ErrorAction Stop
+        if ($parsed) {
+            foreach ($property in $parsed.PSObject.Properties) {
+                $params[$property.Name] = $property.Value
+            }
+        }
+    } elseif ($ParamsStr) {
+        # Parse ParamsStr like "AppName=grok"
         $ParamsStr -split ',' | ForEach-Object {
             if ($_ -match '^(.*?)=(.*)$') {
                 $params[$matches[1]] = $matches[2]
@@ -51,41 +74,42 @@ try {
 $stdout = ""
 $stderr = ""
 $exit_code = 0
-
-# Generate unique temp file names
-$tempStdout = "stdout_$([guid]::NewGuid().ToString()).tmp"
-$tempStderr = "stderr_$([guid]::NewGuid().ToString()).tmp"
+# Time spent in the target script itself, so the caller can tell it from startup time
+$stopwatch = [System.Diagnostics.Stopwatch]::new()
 
 try {
     if (-not (Test-Path $scriptPath)) {
         throw "Script not found: $ScriptID"
     }
 
-    # Build argument list
-    $argList = @("-NoProfile", "-File", $scriptPath)
-    foreach ($param in $params.GetEnumerator()) {
-        $argList += $param.Value
+    # Run the target script in this process; a second powershell.exe would
+    # only add startup time and turn every argument back into a string
+    $global:LASTEXITCODE = 0
+    $output = @()
+    $stopwatch.Start()
+    try {
+        $output = & $scriptPath @params *>&1
+        $exit_code = if ($LASTEXITCODE) { $LASTEXITCODE } else { 0 }
+    } catch {
+        # A terminating error ends a powershell.exe -File run with exit code 1
+        $output += $_
+        $exit_code = 1
     }
-
-    # Execute the target script
-    $process = Start-Process powershell.exe -ArgumentList $argList -PassThru -Wait -RedirectStandardOutput $tempStdout -RedirectStandardError $tempStderr
-    
-    $stdout = Get-Content $tempStdout -Raw
-    $stderr = Get-Content $tempStderr -Raw
-    $exit_code = $process.ExitCode
+    $stopwatch.Stop()
+    $errors = @($output | Where-Object { $_ -is [System.Management.Automation.ErrorRecord] })
+    $stdout = (@($output | Where-Object { $_ -isnot [System.Management.Automation.ErrorRecord] }) | Out-String)
+    $stderr = ($errors | ForEach-Object { $_.ToString() }) -join [Environment]::NewLine
 
 } catch {
     $stderr = $_.Exception.Message
     $exit_code = -1
 } finally {
-    # Clean up temp files
-    Remove-Item $tempStdout, $tempStderr -ErrorAction SilentlyContinue
-
     # Output the results as a single JSON object
     $result = @{
         exit_code = $exit_code
         stdout = $stdout
         stderr = $stderr
+        duration_ms = $stopwatch.Elapsed.TotalMilliseconds
     }
     Write-Output ($result | ConvertTo-Json -Compress)
-}
\ No newline at end of file
+}
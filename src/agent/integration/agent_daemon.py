@@ -0,0 +1,276 @@
+"""
+Agent Daemon - Keeps one warm AgentService and serves commands over a local socket.
+
+serenade_bridge.py runs as a new process per voice command, so without the daemon
+every command pays for importing google.generativeai, loading the catalog and the
+semantic index, reading planner.txt and configuring Gemini. The daemon pays that
+once and then accepts newline-delimited JSON requests on 127.0.0.1:
+
+    {"type": "command", "command": "open calculator"}  -> {"ok": true, "result": "..."}
+    (a command may carry "request_id" to trace it under the caller's id)
+    {"type": "ping"}                                    -> {"ok": true, "result": "pong"}
+    {"type": "shutdown"}                                -> {"ok": true, "result": "bye"}
+
+Commands run with confirmations auto-approved, so every request must carry
+"token": the secret the daemon writes at start to a file only the current
+user can read (TALK2WINDOWS_DAEMON_TOKEN_FILE, default
+~/.talk2windows/daemon.token). Requests without it are refused.
+
+Usage:
+    python -m src.agent.integration.agent_daemon
+"""
+import asyncio
+import hmac
+import json
+import logging
+import os
+import secrets
+import socket
+import time
+from typing import Optional
+
+from ..config.config import setup_environment
+from ..utils import tracing
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 17474
+
+
+class DaemonUnavailable(RuntimeError):
+    """Raised by the client when no daemon is listening (nothing was sent)."""
+
+
+class DaemonError(RuntimeError):
+    """Raised by the client when a request reached the daemon but got no usable reply.
+    The command may still be running there, so it must not be retried in-process."""
+
+
+def daemon_address():
+    """Return (host, port) from TALK2WINDOWS_DAEMON_HOST/PORT."""
+    host = os.getenv('TALK2WINDOWS_DAEMON_HOST', DEFAULT_HOST)
+    port = int(os.getenv('TALK2WINDOWS_DAEMON_PORT', str(DEFAULT_PORT)))
+    return host, port
+
+
+def token_path() -> str:
+    return os.getenv('TALK2WINDOWS_DAEMON_TOKEN_FILE') or os.path.join(
+        os.path.expanduser('~'), '.talk2windows', 'daemon.token'
+    )
+
+
+def write_token(path: str) -> str:
+    """Create a fresh secret in a file readable by the current user only."""
+    os.makedirs(os.path.dirname(path) or '.', mode=0o700, exist_ok=True)
+    token = secrets.token_hex(32)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    os.replace(tmp_path, path)
+    return token
+
+
+def read_token(path: Optional[str] = None) -> Optional[str]:
+    try:
+        with open(path or token_path(), 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def send_request(request: dict, host: Optional[str] = None, port: Optional[int] = None,
+                 timeout: float = 120.0, token_file: Optional[str] = None) -> dict:
+    """Send one request to the daemon and return its decoded response."""
+    default_host, default_port = daemon_address()
+    host = host or default_host
+    port = port or default_port
+    token = read_token(token_file)
+    if token is None:
+        raise DaemonUnavailable(f"No agent daemon token at {token_file or token_path()}")
+    try:
+        # Connecting must fail fast so the bridge can fall back to in-process handling
+        sock = socket.create_connection((host, port), timeout=1.0)
+    except OSError as e:
+        raise DaemonUnavailable(f"Agent daemon not reachable on {host}:{port}: {e}") from e
+    # From here on the daemon may have the command; failures are DaemonError
+    try:
+        with sock:
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(dict(request, token=token)).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+    except OSError as e:
+        raise DaemonError(f"Agent daemon on {host}:{port} did not answer: {e}") from e
+    if not line:
+        raise DaemonError(f"Agent daemon on {host}:{port} closed the connection")
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise DaemonError(f"Invalid reply from agent daemon: {e}") from e
+
+
+def send_command(command: str, host: Optional[str] = None, port: Optional[int] = None,
+                 timeout: float = 120.0, request_id: Optional[str] = None,
+                 token_file: Optional[str] = None) -> Optional[str]:
+    """Run a transcript through the daemon and return the handle_transcript result."""
+    request = {'type': 'command', 'command': command}
+    if request_id:
+        request['request_id'] = request_id
+    response = send_request(request, host, port, timeout, token_file)
+    if not response.get('ok'):
+        raise DaemonError(response.get('error', 'Agent daemon error'))
+    return response.get('result')
+
+
+class AgentDaemon:
+    """Serves a single long-lived AgentService to local clients."""
+
+    def __init__(self, service, host: Optional[str] = None, port: Optional[int] = None,
+                 refresh_interval: float = 60.0, token_file: Optional[str] = None):
+        default_host, default_port = daemon_address()
+        self.service = service
+        self.token_file = token_file or token_path()
+        self._token: Optional[str] = None
+        self.host = host or default_host
+        self.port = default_port if port is None else port
+        self.refresh_interval = refresh_interval
+        self.logger = logging.getLogger(__name__)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped: Optional[asyncio.Event] = None
+        # Commands run one at a time, in arrival order, like separate bridge calls did
+        self._command_lock: Optional[asyncio.Lock] = None
+        self._last_refresh = time.monotonic()
+
+    async def start(self) -> None:
+        self._stopped = asyncio.Event()
+        self._command_lock = asyncio.Lock()
+        self._token = write_token(self.token_file)
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        # Port 0 picks a free port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"Agent daemon listening on {self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            self.logger.info("Agent daemon stopped")
+        # Leave a newer daemon's token alone
+        if self._token is not None and read_token(self.token_file) == self._token:
+            try:
+                os.remove(self.token_file)
+            except OSError:
+                pass
+        self._token = None
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _refresh_index_if_due(self) -> None:
+        """Pick up added/changed scripts without restarting the daemon."""
+        semantic_index = getattr(self.service, 'semantic_index', None)
+        if semantic_index is None or time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        self._last_refresh = time.monotonic()
+        try:
+            counts = await asyncio.get_event_loop().run_in_executor(None, semantic_index.refresh)
+        except Exception as e:
+            self.logger.warning(f"Semantic index refresh failed: {e}")
+            return
+        script_paths = getattr(self.service, 'script_paths', None)
+        if script_paths is not None and (counts['added'] or counts['removed']):
+            script_paths.invalidate()
+
+    def _authorized(self, request: dict) -> bool:
+        token = request.get('token')
+        return isinstance(token, str) and self._token is not None and hmac.compare_digest(token, self._token)
+
+    async def _dispatch(self, request: dict) -> dict:
+        request_type = request.get('type', 'command')
+        if request_type == 'ping':
+            return {'ok': True, 'result': 'pong'}
+        if request_type == 'shutdown':
+            self._stopped.set()
+            return {'ok': True, 'result': 'bye'}
+        if request_type != 'command':
+            return {'ok': False, 'error': f"Unknown request type: {request_type}"}
+
+        command = request.get('command', '')
+        if not isinstance(command, str) or not command.strip():
+            return {'ok': False, 'error': 'Missing command'}
+        async with self._command_lock:
+            await self._refresh_index_if_due()
+            with tracing.request(request.get('request_id')) as request_id:
+                self.logger.info(f"[{request_id}] Daemon command: '{command}'")
+                start = time.perf_counter()
+                result = await self.service.handle_transcript(command)
+                self.logger.info(
+                    f"[{request_id}] Daemon command handled in {(time.perf_counter() - start) * 1000:.0f}ms"
+                )
+        return {'ok': True, 'result': result}
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    if not self._authorized(request):
+                        self.logger.warning("Refused daemon request without a valid token")
+                        writer.write(json.dumps({'ok': False, 'error': 'Unauthorized'}).encode('utf-8') + b'\n')
+                        await writer.drain()
+                        break
+                    response = await self._dispatch(request)
+                except (ValueError, json.JSONDecodeError) as e:
+                    response = {'ok': False, 'error': f"Invalid request: {e}"}
+                except Exception as e:
+                    self.logger.error(f"Daemon command failed: {e}", exc_info=True)
+                    response = {'ok': False, 'error': str(e)}
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def run_daemon(host: Optional[str] = None, port: Optional[int] = None) -> None:
+    """Build the warm AgentService and serve it until a shutdown request."""
+    from ..core.service import AgentService
+
+    # Same settings the bridge uses for its in-process service
+    os.environ['TALK2WINDOWS_DISABLE_TTS'] = '1'
+    start = time.perf_counter()
+    service = AgentService(prompt_provider=lambda _: 'yes')
+    # Pay for importing and configuring Gemini now, not on the first command
+    service.warm_up()
+    logging.info(f"AgentService ready in {(time.perf_counter() - start) * 1000:.0f}ms")
+    try:
+        await AgentDaemon(service, host, port).serve_forever()
+    finally:
+        # Stop the worker pools and pooled PowerShell hosts
+        service.close()
+
+
+if __name__ == "__main__":
+    setup_environment()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    try:
+        asyncio.run(run_daemon())
+    except KeyboardInterrupt:
+        pass
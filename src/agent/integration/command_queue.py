@@ -0,0 +1,207 @@
+"""
+Command Queue - Bounded, ordered processing of voice commands.
+
+SerenadeListener used to start a task per callback, so a burst of utterances
+ran unbounded Gemini and PowerShell work concurrently and finished out of
+order. The queue:
+1. Holds at most max_size pending commands; when full, the oldest pending
+   command is dropped (the newest utterance is the one the user cares about)
+2. Runs at most `concurrency` commands at once (default 1, i.e. in order)
+3. Drops an utterance that repeats one submitted within dedupe_window seconds
+   (Serenade often delivers the same callback twice)
+4. Cancels pending and running commands on "cancel" / "stop" / "never mind",
+   and in supersede mode a new command replaces any still-pending ones
+5. Tracks its worker and command tasks so close() shuts down cleanly, and
+   reports queue depth and end-to-end latency via stats()
+6. Runs each command under its request id and traces the time it waited
+   in the queue as a 'queue_wait' span
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from ..utils import tracing
+
+CANCEL_PHRASES = {'cancel', 'cancel that', 'stop', 'stop that', 'never mind', 'nevermind'}
+
+LATENCY_SAMPLES = 500
+
+
+def normalize_utterance(transcript: str) -> str:
+    return re.sub(r'\s+', ' ', transcript.lower()).strip(' .!?')
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class CommandQueue:
+    """Feeds transcripts to an async handler with bounded depth and concurrency."""
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[Any]],
+        max_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        dedupe_window: Optional[float] = None,
+        supersede: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.handler = handler
+        if max_size is None:
+            max_size = int(os.getenv('TALK2WINDOWS_LISTENER_QUEUE_SIZE', '8'))
+        if concurrency is None:
+            concurrency = int(os.getenv('TALK2WINDOWS_LISTENER_CONCURRENCY', '1'))
+        if dedupe_window is None:
+            dedupe_window = float(os.getenv('TALK2WINDOWS_LISTENER_DEDUPE_WINDOW', '1.5'))
+        if supersede is None:
+            supersede = os.getenv('TALK2WINDOWS_LISTENER_SUPERSEDE', '0') == '1'
+        self.max_size = max(1, max_size)
+        self.concurrency = max(1, concurrency)
+        self.dedupe_window = dedupe_window
+        self.supersede = supersede
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._pending: Deque[Dict] = deque()
+        self._has_work = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._running: Set[asyncio.Task] = set()
+        self._last_seen: Dict[str, float] = {}
+        self._closed = False
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._counts = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'duplicates': 0,
+            'dropped': 0,
+        }
+        self._max_depth = 0
+
+    def start(self) -> None:
+        """Start the worker tasks; must be called from the running event loop."""
+        if self._workers:
+            return
+        self._closed = False
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.concurrency)]
+
+    def submit(self, transcript: str, request_id: Optional[str] = None) -> str:
+        """
+        Queue a transcript. Returns 'queued', 'duplicate' or 'cancelled'
+        (for a cancel phrase, which is handled here rather than queued).
+        The command is traced under request_id (a new one if not given).
+        """
+        key = normalize_utterance(transcript)
+        if key in CANCEL_PHRASES:
+            self.cancel_all()
+            return 'cancelled'
+
+        now = self.clock()
+        last = self._last_seen.get(key)
+        self._last_seen = {k: t for k, t in self._last_seen.items() if now - t < self.dedupe_window}
+        if last is not None and now - last < self.dedupe_window:
+            self._counts['duplicates'] += 1
+            self.logger.info(f"Ignoring repeated command: {transcript}")
+            return 'duplicate'
+        self._last_seen[key] = now
+
+        if self.supersede:
+            self._cancel_pending("superseded")
+        while len(self._pending) >= self.max_size:
+            dropped = self._pending.popleft()
+            self._counts['dropped'] += 1
+            self.logger.warning(f"Command queue full; dropping: {dropped['transcript']}")
+        self._pending.append({
+            'transcript': transcript,
+            'submitted': now,
+            'request_id': request_id or tracing.new_request_id(),
+        })
+        self._counts['submitted'] += 1
+        self._max_depth = max(self._max_depth, len(self._pending))
+        self._has_work.set()
+        return 'queued'
+
+    def cancel_all(self) -> int:
+        """Cancel pending and running commands; returns how many were cancelled."""
+        count = self._cancel_pending("cancelled")
+        for task in list(self._running):
+            if not task.done():
+                task.cancel()
+                count += 1
+        self.logger.info(f"Cancelled {count} command(s)")
+        return count
+
+    def _cancel_pending(self, reason: str) -> int:
+        count = len(self._pending)
+        for entry in self._pending:
+            self.logger.info(f"Command {reason}: {entry['transcript']}")
+        self._pending.clear()
+        self._counts['cancelled'] += count
+        return count
+
+    async def join(self) -> None:
+        """Wait until every queued command has finished."""
+        while self._pending or self._running:
+            await asyncio.sleep(0.01)
+
+    async def close(self) -> None:
+        """Cancel pending and running commands and stop the workers."""
+        self._closed = True
+        self.cancel_all()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, *self._running, return_exceptions=True)
+        self._workers = []
+        self.logger.info(f"Command queue stopped: {self.stats()}")
+
+    async def _worker(self) -> None:
+        while True:
+            while not self._pending:
+                self._has_work.clear()
+                await self._has_work.wait()
+            entry = self._pending.popleft()
+            task = asyncio.ensure_future(self._run(entry))
+            self._running.add(task)
+            try:
+                await task
+                self._counts['completed'] += 1
+            except asyncio.CancelledError:
+                if self._closed:
+                    raise
+                self._counts['cancelled'] += 1
+                self.logger.info(f"Command cancelled: {entry['transcript']}")
+            except Exception as e:
+                self._counts['failed'] += 1
+                self.logger.error(f"Command failed: {entry['transcript']}: {e}")
+            finally:
+                self._running.discard(task)
+                self._latencies.append(self.clock() - entry['submitted'])
+
+    async def _run(self, entry: Dict) -> Any:
+        with tracing.request(entry['request_id']):
+            tracing.record('queue_wait', (self.clock() - entry['submitted']) * 1000)
+            return await self.handler(entry['transcript'])
+
+    def stats(self) -> Dict:
+        latencies = list(self._latencies)
+        stats = dict(self._counts)
+        stats.update({
+            'queued': len(self._pending),
+            'max_queued': self._max_depth,
+            'running': len(self._running),
+        })
+        if latencies:
+            stats.update({
+                'latency_avg_ms': round(sum(latencies) / len(latencies) * 1000, 1),
+                'latency_p50_ms': round(_percentile(latencies, 0.5) * 1000, 1),
+                'latency_p95_ms': round(_percentile(latencies, 0.95) * 1000, 1),
+                'latency_max_ms': round(max(latencies) * 1000, 1),
+            })
+        return stats
@@ -5,35 +5,66 @@ This script acts as a bridge between Serenade voice commands and the Gemini agen
 Instead of directly executing PowerShell scripts, voice commands are processed through
 Gemini's natural language understanding for smarter execution.
 
+When the agent daemon (agent_daemon.py) is running the bridge only forwards the
+command over its local socket; otherwise it starts an AgentService in-process.
+Once a command has been sent to the daemon it is never re-run in-process,
+even if the daemon times out or drops the connection.
+Set TALK2WINDOWS_DAEMON=0 to always run in-process.
+
 Usage:
     python -m src.agent.serenade_bridge "user voice command"
+    python -m src.agent.serenade_bridge --profile-startup "user voice command"
 """
 import asyncio
 import logging
 import os
 import sys
-from ..core.service import AgentService
 from ..config.config import setup_environment
-
-# Set up environment variables for consistent operation
-setup_environment()
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from ..utils import startup_profile, tracing
+from .agent_daemon import DaemonError, DaemonUnavailable, send_command
 
 async def process_voice_command(command: str):
     """Process a voice command through the Gemini agent."""
+    # One id for the command, whether the daemon or this process handles it
+    request_id = tracing.new_request_id()
+    logging.info(f"[{request_id}] Voice command: '{command}'")
+    if os.getenv('TALK2WINDOWS_DAEMON', '1') != '0':
+        try:
+            result = await asyncio.get_event_loop().run_in_executor(
+                None, lambda: send_command(command, request_id=request_id)
+            )
+            logging.info(f"[{request_id}] Command handled by agent daemon")
+            return result
+        except DaemonUnavailable as e:
+            logging.info(f"{e}; handling command in-process")
+        except DaemonError as e:
+            # The daemon got the command and may still run it; running it here too could repeat it
+            logging.error(f"[{request_id}] Agent daemon failed: {e}")
+            return None
+
+    # Imported here so the daemon path never pays for loading Gemini and the catalog
+    with startup_profile.phase('import core.service'):
+        from ..core.service import AgentService
+
     # Disable TTS for bridge operations to avoid hanging
     os.environ['TALK2WINDOWS_DISABLE_TTS'] = '1'
     
     service = AgentService(prompt_provider=lambda _: 'yes')
     
-    result = await service.handle_transcript(command)
-    return result
+    try:
+        with startup_profile.phase('first command'):
+            return await service.handle_transcript(command, request_id=request_id)
+    finally:
+        service.close()
 
 if __name__ == "__main__":
+    # Set up environment variables for consistent operation
+    setup_environment()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    profile = startup_profile.profile_requested(sys.argv)
     if len(sys.argv) < 2:
         print("Usage: python -m src.agent.serenade_bridge 'voice command here'")
         sys.exit(1)
@@ -52,4 +83,7 @@ if __name__ == "__main__":
             sys.exit(0)
     except Exception as e:
         logging.error(f"Command processing failed with exception: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        if profile:
+            print(startup_profile.report())
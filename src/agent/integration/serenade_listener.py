@@ -1,20 +1,27 @@
 import asyncio
 import json
 import logging
-import websockets
 import os
-from ..core.service import AgentService
+from typing import TYPE_CHECKING
+
 from ..config.config import setup_environment
+from ..utils import tracing
+from ..utils.lazy_import import lazy_import
+from .command_queue import CommandQueue
+
+if TYPE_CHECKING:
+    from ..core.service import AgentService
 
-# Set up environment variables for consistent operation
-setup_environment()
+websockets = lazy_import('websockets')
 
 class SerenadeListener:
-    def __init__(self, service: AgentService):
+    def __init__(self, service: 'AgentService'):
         self.service = service
         self.logger = logging.getLogger(__name__)
         self.uri = "ws://localhost:17373"
         self.heartbeat_task = None
+        # Bounded, ordered processing of transcripts across reconnects
+        self.commands = CommandQueue(self.service.handle_transcript)
 
     async def heartbeat(self, websocket):
         """Send heartbeat every 5 seconds."""
@@ -44,13 +51,16 @@ class SerenadeListener:
                         if data.get("type") == "callback":
                             transcript = data.get("transcript", "")
                             if transcript:
-                                self.logger.info(f"Processing transcript: {transcript}")
-                                # Run the transcript processing in the background to avoid blocking
-                                asyncio.create_task(self.service.handle_transcript(transcript))
+                                # Queue it so the receive loop never blocks on processing
+                                # The request id follows the command through every stage
+                                request_id = tracing.new_request_id()
+                                status = self.commands.submit(transcript, request_id=request_id)
+                                self.logger.info(f"[{request_id}] Transcript {status}: {transcript}")
                             else:
                                 self.logger.warning("Received callback without transcript")
                 except websockets.exceptions.ConnectionClosed:
                     self.logger.warning("WebSocket connection closed")
+                    self.logger.info(f"Command queue: {self.commands.stats()}")
                 finally:
                     if self.heartbeat_task:
                         self.heartbeat_task.cancel()
@@ -63,12 +73,16 @@ class SerenadeListener:
 
     async def run(self):
         """Main loop with auto-reconnect."""
-        while True:
-            try:
-                await self.connect()
-            except Exception as e:
-                self.logger.error(f"Connection failed: {e}")
-                await asyncio.sleep(5)  # Retry after 5 seconds
+        self.commands.start()
+        try:
+            while True:
+                try:
+                    await self.connect()
+                except Exception as e:
+                    self.logger.error(f"Connection failed: {e}")
+                    await asyncio.sleep(5)  # Retry after 5 seconds
+        finally:
+            await self.commands.close()
 
 if __name__ == "__main__":
     # Configure logging
@@ -78,6 +92,10 @@ if __name__ == "__main__":
     )
     
     try:
+        # Set up environment variables for consistent operation
+        setup_environment()
+        from ..core.service import AgentService
+
         service = AgentService()
         listener = SerenadeListener(service)
         asyncio.run(listener.run())
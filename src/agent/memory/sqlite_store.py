@@ -0,0 +1,182 @@
+"""
+SQLite Memory Store - MemoryStore API backed by a single SQLite database.
+
+The JSON store keeps only the last 100 actions, and answering "what did I
+run last" means loading all of them. This backend (TALK2WINDOWS_MEMORY_BACKEND
+=sqlite) keeps the same save/load/append_action/recent_actions API, plus:
+1. WAL mode and a busy timeout, so bridge processes can read while one writes
+2. An actions table indexed on (tool, ts) and ts, with no count cap
+3. Time-based pruning (TALK2WINDOWS_MEMORY_RETENTION_DAYS, 0 = keep forever)
+4. Indexed queries: last_runs(tool), most_used_tools(since), last_action()
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    tool TEXT NOT NULL,
+    args TEXT NOT NULL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_actions_tool_ts ON actions (tool, ts);
+CREATE INDEX IF NOT EXISTS idx_actions_ts ON actions (ts);
+"""
+
+
+class SQLiteMemoryStore:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        keep_last: int = 100,
+        retention_days: Optional[float] = None,
+        clock=time.time,
+    ):
+        if path is None:
+            path = os.path.join(os.path.dirname(__file__), "memory", "memory.db")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        # Size of the recent_actions window, matching the JSON store
+        self.keep_last = keep_last
+        if retention_days is None:
+            retention_days = float(os.getenv('TALK2WINDOWS_MEMORY_RETENTION_DAYS', '0'))
+        self.retention_days = retention_days
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self.prune()
+
+    @property
+    def recent_actions(self) -> List[Dict]:
+        """The last keep_last actions, oldest first."""
+        rows = self._query(
+            'SELECT ts, tool, args, result FROM actions ORDER BY id DESC LIMIT ?', (self.keep_last,)
+        )
+        return [self._action(row) for row in reversed(rows)]
+
+    def save(self, key: str, value: Any) -> None:
+        """Persist a key-value pair; 'recent_actions' replaces the action history."""
+        with self._lock, self._conn:
+            if key == 'recent_actions':
+                self._conn.execute('DELETE FROM actions')
+                self._insert_actions(list(value))
+                return
+            self._conn.execute(
+                'INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)', (key, json.dumps(value))
+            )
+
+    def load(self, key: str):
+        """Load a value by key."""
+        if key == 'recent_actions':
+            return self.recent_actions
+        rows = self._query('SELECT value FROM kv WHERE key = ?', (key,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def append_action(self, action: Dict) -> None:
+        self.append_actions([action])
+
+    def append_actions(self, actions: List[Dict]) -> None:
+        """Record actions in one transaction."""
+        if not actions:
+            return
+        with self._lock, self._conn:
+            self._insert_actions(actions)
+
+    def compact(self) -> bool:
+        """Prune expired actions; kept for API parity with the JSON store."""
+        self.prune()
+        return True
+
+    def prune(self, older_than_days: Optional[float] = None) -> int:
+        """Delete actions older than the retention window; returns how many."""
+        days = self.retention_days if older_than_days is None else older_than_days
+        if not days or days <= 0:
+            return 0
+        cutoff = self.clock() - days * 86400
+        with self._lock, self._conn:
+            deleted = self._conn.execute('DELETE FROM actions WHERE ts < ?', (cutoff,)).rowcount
+        if deleted:
+            self.logger.info(f"Pruned {deleted} action(s) older than {days} day(s)")
+        return deleted
+
+    def last_action(self, tool: Optional[str] = None) -> Optional[Dict]:
+        """The most recent action, optionally of one tool (for "do it again")."""
+        runs = self.last_runs(tool, limit=1) if tool else self._actions(
+            'SELECT ts, tool, args, result FROM actions ORDER BY id DESC LIMIT 1', ()
+        )
+        return runs[0] if runs else None
+
+    def last_runs(self, tool: str, limit: int = 10) -> List[Dict]:
+        """The most recent runs of a tool, newest first."""
+        return self._actions(
+            'SELECT ts, tool, args, result FROM actions WHERE tool = ? ORDER BY ts DESC, id DESC LIMIT ?',
+            (tool, limit),
+        )
+
+    def most_used_tools(self, since: Optional[float] = None, limit: int = 10) -> List[Dict]:
+        """Tools ranked by run count since a timestamp (default: the last 7 days)."""
+        if since is None:
+            since = self.clock() - 7 * 86400
+        rows = self._query(
+            'SELECT tool, COUNT(*) AS runs FROM actions WHERE ts >= ? '
+            'GROUP BY tool ORDER BY runs DESC, tool LIMIT ?',
+            (since, limit),
+        )
+        return [{'tool': tool, 'runs': runs} for tool, runs in rows]
+
+    def count_actions(self) -> int:
+        return self._query('SELECT COUNT(*) FROM actions', ())[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _insert_actions(self, actions: List[Dict]) -> None:
+        now = self.clock()
+        self._conn.executemany(
+            'INSERT INTO actions (ts, tool, args, result) VALUES (?, ?, ?, ?)',
+            [
+                (action.get('ts', now), action.get('tool', ''), json.dumps(action.get('args', {})),
+                 action.get('result'))
+                for action in actions
+            ],
+        )
+
+    def _query(self, sql: str, params) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _actions(self, sql: str, params) -> List[Dict]:
+        return [self._action(row) for row in self._query(sql, params)]
+
+    @staticmethod
+    def _action(row) -> Dict:
+        ts, tool, args, result = row
+        return {'tool': tool, 'args': json.loads(args), 'result': result, 'ts': ts}
+
+    def get_passphrase_hash(self):
+        """Get stored passphrase hash."""
+        config = self.load('config') or {}
+        return config.get('passphrase_hash')
+
+    def set_passphrase(self, passphrase: str) -> None:
+        """Set passphrase hash."""
+        config = self.load('config') or {}
+        config['passphrase_hash'] = hashlib.sha256(passphrase.encode()).hexdigest()
+        self.save('config', config)
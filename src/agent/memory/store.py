@@ -1,29 +1,95 @@
+"""
+Memory Store - Small JSON key/value store plus the recent-actions history.
+
+recent_actions used to be rewritten in full (non-atomically) after every
+action, so each action cost O(history) I/O and a crash mid-write lost the
+whole file. Actions are now kept as:
+1. A snapshot, recent_actions.json (the last keep_last actions, as before)
+2. An append-only journal, recent_actions.jsonl, with one action per line
+   written in a single O_APPEND write, so several bridge processes can
+   append without interleaving
+3. Periodic compaction: the journal is renamed aside, merged into a new
+   snapshot written to a temp file and renamed over the old one, then removed;
+   save('recent_actions') replaces the history the same way, and if another
+   process keeps the compaction lock it writes the snapshot and empties the
+   journal anyway rather than losing the new history
+The fsync policy is TALK2WINDOWS_MEMORY_FSYNC: 'always' (every append),
+'compact' (snapshots only, the default) or 'never'.
+"""
 import hashlib
 import json
+import logging
 import os
-from typing import Any
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+FSYNC_POLICIES = ('always', 'compact', 'never')
+
+# A compaction lock older than this was left behind by a crashed process
+STALE_LOCK_SECONDS = 30
+# save('recent_actions') waits this long, in total, for another compaction to finish
+SAVE_RETRIES = 5
+SAVE_RETRY_DELAY = 0.05
 
 
 class MemoryStore:
-    def __init__(self):
-        self.memory_dir = os.path.join(os.path.dirname(__file__), "memory")
+    def __init__(
+        self,
+        memory_dir: Optional[str] = None,
+        keep_last: int = 100,
+        compact_every: Optional[int] = None,
+        fsync: Optional[str] = None,
+    ):
+        self.memory_dir = memory_dir or os.path.join(os.path.dirname(__file__), "memory")
         os.makedirs(self.memory_dir, exist_ok=True)
-        self.recent_actions = self.load('recent_actions') or []
-        self._prune_actions_if_needed()
+        self.keep_last = keep_last
+        if compact_every is None:
+            compact_every = int(os.getenv('TALK2WINDOWS_MEMORY_COMPACT_EVERY', str(keep_last)))
+        self.compact_every = max(1, compact_every)
+        fsync = fsync or os.getenv('TALK2WINDOWS_MEMORY_FSYNC', 'compact')
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.fsync = fsync
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        self.journal_path = os.path.join(self.memory_dir, 'recent_actions.jsonl')
+        self._compacting_path = self.journal_path + '.compacting'
+        self._lock_path = os.path.join(self.memory_dir, 'recent_actions.lock')
+        self.recent_actions, self._journal_entries = self._load_actions()
 
     def _path_for(self, key: str) -> str:
         return os.path.join(self.memory_dir, f"{key}.json")
 
     def _write_json(self, key: str, value: Any) -> None:
+        """Write via a temp file and rename, so readers never see a partial file."""
         path = self._path_for(key)
-        with open(path, 'w', encoding='utf-8') as file:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
             json.dump(value, file)
+            if self.fsync != 'never':
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
 
     def save(self, key: str, value: Any) -> None:
         """Persist a key-value pair to disk."""
         if key == 'recent_actions':
-            self.recent_actions = list(value)
-            self._prune_actions_if_needed(persist=True)
+            # Replaces the whole history; new actions should use append_action
+            with self._lock:
+                history = list(value)[-self.keep_last:]
+                for attempt in range(SAVE_RETRIES):
+                    if self._compact(replace_with=history):
+                        return
+                    time.sleep(SAVE_RETRY_DELAY * (attempt + 1))
+                # Don't drop the new history: write it and empty the journal it replaces
+                self.logger.warning("recent_actions compaction busy; replacing the history without the lock")
+                self._write_json('recent_actions', history)
+                fd = os.open(self.journal_path, os.O_WRONLY | os.O_TRUNC | os.O_CREAT, 0o644)
+                os.close(fd)
+                self.recent_actions = history
+                self._journal_entries = 0
             return
         self._write_json(key, value)
 
@@ -35,13 +101,124 @@ class MemoryStore:
                 return json.load(file)
         return None
 
-    def _prune_actions_if_needed(self, persist: bool = False) -> None:
-        """Ensure recent_actions keeps only the last 100 entries."""
-        if len(self.recent_actions) > 100:
-            self.recent_actions = self.recent_actions[-100:]
-            persist = True
-        if persist:
-            self._write_json('recent_actions', self.recent_actions)
+    def append_action(self, action: Dict) -> None:
+        """Record one action with a single append to the journal."""
+        self.append_actions([action])
+
+    def append_actions(self, actions: List[Dict]) -> None:
+        """Record several actions (e.g. a whole plan) with one journal write."""
+        if not actions:
+            return
+        data = ''.join(json.dumps(action) + '\n' for action in actions).encode('utf-8')
+        with self._lock:
+            fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+                if self.fsync == 'always':
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.recent_actions.extend(actions)
+            del self.recent_actions[:-self.keep_last]
+            self._journal_entries += len(actions)
+            if self._journal_entries >= self.compact_every:
+                self._compact()
+
+    def compact(self) -> bool:
+        """Fold the journal into the snapshot; returns False if another process holds the lock."""
+        with self._lock:
+            return self._compact()
+
+    def _compact(self, replace_with: Optional[List[Dict]] = None) -> bool:
+        if not self._acquire_compaction_lock():
+            return False
+        try:
+            # Finish a compaction a crashed process left behind, then rotate the
+            # journal aside so appends from other processes go to a fresh file
+            self._merge_compacting()
+            try:
+                os.replace(self.journal_path, self._compacting_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Windows refuses to rename a file another process has open
+                self.logger.debug(f"Journal busy, compaction postponed: {e}")
+                return False
+            if replace_with is not None:
+                self._write_json('recent_actions', replace_with)
+                self._remove(self._compacting_path)
+            else:
+                self._merge_compacting()
+            self.recent_actions = self.load('recent_actions') or []
+            self.recent_actions.extend(self._read_journal(self.journal_path))
+            del self.recent_actions[:-self.keep_last]
+            self._journal_entries = 0
+            return True
+        finally:
+            self._remove(self._lock_path)
+
+    def _merge_compacting(self) -> None:
+        if not os.path.exists(self._compacting_path):
+            return
+        snapshot_path = self._path_for('recent_actions')
+        # A snapshot newer than the rotated journal already contains it
+        if not (os.path.exists(snapshot_path)
+                and os.path.getmtime(snapshot_path) > os.path.getmtime(self._compacting_path)):
+            actions = self.load('recent_actions') or []
+            actions.extend(self._read_journal(self._compacting_path))
+            self._write_json('recent_actions', actions[-self.keep_last:])
+        self._remove(self._compacting_path)
+
+    def _acquire_compaction_lock(self) -> bool:
+        for _ in range(2):
+            try:
+                os.close(os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self._lock_path) < STALE_LOCK_SECONDS:
+                        return False
+                except OSError:
+                    pass
+                self.logger.warning("Removing stale recent_actions compaction lock")
+                self._remove(self._lock_path)
+        return False
+
+    def _load_actions(self):
+        """Snapshot, then any rotated journal, then the live journal."""
+        actions = self.load('recent_actions') or []
+        snapshot_path = self._path_for('recent_actions')
+        if os.path.exists(self._compacting_path) and not (
+            os.path.exists(snapshot_path)
+            and os.path.getmtime(snapshot_path) > os.path.getmtime(self._compacting_path)
+        ):
+            actions.extend(self._read_journal(self._compacting_path))
+        journal = self._read_journal(self.journal_path)
+        actions.extend(journal)
+        return actions[-self.keep_last:], len(journal)
+
+    def _read_journal(self, path: str) -> List[Dict]:
+        if not os.path.exists(path):
+            return []
+        actions = []
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    actions.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append
+                    self.logger.warning(f"Skipping corrupt journal line in {path}")
+        return actions
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
 
     def get_passphrase_hash(self):
         """Get stored passphrase hash."""
@@ -52,4 +229,15 @@ class MemoryStore:
         """Set passphrase hash."""
         config = self.load('config') or {}
         config['passphrase_hash'] = hashlib.sha256(passphrase.encode()).hexdigest()
-        self._write_json('config', config)
\ No newline at end of file
+        self._write_json('config', config)
+
+
+def create_memory_store():
+    """Build the store selected by TALK2WINDOWS_MEMORY_BACKEND ('json' or 'sqlite')."""
+    backend = os.getenv('TALK2WINDOWS_MEMORY_BACKEND', 'json')
+    if backend == 'sqlite':
+        from .sqlite_store import SQLiteMemoryStore
+        return SQLiteMemoryStore()
+    if backend != 'json':
+        raise ValueError(f"Unknown memory backend: {backend}")
+    return MemoryStore()
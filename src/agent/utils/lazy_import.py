@@ -0,0 +1,64 @@
+"""
+Lazy Import - Module proxies that import on first attribute access.
+
+google.generativeai, yaml and websockets take long to import and many
+commands never need them (a fast-path route needs neither Gemini nor YAML).
+`genai = lazy_import('google.generativeai')` keeps the usual module-level
+name, so call sites and mock.patch targets don't change, but the import only
+happens when an attribute is first used. That import is recorded as a
+startup_profile phase. A missing module raises ImportError at that point
+instead of at startup.
+"""
+import importlib
+import threading
+from typing import Any
+
+from . import startup_profile
+
+
+class LazyModule:
+    """Stands in for a module until one of its attributes is needed."""
+
+    def __init__(self, name: str):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_module', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _load(self):
+        module = object.__getattribute__(self, '_module')
+        if module is not None:
+            return module
+        with object.__getattribute__(self, '_lock'):
+            module = object.__getattribute__(self, '_module')
+            if module is None:
+                name = object.__getattribute__(self, '_name')
+                with startup_profile.phase(f"import {name}"):
+                    module = importlib.import_module(name)
+                object.__setattr__(self, '_module', module)
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return object.__getattribute__(self, '_module') is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, '_name')
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module '{name}' ({state})>"
+
+
+def lazy_import(name: str) -> Any:
+    """Return a proxy for `name` that imports it on first use."""
+    return LazyModule(name)
@@ -0,0 +1,59 @@
+# Long-lived speech host used by TTS (PowerShellSpeaker).
+# Speaks with SAPI like scripts/say.ps1, but stays alive between utterances.
+# Reads one JSON request per line from stdin:
+#     {"op": "say", "id": 1, "text": "Hello"}
+#     {"op": "stop"}
+# and answers on stdout with "T2W "-prefixed JSON lines:
+#     T2W {"ready": true, "pid": 1234}
+#     T2W {"id": 1, "done": true, "interrupted": false}
+
+$voice = New-Object -ComObject SAPI.SPVoice
+foreach ($v in $voice.GetVoices()) { if ($v.GetDescription() -like "*- English*") { $voice.Voice = $v } }
+
+if ("$env:TEMP" -ne "") { $tmpDir = "$env:TEMP"
+} elseif ("$env:TMP" -ne "") { $tmpDir = "$env:TMP"
+} elseif ($IsLinux) { $tmpDir = "/tmp"
+} else { $tmpDir = "C:\Temp" }
+
+$SVSFlagsAsync = 1
+$SVSFPurgeBeforeSpeak = 2
+
+function Write-Response($response) {
+    [Console]::Out.WriteLine("T2W " + ($response | ConvertTo-Json -Compress))
+    [Console]::Out.Flush()
+}
+
+Write-Response @{ ready = $true; pid = $PID }
+
+# Poll stdin asynchronously so a "stop" can arrive while speech is playing
+$pending = [Console]::In.ReadLineAsync()
+$current = $null
+while ($true) {
+    if ($pending.Wait(50)) {
+        $line = $pending.Result
+        if ($null -eq $line) {
+            break
+        }
+        $pending = [Console]::In.ReadLineAsync()
+        try {
+            $request = $line | ConvertFrom-Json
+        } catch {
+            continue
+        }
+        if ($request.op -eq 'say') {
+            "$($request.text)" > "$tmpDir/talk2windows.txt"
+            [void]$voice.Speak([string]$request.text, $SVSFlagsAsync)
+            $current = $request.id
+        } elseif ($request.op -eq 'stop') {
+            [void]$voice.Speak("", $SVSFPurgeBeforeSpeak)
+            if ($null -ne $current) {
+                Write-Response @{ id = $current; done = $true; interrupted = $true }
+                $current = $null
+            }
+        }
+    }
+    if ($null -ne $current -and $voice.WaitUntilDone(0)) {
+        Write-Response @{ id = $current; done = $true; interrupted = $false }
+        $current = $null
+    }
+}
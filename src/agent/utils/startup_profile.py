@@ -0,0 +1,70 @@
+"""
+Startup Profile - Records how long each import and init step takes.
+
+Serenade starts a new bridge process for every voice command, so startup time
+is paid on every command. Components wrap their expensive steps in phase(),
+lazy imports record themselves when first used, and the --profile-startup
+flag of the service and bridge entry points prints the report:
+
+      12.3 ms  import core.service
+     210.4 ms  AgentService init
+      35.1 ms    tool catalog
+      80.2 ms    semantic index
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+_lock = threading.Lock()
+_local = threading.local()
+_phases: List[Dict] = []
+
+PROFILE_FLAG = '--profile-startup'
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block; phases started inside it are reported nested under it."""
+    depth = getattr(_local, 'depth', 0)
+    entry = {'name': name, 'depth': depth, 'ms': None}
+    with _lock:
+        _phases.append(entry)
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry['ms'] = (time.perf_counter() - start) * 1000
+        _local.depth = depth
+
+
+def phases() -> List[Dict]:
+    with _lock:
+        return [dict(entry) for entry in _phases]
+
+
+def reset() -> None:
+    with _lock:
+        _phases.clear()
+
+
+def report() -> str:
+    """Phases in start order, indented by nesting, with the top-level total."""
+    entries = phases()
+    lines = [
+        f"{entry['ms'] if entry['ms'] is not None else float('nan'):10.1f} ms  {'  ' * entry['depth']}{entry['name']}"
+        for entry in entries
+    ]
+    total = sum(entry['ms'] or 0.0 for entry in entries if entry['depth'] == 0)
+    lines.append(f"{total:10.1f} ms  total")
+    return "\n".join(lines)
+
+
+def profile_requested(argv: List[str]) -> bool:
+    """Remove --profile-startup from argv; True if it was there."""
+    if PROFILE_FLAG not in argv:
+        return False
+    while PROFILE_FLAG in argv:
+        argv.remove(PROFILE_FLAG)
+    return True
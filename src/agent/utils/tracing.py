@@ -0,0 +1,280 @@
+"""
+Tracing - Per-stage timing spans tied together by a request correlation ID.
+
+handle_transcript had no timing, so a slow command couldn't be attributed to
+semantic search, Gemini, confirmation, PowerShell or speech. This module gives:
+1. A correlation ID per request (a contextvar). It is set where a transcript
+   enters (listener, bridge, daemon), follows the work into worker threads
+   and reaches PowerShell as TALK2WINDOWS_REQUEST_ID
+2. span(stage) for timing a block, and record() for durations measured
+   elsewhere (e.g. script runtime reported by run-script.ps1)
+3. Pluggable sinks, chosen with TALK2WINDOWS_TRACE_SINKS (comma-separated):
+   'log', 'jsonl' (appends to TALK2WINDOWS_TRACE_FILE) and 'prometheus'
+   (text exposition, served on TALK2WINDOWS_METRICS_PORT when set)
+4. `python -m src.agent.utils.tracing [spans.jsonl]` to print p50/p95/p99
+   per stage, or one request's spans with --request ID
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_TRACE_FILE = os.path.join(
+    os.path.dirname(__file__), "..", "memory", "memory", "spans.jsonl"
+)
+
+# Histogram buckets in seconds, from a cache hit to a slow Gemini call
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_request_id: ContextVar[Optional[str]] = ContextVar('talk2windows_request_id', default=None)
+_sinks: List = []
+_configured = False
+_configure_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+@contextmanager
+def request(request_id: Optional[str] = None) -> Iterator[str]:
+    """Run a block under a correlation ID: the given one, the current one, or a new one."""
+    current = _request_id.get()
+    if request_id is None and current is not None:
+        yield current
+        return
+    token = _request_id.set(request_id or new_request_id())
+    try:
+        yield _request_id.get()
+    finally:
+        _request_id.reset(token)
+
+
+def record(stage: str, ms: float, request_id: Optional[str] = None, **attrs) -> None:
+    """Send one finished span to every sink."""
+    if not _sinks:
+        return
+    span = {
+        'ts': round(time.time(), 3),
+        'request_id': request_id or _request_id.get(),
+        'stage': stage,
+        'ms': round(ms, 3),
+    }
+    span.update(attrs)
+    for sink in list(_sinks):
+        try:
+            sink.emit(span)
+        except Exception as e:
+            logger.warning(f"Trace sink {type(sink).__name__} failed: {e}")
+
+
+@contextmanager
+def span(stage: str, **attrs) -> Iterator[Dict]:
+    """Time a block as one stage; the yielded dict can take extra attributes."""
+    start = time.perf_counter()
+    attrs.setdefault('status', 'ok')
+    try:
+        yield attrs
+    except Exception:
+        attrs['status'] = 'error'
+        raise
+    finally:
+        record(stage, (time.perf_counter() - start) * 1000, **attrs)
+
+
+class LogSink:
+    def __init__(self, level: int = logging.INFO):
+        self.level = level
+        self.logger = logging.getLogger(__name__)
+
+    def emit(self, span: Dict) -> None:
+        self.logger.log(self.level, f"[{span['request_id']}] {span['stage']} {span['ms']:.1f}ms")
+
+
+class JsonlSink:
+    """Appends one JSON line per span; each line is a single O_APPEND write."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('TALK2WINDOWS_TRACE_FILE', DEFAULT_TRACE_FILE)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def emit(self, span: Dict) -> None:
+        data = (json.dumps(span) + '\n').encode('utf-8')
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+class PrometheusSink:
+    """Aggregates spans into a per-stage histogram in Prometheus text format."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+        self.server: Any = None
+
+    def emit(self, span: Dict) -> None:
+        seconds = span['ms'] / 1000
+        with self._lock:
+            stage = self._stages.setdefault(
+                span['stage'], {'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0}
+            )
+            stage['count'] += 1
+            stage['sum'] += seconds
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stage['buckets'][i] += 1
+
+    def render(self) -> str:
+        name = 'talk2windows_stage_duration_seconds'
+        lines = [
+            f"# HELP {name} Time spent per transcript pipeline stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage, data in sorted(self._stages.items()):
+                for bound, count in zip(self.buckets, data['buckets']):
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {data["count"]}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {data["sum"]:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {data["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """Serve render() at /metrics from a daemon thread (port 0 picks a free port)."""
+        # Imported here so the per-command bridge process doesn't pay for http.server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') != '/metrics':
+                    self.send_error(404)
+                    return
+                body = sink.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, name='t2w-metrics', daemon=True).start()
+        return self.server
+
+
+def configure(sinks: List) -> None:
+    """Replace the active sinks."""
+    global _configured
+    _sinks[:] = list(sinks)
+    _configured = True
+
+
+def configure_from_env() -> List:
+    """Set up the sinks named in TALK2WINDOWS_TRACE_SINKS once per process."""
+    with _configure_lock:
+        if _configured:
+            return list(_sinks)
+        sinks = []
+        for name in filter(None, (n.strip() for n in os.getenv('TALK2WINDOWS_TRACE_SINKS', '').split(','))):
+            if name == 'log':
+                sinks.append(LogSink())
+            elif name == 'jsonl':
+                sinks.append(JsonlSink())
+            elif name == 'prometheus':
+                sink = PrometheusSink()
+                port = int(os.getenv('TALK2WINDOWS_METRICS_PORT', '0'))
+                if port:
+                    sink.serve(port)
+                    logger.info(f"Serving stage metrics on http://127.0.0.1:{port}/metrics")
+                sinks.append(sink)
+            else:
+                raise ValueError(f"Unknown trace sink: {name}")
+        configure(sinks)
+        return sinks
+
+
+def load_spans(path: str) -> List[Dict]:
+    spans = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return spans
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered), math.ceil(fraction * len(ordered))) - 1)]
+
+
+def summarize(spans: List[Dict]) -> Dict[str, Dict]:
+    by_stage: Dict[str, List[float]] = {}
+    for span in spans:
+        by_stage.setdefault(span['stage'], []).append(span['ms'])
+    return {
+        stage: {
+            'count': len(values),
+            'p50': percentile(values, 0.50),
+            'p95': percentile(values, 0.95),
+            'p99': percentile(values, 0.99),
+            'max': max(values),
+        }
+        for stage, values in by_stage.items()
+    }
+
+
+def format_summary(summary: Dict[str, Dict]) -> str:
+    lines = [f"{'stage':<18} {'count':>6} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}"]
+    for stage, stats in sorted(summary.items(), key=lambda item: -item[1]['p50']):
+        lines.append(
+            f"{stage:<18} {stats['count']:>6} {stats['p50']:>8.1f}ms {stats['p95']:>8.1f}ms "
+            f"{stats['p99']:>8.1f}ms {stats['max']:>8.1f}ms"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Summarize recorded pipeline spans")
+    parser.add_argument('file', nargs='?', default=os.getenv('TALK2WINDOWS_TRACE_FILE', DEFAULT_TRACE_FILE))
+    parser.add_argument('--request', help="print the spans of one request id instead")
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.file)
+    if args.request:
+        for span in spans:
+            if span.get('request_id') == args.request:
+                print(f"{span['ms']:>10.1f}ms  {span['stage']}")
+        return
+    if not spans:
+        print(f"No spans in {args.file}")
+        return
+    print(format_summary(summarize(spans)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,263 @@
-import subprocess
+"""
+TTS - Non-blocking speech output.
+
+say() used to run say.ps1 in a new powershell.exe and block until the
+sentence had been spoken, so the next command had to wait for the summary
+of the last one. Now:
+1. say() queues the text and returns; a background thread speaks it
+2. Utterances have a priority (HIGH for prompts, NORMAL for results, LOW),
+   and queued utterances of the same priority are merged into one
+3. interrupt() (barge-in) stops the current utterance and drops the queue
+4. A speaker backend does the talking: 'powershell' keeps one
+   speaker-host.ps1 process alive, 'null' just logs (Linux, tests and
+   TALK2WINDOWS_DISABLE_TTS=1). TALK2WINDOWS_TTS_BACKEND picks one.
+5. Each utterance is traced as a 'tts' span under the request that queued it
+"""
+import heapq
+import itertools
+import json
+import logging
 import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
 
-class TTS:
-    def say(self, text: str):
-        """Speak the given text using PowerShell TTS script."""
-        # Check if TTS is disabled (for Serenade integration)
-        if os.getenv('TALK2WINDOWS_DISABLE_TTS') == '1':
+from . import tracing
+
+HIGH, NORMAL, LOW = 0, 1, 2
+
+RESPONSE_PREFIX = 'T2W '
+
+# Merged utterances stop growing past this many characters
+MERGE_LIMIT = 400
+
+
+class NullSpeaker:
+    """Records utterances instead of speaking them; `delay` simulates speech time."""
+
+    def __init__(self, delay: float = 0.0, echo: bool = True):
+        self.delay = delay
+        self.echo = echo
+        self.spoken: List[str] = []
+        self._stop = threading.Event()
+
+    def speak(self, text: str) -> bool:
+        """Returns False if the utterance was interrupted."""
+        self._stop.clear()
+        self.spoken.append(text)
+        if self.echo:
             print(f"[TTS DISABLED] Would say: {text}")
+        return not self._stop.wait(self.delay) if self.delay else True
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def close(self) -> None:
+        self.stop()
+
+
+class PowerShellSpeaker:
+    """Speaks through one long-lived speaker-host.ps1 process, restarted if it dies."""
+
+    def __init__(self, host_command: Optional[List[str]] = None, start_timeout: float = 15.0):
+        if host_command is None:
+            host_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "speaker-host.ps1"))
+            host_command = ['powershell.exe', '-NoProfile', '-NonInteractive',
+                            '-ExecutionPolicy', 'Bypass', '-File', host_path]
+        self.host_command = host_command
+        self.start_timeout = start_timeout
+        self.logger = logging.getLogger(__name__)
+        self._process: Optional[subprocess.Popen] = None
+        self._responses: 'queue.Queue[Optional[dict]]' = queue.Queue()
+        self._write_lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            return
+        self._responses = queue.Queue()
+        self._process = subprocess.Popen(
+            self.host_command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            bufsize=1,
+        )
+        threading.Thread(target=self._read_loop, args=(self._process, self._responses), daemon=True).start()
+        ready = self._responses.get(timeout=self.start_timeout)
+        if not ready or not ready.get('ready'):
+            self._kill()
+            raise RuntimeError(f"Speaker host failed to start: {ready}")
+
+    @staticmethod
+    def _read_loop(process: subprocess.Popen, responses: 'queue.Queue') -> None:
+        for line in process.stdout:
+            if line.startswith(RESPONSE_PREFIX):
+                try:
+                    responses.put(json.loads(line[len(RESPONSE_PREFIX):]))
+                except json.JSONDecodeError:
+                    continue
+        responses.put(None)
+
+    def _send(self, request: Dict) -> None:
+        with self._write_lock:
+            self._process.stdin.write(json.dumps(request) + '\n')
+            self._process.stdin.flush()
+
+    def speak(self, text: str) -> bool:
+        """Speak and wait until done; returns False if interrupted or the host failed."""
+        try:
+            self._ensure_started()
+            request_id = next(self._ids)
+            self._send({'op': 'say', 'id': request_id, 'text': text})
+            while True:
+                # Long enough for any sane utterance; a hung host gets replaced
+                response = self._responses.get(timeout=30 + len(text) * 0.2)
+                if response is None:
+                    raise RuntimeError("speaker host exited")
+                if response.get('id') == request_id:
+                    return not response.get('interrupted')
+        except (OSError, RuntimeError, queue.Empty) as e:
+            self.logger.error(f"Speech failed: {e}")
+            self._kill()
+            return False
+
+    def stop(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            try:
+                self._send({'op': 'stop'})
+            except OSError:
+                pass
+
+    def _kill(self) -> None:
+        if self._process is not None:
+            try:
+                self._process.kill()
+            except OSError:
+                pass
+            self._process = None
+
+    def close(self) -> None:
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._kill()
+
+
+def default_speaker():
+    backend = os.getenv('TALK2WINDOWS_TTS_BACKEND')
+    if backend is None:
+        disabled = os.getenv('TALK2WINDOWS_DISABLE_TTS') == '1' or sys.platform != 'win32'
+        backend = 'null' if disabled else 'powershell'
+    if backend == 'powershell':
+        return PowerShellSpeaker()
+    if backend != 'null':
+        raise ValueError(f"Unknown TTS backend: {backend}")
+    return NullSpeaker()
+
+
+class TTS:
+    def __init__(self, speaker=None, merge_limit: int = MERGE_LIMIT):
+        self.speaker = speaker or default_speaker()
+        self.merge_limit = merge_limit
+        self.logger = logging.getLogger(__name__)
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._speaking = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'queued': 0, 'spoken': 0, 'merged': 0, 'interrupted': 0, 'dropped': 0}
+
+    def say(self, text: str, priority: int = NORMAL, interrupt: bool = False) -> None:
+        """Queue text to be spoken and return immediately."""
+        text = str(text).strip()
+        if not text:
             return
-            
-        script_path = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "say.ps1")
-        # Escape double quotes for PowerShell
-        escaped_text = text.replace('"', '`"')
-        command = f'powershell.exe -File "{script_path}" -Text "{escaped_text}"'
-        subprocess.run(command, shell=True)
\ No newline at end of file
+        if interrupt:
+            self.interrupt()
+        with self._cond:
+            if self._closed:
+                return
+            heapq.heappush(
+                self._queue, (priority, next(self._seq), text, tracing.current_request_id())
+            )
+            self._stats['queued'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='t2w-tts', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def interrupt(self) -> None:
+        """Barge-in: stop the current utterance and drop everything queued."""
+        with self._cond:
+            self._stats['dropped'] += len(self._queue)
+            self._queue.clear()
+            speaking = self._speaking
+        if speaking:
+            self.speaker.stop()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the queue is empty and nothing is being spoken."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._speaking, timeout)
+
+    def _next_utterance(self) -> Optional[tuple]:
+        """Pop the most urgent utterance, merged with queued ones of the same priority.
+        Returns (text, request id of the first one), or None once closed."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._queue or self._closed)
+            if self._closed:
+                return None
+            priority, _, text, request_id = heapq.heappop(self._queue)
+            while self._queue and self._queue[0][0] == priority \
+                    and len(text) + len(self._queue[0][2]) < self.merge_limit:
+                nxt = heapq.heappop(self._queue)[2]
+                text = f"{text} {nxt}" if text[-1] in '.!?' else f"{text}. {nxt}"
+                self._stats['merged'] += 1
+            self._speaking = True
+            return text, request_id
+
+    def _run(self) -> None:
+        while True:
+            utterance = self._next_utterance()
+            if utterance is None:
+                return
+            text, request_id = utterance
+            start = time.perf_counter()
+            try:
+                completed = self.speaker.speak(text)
+            except Exception as e:
+                self.logger.error(f"Speech failed: {e}")
+                completed = False
+            tracing.record(
+                'tts', (time.perf_counter() - start) * 1000,
+                request_id=request_id, status='ok' if completed else 'interrupted',
+            )
+            with self._cond:
+                self._speaking = False
+                self._stats['spoken' if completed else 'interrupted'] += 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return dict(self._stats, pending=len(self._queue))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Let queued speech finish (up to timeout), then stop the speaker."""
+        self.wait(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.speaker.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self.speaker.close()
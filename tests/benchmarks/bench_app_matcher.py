@@ -0,0 +1,56 @@
+"""
+Benchmark app name resolution against the Start-menu inventory.
+
+Resolves spoken app names (exact, spoken symbols, word runs, prefixes,
+misspellings, unknown names) against tmp/startapps.csv, or the CSV given with
+--inventory, and reports p50/p99 per lookup plus the time to index the CSV.
+
+Usage:
+    python -m tests.benchmarks.bench_app_matcher
+    python -m tests.benchmarks.bench_app_matcher --inventory path/to/startapps.csv --iterations 5000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.app_matcher import AppMatcher
+from tests.benchmarks.bench_semantic_search import percentile
+
+SPOKEN = [
+    "blackbox dot ai", "calculator", "calc", "calculater", "chrome", "note pad",
+    "microsoft edge", "edge", "visual studio code", "task manager", "grock",
+    "python", "power shell", "spotify", "xyz",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app name resolution")
+    parser.add_argument('--inventory', default=None)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    start = time.perf_counter()
+    matcher = AppMatcher(args.inventory)
+    print(f"indexed {len(matcher)} apps in {(time.perf_counter() - start) * 1000:.1f}ms")
+    if not matcher.available:
+        print(f"no inventory at {matcher.inventory}")
+        return
+
+    print(f"{'spoken':>20} {'resolved':>24} {'p50':>9} {'p99':>9}")
+    for spoken in SPOKEN:
+        samples = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            resolved = matcher.resolve(spoken)
+            samples.append((time.perf_counter() - start) * 1000.0)
+        name = resolved['name'] if resolved else '-'
+        print(f"{spoken:>20} {name[:24]:>24} {percentile(samples, 50):>7.3f}ms {percentile(samples, 99):>7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark cold start to first command for the in-process bridge path.
+
+Each run is a fresh interpreter, the way Serenade starts serenade_bridge.py
+per voice command, with the daemon disabled so AgentService is built in the
+process. The command defaults to one the fast path routes locally, so the
+run should never import google.generativeai or yaml; either being imported
+counts as a regression, as does a median above --max-ms.
+
+On machines without powershell.exe the routed script fails to start, which
+happens after everything this benchmark measures.
+
+Usage:
+    python -m tests.benchmarks.bench_cold_start
+    python -m tests.benchmarks.bench_cold_start --runs 10 --max-ms 400
+    python -m tests.benchmarks.bench_cold_start --command "open calculator"
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT)
+
+HEAVY_MODULES = ('google.generativeai', 'yaml', 'websockets')
+
+_PROBE = """
+import asyncio, json, logging, sys, time
+start = time.perf_counter()
+logging.disable(logging.CRITICAL)
+from src.agent.integration.serenade_bridge import process_voice_command
+from src.agent.utils import startup_profile
+imported = time.perf_counter()
+asyncio.run(process_voice_command(sys.argv[1]))
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'command_ms': (done - imported) * 1000,
+    'phases': startup_profile.phases(),
+    'heavy_imports': [name for name in sys.argv[2:] if name in sys.modules],
+}))
+"""
+
+
+def measure(command, runs):
+    env = dict(
+        os.environ,
+        TALK2WINDOWS_DAEMON='0',
+        TALK2WINDOWS_DISABLE_TTS='1',
+        TALK2WINDOWS_TTS_BACKEND='null',
+        TALK2WINDOWS_CONFIRM_POLICY='auto',
+    )
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE, command, *HEAVY_MODULES],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        sample['wall_ms'] = (time.perf_counter() - start) * 1000
+        samples.append(sample)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start to first command")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--command', default='what is the time')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help="fail if the median wall time exceeds this")
+    args = parser.parse_args()
+
+    samples = measure(args.command, args.runs)
+    for key in ('wall_ms', 'import_ms', 'command_ms'):
+        print(f"{key:>12}: {statistics.median(s[key] for s in samples):8.1f}ms (median of {args.runs})")
+
+    # Per-phase medians, in the order the last run recorded them
+    print("phases (median):")
+    for i, entry in enumerate(samples[-1]['phases']):
+        values = [s['phases'][i]['ms'] or 0.0 for s in samples if len(s['phases']) > i]
+        print(f"  {statistics.median(values):8.1f}ms  {'  ' * entry['depth']}{entry['name']}")
+
+    failures = []
+    heavy = sorted({name for s in samples for name in s['heavy_imports']})
+    if heavy:
+        failures.append(f"heavy modules imported: {', '.join(heavy)}")
+    wall = statistics.median(s['wall_ms'] for s in samples)
+    if args.max_ms is not None and wall > args.max_ms:
+        failures.append(f"median wall time {wall:.1f}ms exceeds {args.max_ms:.1f}ms")
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark cold catalog and semantic index builds, serial vs. process pool.
+
+Checks that every parallel build writes output byte-identical to the serial
+build and prints per-phase timings for each run.
+
+Usage:
+    python -m tests.benchmarks.bench_index_build
+    python -m tests.benchmarks.bench_index_build --workers 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.parallel_build import resolve_workers
+from src.agent.core.semantic_index import SemanticIndex
+from src.agent.core.tool_catalog_manager import ToolCatalogManager
+
+
+def _format(timings):
+    return "  ".join(f"{name}={seconds * 1000:8.1f}ms" for name, seconds in timings.items())
+
+
+def build_catalog(scripts_dir, out_dir, workers):
+    """Build tools.json into out_dir and return (bytes, timings)."""
+    catalog_path = os.path.join(out_dir, 'tools.json')
+    manager = ToolCatalogManager(scripts_dir=scripts_dir, catalog_path=catalog_path)
+    manager.generate_catalog(workers=workers)
+    with open(catalog_path, 'rb') as f:
+        return f.read(), manager.last_build_timings
+
+
+def build_index(scripts_dir, out_dir, workers):
+    """Build semantic_index.json into out_dir and return (bytes, timings)."""
+    index_file = os.path.join(out_dir, 'semantic_index.json')
+    if os.path.exists(index_file):
+        os.remove(index_file)
+    index = SemanticIndex(scripts_dir=scripts_dir, index_file=index_file, workers=workers)
+    with open(index_file, 'rb') as f:
+        return f.read(), index.last_build_timings
+
+
+def main():
+    default_scripts = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts')
+    parser = argparse.ArgumentParser(description="Benchmark cold catalog/index builds")
+    parser.add_argument('--scripts-dir', default=default_scripts)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 0])
+    args = parser.parse_args()
+    # Unreadable scripts are reported on every build; keep the table readable
+    logging.disable(logging.ERROR)
+
+    for name, build in (('catalog', build_catalog), ('semantic index', build_index)):
+        with tempfile.TemporaryDirectory() as out_dir:
+            serial, timings = build(args.scripts_dir, out_dir, 1)
+            print(f"{name:>14} workers=1  {_format(timings)}")
+            for workers in args.workers:
+                output, timings = build(args.scripts_dir, out_dir, workers)
+                identical = "identical" if output == serial else "DIFFERENT"
+                print(f"{name:>14} workers={resolve_workers(workers):<2} {_format(timings)}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark startup-to-first-query time and resident memory per index format.
+
+Each format is measured in a fresh interpreter, the way serenade_bridge.py runs
+a new process per voice command. The index is built once per format beforehand;
+module import time is reported separately from load + first query (Linux only,
+resident memory is read from /proc/self/statm).
+
+Usage:
+    python -m tests.benchmarks.bench_index_load
+    python -m tests.benchmarks.bench_index_load --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT)
+
+_PROBE = """
+import json, os, sys, time
+
+def rss_kb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+
+import_start = time.perf_counter()
+from src.agent.core.semantic_index import SemanticIndex
+start = time.perf_counter()
+rss_before = rss_kb()
+index = SemanticIndex(index_file=sys.argv[1], index_format=sys.argv[2])
+index.search('open calculator', max_results=5)
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'import_ms': (start - import_start) * 1000,
+    'ms': elapsed * 1000,
+    'rss_kb': rss_kb() - rss_before,
+}))
+"""
+
+
+def measure(index_file, index_format, runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE, index_file, index_format],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark semantic index load time and memory")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    from src.agent.core.semantic_index import SemanticIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = os.path.join(tmp, 'semantic_index.json')
+        print(f"{'format':>8} {'size_kb':>8} {'imports':>10} {'load+query':>11} {'rss delta':>10}")
+        for index_format in ('json', 'binary'):
+            index = SemanticIndex(index_file=index_file, index_format=index_format, incremental=False)
+            index.rebuild_index()
+            path = index_file if index_format == 'json' else index.binary_file
+            result = measure(index_file, index_format, args.runs)
+            print(
+                f"{index_format:>8} {os.path.getsize(path) // 1024:>8} {result['import_ms']:>8.1f}ms "
+                f"{result['ms']:>9.1f}ms {result['rss_kb'] / 1024:>8.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark retrieval quality and latency of the semantic index retrievers.
+
+Recall@5 is measured on the phrases of tests/natural_language/test_natural_language.py
+(the expected tool must be among the five scripts offered to Gemini), against
+the real scripts/ tree. Latency is per query, plus the per-query cost when the
+vector retriever scores all phrases in one batch.
+
+Usage:
+    python -m tests.benchmarks.bench_retrieval
+    python -m tests.benchmarks.bench_retrieval --iterations 500 --show-misses
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.semantic_index import RETRIEVERS, SemanticIndex
+from tests.benchmarks.bench_semantic_search import percentile
+
+# Same phrases and expected tools as tests/natural_language/test_natural_language.py
+NL_CASES = [
+    ("tell me time", "what-is-the-time"),
+    ("what time is it", "what-is-the-time"),
+    ("Windows tell me the time", "what-is-the-time"),
+    ("calculator open", "open-calculator"),
+    ("open calculator", "open-calculator"),
+    ("launch calc", "open-calculator"),
+    ("open the calculator", "open-calculator"),
+    ("check weather", "check-weather"),
+    ("what's the weather", "check-weather"),
+    ("how's the weather", "check-weather"),
+]
+
+
+def recall_at(index: SemanticIndex, k: int, show_misses: bool = False) -> float:
+    hits = 0
+    for query, expected in NL_CASES:
+        found = [result['id'] for result in index.search(query, max_results=k)]
+        if expected in found:
+            hits += 1
+        elif show_misses:
+            print(f"    miss: '{query}' -> {found} (expected {expected})")
+    return hits / len(NL_CASES)
+
+
+def latency(index: SemanticIndex, iterations: int):
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        index.search(NL_CASES[i % len(NL_CASES)][0], max_results=5)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return percentile(samples, 50), percentile(samples, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark semantic index retrievers")
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--show-misses', action='store_true')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A private index file, so the benchmark doesn't touch src/agent/config
+        index_file = os.path.join(tmp, 'semantic_index.json')
+        start = time.perf_counter()
+        SemanticIndex(index_file=index_file)
+        print(f"index build: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        print(f"{'retriever':>10} {'recall@5':>9} {'p50':>9} {'p99':>9}")
+        for retriever in RETRIEVERS:
+            index = SemanticIndex(index_file=index_file, retriever=retriever)
+            if retriever != 'keyword':
+                start = time.perf_counter()
+                vectors = index.vectors
+                print(f"{'':>10} vector index ready in {(time.perf_counter() - start) * 1000:.1f}ms "
+                      f"({len(vectors.features)} features)")
+            recall = recall_at(index, 5, args.show_misses)
+            p50, p99 = latency(index, args.iterations)
+            print(f"{retriever:>10} {recall:>9.2f} {p50:>7.3f}ms {p99:>7.3f}ms")
+
+        vectors = SemanticIndex(index_file=index_file, retriever='vector').vectors
+        queries = [query for query, _ in NL_CASES]
+        start = time.perf_counter()
+        rounds = max(1, args.iterations // len(queries))
+        for _ in range(rounds):
+            vectors.search_batch(queries, max_results=5)
+        per_query = (time.perf_counter() - start) * 1000.0 / (rounds * len(queries))
+        print(f"vector batch of {len(queries)}: {per_query:.3f}ms per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark SemanticIndex search latency on synthetic catalogs.
+
+Usage:
+    python -m tests.benchmarks.bench_semantic_search
+    python -m tests.benchmarks.bench_semantic_search --sizes 800 10000 --iterations 500
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.search_engine import InvertedIndex
+from tests.benchmarks.synthetic import QUERIES_LONG, QUERIES_SHORT, synthetic_scripts
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def bench_search(engine: InvertedIndex, queries: List[str], iterations: int) -> Dict[str, float]:
+    """Time engine.search over the queries and return latency percentiles in ms."""
+    samples = []
+    for i in range(iterations):
+        query = queries[i % len(queries)]
+        start = time.perf_counter()
+        engine.search(query, max_results=5)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        'p50_ms': percentile(samples, 50),
+        'p99_ms': percentile(samples, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark semantic index search latency")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[800, 10_000, 100_000])
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'scripts':>8} {'build_s':>8} {'short p50':>10} {'short p99':>10} {'long p50':>10} {'long p99':>10}")
+    for size in args.sizes:
+        scripts = synthetic_scripts(size)
+        start = time.perf_counter()
+        engine = InvertedIndex.from_scripts(scripts)
+        build_s = time.perf_counter() - start
+        short = bench_search(engine, QUERIES_SHORT, args.iterations)
+        long = bench_search(engine, QUERIES_LONG, args.iterations)
+        print(
+            f"{size:>8} {build_s:>8.2f} {short['p50_ms']:>8.3f}ms {short['p99_ms']:>8.3f}ms "
+            f"{long['p50_ms']:>8.3f}ms {long['p99_ms']:>8.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
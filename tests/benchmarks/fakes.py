@@ -0,0 +1,112 @@
+"""
+Deterministic stand-ins for Gemini and the PowerShell executor.
+
+Plugged into AgentService(model_factory=..., executor=...) so the full
+transcript pipeline (result cache, semantic search, fast path, model cache,
+confirmation, memory, speech) runs on Linux without an API key or PowerShell:
+1. FakeModel answers every transcript with one function call: the expected
+   tool from the corpus when the model was given it, otherwise its first
+   (best matching) tool; latency, jitter and an error rate are configurable
+2. FakeExecutor "runs" a script after a configurable delay and can fail a
+   share of the calls
+Random draws use a seeded generator, so two runs with the same settings
+sleep and fail identically.
+"""
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeModelError(RuntimeError):
+    """Injected model failure (stands in for quota errors and timeouts)."""
+
+
+def _jittered(rng: random.Random, lock: threading.Lock, latency: float, jitter: float) -> float:
+    with lock:
+        offset = rng.uniform(-jitter, jitter) if jitter else 0.0
+    return max(0.0, latency + offset)
+
+
+def function_call_response(name: str, args: Optional[Dict] = None):
+    """A response shaped like google.generativeai's, holding one function call."""
+    part = SimpleNamespace(function_call=SimpleNamespace(name=name, args=dict(args or {})))
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))], text=None)
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel with a fixed tool list."""
+
+    def __init__(self, tools: List[Dict], answers: Dict[str, str], latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, rng: Optional[random.Random] = None,
+                 lock: Optional[threading.Lock] = None):
+        self.tools = [tool['name'] for tool in tools]
+        self.answers = answers
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = rng or random.Random(0)
+        self.lock = lock or threading.Lock()
+        self.calls = 0
+
+    def _tool_for(self, transcript: str) -> str:
+        expected = self.answers.get(transcript.lower())
+        if expected and expected in self.tools:
+            return expected
+        return self.tools[0] if self.tools else 'say'
+
+    def generate_content(self, transcript: str, tool_config=None):
+        self.calls += 1
+        time.sleep(_jittered(self.rng, self.lock, self.latency, self.jitter))
+        with self.lock:
+            failed = self.error_rate and self.rng.random() < self.error_rate
+        if failed:
+            raise FakeModelError(f"injected model failure for '{transcript}'")
+        return function_call_response(self._tool_for(transcript))
+
+
+class FakeModelFactory:
+    """model_factory for AgentService: builds FakeModels sharing one seeded generator."""
+
+    def __init__(self, answers: Optional[Dict[str, str]] = None, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.answers = {transcript.lower(): tool for transcript, tool in (answers or {}).items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.models: List[FakeModel] = []
+
+    def __call__(self, tools: List[Dict]) -> FakeModel:
+        model = FakeModel(tools, self.answers, self.latency, self.jitter, self.error_rate, self.rng, self.lock)
+        self.models.append(model)
+        return model
+
+    def stats(self) -> Dict[str, int]:
+        return {'models': len(self.models), 'calls': sum(model.calls for model in self.models)}
+
+
+class FakeExecutor:
+    """Stands in for PowerShellExecutor: run() sleeps and reports success or failure."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls: List[Tuple[str, Dict]] = []
+
+    def run(self, script_id: str, args: Optional[Dict] = None) -> Tuple[int, str, str]:
+        time.sleep(_jittered(self.rng, self.lock, self.latency, self.jitter))
+        with self.lock:
+            self.calls.append((script_id, dict(args or {})))
+            failed = self.failure_rate and self.rng.random() < self.failure_rate
+        if failed:
+            return 1, '', f"injected failure in {script_id}"
+        return 0, f"ran {script_id}", ''
+
+    def close(self) -> None:
+        pass
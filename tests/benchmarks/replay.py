@@ -0,0 +1,242 @@
+"""
+Replay transcripts through AgentService.handle_transcript under load.
+
+Gemini and PowerShell are replaced by the stand-ins in fakes.py, so the rest
+of the pipeline (result cache, semantic search, fast path, model cache,
+confirmation, memory, speech queue) runs as in production, on Linux:
+1. The corpus defaults to the tests/natural_language phrases; --corpus takes a
+   recorded file instead: service logs ("... Transcript: open calculator"),
+   JSON lines ({"transcript": ..., "tool": ...}) or one transcript per line
+2. Transcripts are replayed round-robin at --rate per second (0 = as fast as
+   possible) with at most --concurrency in flight
+3. Stage spans are collected through utils.tracing and reported as p50/p95/p99
+   per stage, next to throughput, client latency and outcome rates
+Memory, the result cache and speech use throwaway stores, so a replay never
+touches the agent's own files.
+
+Usage:
+    python -m tests.benchmarks.replay
+    python -m tests.benchmarks.replay --requests 500 --rate 50 --concurrency 8 --model-latency 400
+    python -m tests.benchmarks.replay --corpus agent.log --result-cache --json replay.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.utils import tracing
+from tests.benchmarks.bench_retrieval import NL_CASES
+from tests.benchmarks.fakes import FakeExecutor, FakeModelFactory
+
+_LOGGED_TRANSCRIPT_RE = re.compile(r"Transcript: (.+?)\s*$")
+_EXECUTED_RE = re.compile(r"^Executed ([\w.-]+):")
+
+OUTCOMES = ('ok', 'failed', 'skipped', 'error')
+
+
+class CollectingSink:
+    """Trace sink that keeps every span in memory."""
+
+    def __init__(self):
+        self.spans: List[Dict] = []
+
+    def emit(self, span: Dict) -> None:
+        self.spans.append(span)
+
+
+def load_corpus(path: str) -> List[Tuple[str, Optional[str]]]:
+    """(transcript, expected tool or None) pairs from a recorded corpus file."""
+    cases = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('transcript'):
+                    cases.append((record['transcript'], record.get('tool')))
+                continue
+            logged = _LOGGED_TRANSCRIPT_RE.search(line)
+            if logged:
+                cases.append((logged.group(1), None))
+            elif ' - ' not in line:
+                # Other log lines aren't transcripts
+                cases.append((line, None))
+    return cases
+
+
+def outcome_of(result) -> str:
+    if result is None:
+        return 'error'
+    text = str(result)
+    if text.startswith('Skipped'):
+        return 'skipped'
+    if text.startswith('Failed') or 'Failed ' in text:
+        return 'failed'
+    return 'ok'
+
+
+def build_service(args, answers: Dict[str, str], scratch: str):
+    """AgentService with fake model and executor, and throwaway memory, cache and speech."""
+    from src.agent.core.result_cache import ResultCache
+    from src.agent.core.service import AgentService
+    from src.agent.memory.store import MemoryStore
+    from src.agent.utils.tts import TTS, NullSpeaker
+
+    models = FakeModelFactory(answers, args.model_latency / 1000.0, args.model_jitter / 1000.0,
+                              args.model_error_rate, seed=args.seed)
+    executor = FakeExecutor(args.exec_latency / 1000.0, args.exec_jitter / 1000.0,
+                            args.exec_failure_rate, seed=args.seed)
+    service = AgentService(prompt_provider=lambda _: 'yes', model_factory=models, executor=executor)
+    service.tts.close()
+    service.tts = TTS(speaker=NullSpeaker(echo=False))
+    close_memory = getattr(service.memory, 'close', None)
+    if close_memory:
+        close_memory()
+    service.memory = MemoryStore(memory_dir=os.path.join(scratch, 'memory'))
+    service.confirm_policy = 'auto'
+    service.result_cache = None
+    if args.result_cache:
+        service.result_cache = ResultCache(path=os.path.join(scratch, 'result_cache.json'))
+    return service, models, executor
+
+
+async def replay(service, cases: List[Tuple[str, Optional[str]]], requests: int,
+                 rate: float, concurrency: int) -> List[Dict]:
+    """Send requests transcripts (cycling through cases); returns one record per request."""
+    slots = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    records: List[Dict] = []
+
+    async def send(i: int, transcript: str, expected: Optional[str]) -> None:
+        queued = time.perf_counter()
+        async with slots:
+            started = time.perf_counter()
+            result = await service.handle_transcript(transcript, request_id=f"replay-{i:06d}")
+        done = time.perf_counter()
+        executed = _EXECUTED_RE.match(str(result or ''))
+        records.append({
+            'transcript': transcript,
+            'outcome': outcome_of(result),
+            'ms': (done - queued) * 1000.0,
+            'wait_ms': (started - queued) * 1000.0,
+            'correct': None if expected is None else bool(executed and executed.group(1) == expected),
+        })
+
+    tasks = []
+    start = loop.time()
+    for i in range(requests):
+        if rate > 0:
+            delay = start + i / rate - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        transcript, expected = cases[i % len(cases)]
+        tasks.append(asyncio.create_task(send(i, transcript, expected)))
+    await asyncio.gather(*tasks)
+    return records
+
+
+def report(records: List[Dict], spans: List[Dict], elapsed: float) -> Dict:
+    latencies = [r['ms'] for r in records]
+    outcomes = {outcome: sum(1 for r in records if r['outcome'] == outcome) for outcome in OUTCOMES}
+    judged = [r['correct'] for r in records if r['correct'] is not None]
+    fast_path = [s for s in spans if s['stage'] == 'fast_path']
+    return {
+        'requests': len(records),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(records) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(tracing.percentile(latencies, 0.50), 3),
+            'p95': round(tracing.percentile(latencies, 0.95), 3),
+            'p99': round(tracing.percentile(latencies, 0.99), 3),
+            'max': round(max(latencies), 3),
+        } if latencies else {},
+        'outcomes': outcomes,
+        'error_rate': round((outcomes['error'] + outcomes['failed']) / len(records), 4) if records else 0.0,
+        'accuracy': round(sum(judged) / len(judged), 4) if judged else None,
+        'fast_path_rate': round(sum(1 for s in fast_path if s.get('hit')) / len(fast_path), 4) if fast_path else None,
+        'stages': tracing.summarize(spans),
+    }
+
+
+def format_report(result: Dict) -> str:
+    latency = result['latency_ms']
+    lines = [
+        f"{result['requests']} requests in {result['elapsed_s']:.2f}s: {result['throughput_rps']:.1f} req/s",
+        f"latency p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms  "
+        f"p99 {latency['p99']:.1f}ms  max {latency['max']:.1f}ms",
+        "outcomes " + "  ".join(f"{k} {v}" for k, v in result['outcomes'].items())
+        + f"  (error rate {result['error_rate']:.2%})",
+    ]
+    if result['accuracy'] is not None:
+        lines.append(f"expected tool executed: {result['accuracy']:.2%}")
+    if result['fast_path_rate'] is not None:
+        lines.append(f"fast path: {result['fast_path_rate']:.2%} of requests skipped the model")
+    lines.append("")
+    lines.append(tracing.format_summary(result['stages']))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Replay transcripts through AgentService with fake backends")
+    parser.add_argument('--corpus', help="recorded transcripts (service log, JSON lines or plain text)")
+    parser.add_argument('--requests', type=int, default=0, help="total requests (default: 10 rounds of the corpus)")
+    parser.add_argument('--rate', type=float, default=0.0, help="requests per second (0 = unthrottled)")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--model-latency', type=float, default=300.0, help="fake model latency in ms")
+    parser.add_argument('--model-jitter', type=float, default=50.0)
+    parser.add_argument('--model-error-rate', type=float, default=0.0)
+    parser.add_argument('--exec-latency', type=float, default=150.0, help="fake script run time in ms")
+    parser.add_argument('--exec-jitter', type=float, default=30.0)
+    parser.add_argument('--exec-failure-rate', type=float, default=0.0)
+    parser.add_argument('--result-cache', action='store_true', help="replay with a (fresh) result cache")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="also write the report to this file")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+    else:
+        # Injected model failures are logged as errors by the service
+        logging.disable(logging.CRITICAL)
+
+    cases = load_corpus(args.corpus) if args.corpus else list(NL_CASES)
+    if not cases:
+        parser.error(f"no transcripts in {args.corpus}")
+    answers = {transcript: tool for transcript, tool in cases if tool}
+    requests = args.requests or 10 * len(cases)
+
+    sink = CollectingSink()
+    tracing.configure([sink])
+    with tempfile.TemporaryDirectory() as scratch:
+        service, models, executor = build_service(args, answers, scratch)
+        try:
+            start = time.perf_counter()
+            records = asyncio.run(replay(service, cases, requests, args.rate, args.concurrency))
+            elapsed = time.perf_counter() - start
+        finally:
+            service.close()
+    result = report(records, sink.spans, elapsed)
+    result['model'] = models.stats()
+    result['executor_calls'] = len(executor.calls)
+    print(format_report(result))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
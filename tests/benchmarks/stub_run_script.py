@@ -0,0 +1,27 @@
+"""
+Stand-in for `powershell.exe -NoProfile -File run-script.ps1 ...`: takes the
+same arguments and prints run-script.ps1's JSON result line, so
+PowerShellExecutor's spawn / pipe / decode round trip can be measured without
+PowerShell.
+"""
+import json
+import sys
+import time
+
+
+def main():
+    start = time.perf_counter()
+    argv = sys.argv[1:]
+    options = {argv[i]: argv[i + 1] for i in range(len(argv) - 1) if argv[i].startswith('-')}
+    script = options.get('-ScriptID', '')
+    args = json.loads(options.get('-ParamsJson') or '{}')
+    print(json.dumps({
+        'exit_code': 0,
+        'stdout': json.dumps({'script': script, 'args': args}),
+        'stderr': '',
+        'duration_ms': (time.perf_counter() - start) * 1000,
+    }))
+
+
+if __name__ == '__main__':
+    main()
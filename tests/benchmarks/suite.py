@@ -0,0 +1,265 @@
+"""
+Microbenchmark suite for the hot paths, with stored JSON baselines.
+
+Every metric is a median in milliseconds (lower is better), measured on
+synthetic script trees (synthetic.py) of each --sizes:
+1. search.short/long.N - SemanticIndex.search p50 over short and long queries
+2. index_build.cold.N - semantic index built from the tree;
+   index_build.warm.N - an up-to-date index reopened
+3. catalog.cold.N - generate_catalog scanning and parsing every script;
+   catalog.warm.N - generate_catalog from an existing scan (the shared-scan path)
+4. focused_tools.N - AgentService._build_focused_tool_list for five matches
+5. memory.save - MemoryStore.save of a small settings dict
+6. executor.process / executor.pool - PowerShellExecutor.run round trip
+   against a stub run-script.ps1 process and a stub pool host
+--save writes the metrics as a baseline; --compare checks them against one
+and exits with status 1 when a metric is slower than the baseline by more
+than --threshold (a fraction; the baseline's "thresholds" map may override
+it per metric) and by more than --min-delta-ms. Baselines only mean something
+on the machine that recorded them.
+
+Usage:
+    python -m tests.benchmarks.suite
+    python -m tests.benchmarks.suite --sizes 1000 10000 100000 --save baseline.json
+    python -m tests.benchmarks.suite --compare baseline.json --threshold 0.2
+    python -m tests.benchmarks.suite --only search memory --compare baseline.json
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT)
+
+from tests.benchmarks.synthetic import QUERIES_LONG, QUERIES_SHORT, write_synthetic_tree
+
+BASELINE_VERSION = 1
+GROUPS = ('search', 'index_build', 'catalog', 'focused_tools', 'memory', 'executor')
+
+STUB_RUN_SCRIPT = [sys.executable, os.path.join(ROOT, 'tests', 'benchmarks', 'stub_run_script.py')]
+STUB_POOL_HOST = [sys.executable, os.path.join(ROOT, 'tests', 'unit', 'stub_ps_host.py')]
+
+
+def median_ms(func: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> float:
+    """Median wall time of func over repeat runs; setup runs untimed before each."""
+    samples = []
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def _query_p50(index, queries: List[str], iterations: int) -> float:
+    samples = []
+    for i in range(iterations):
+        query = queries[i % len(queries)]
+        start = time.perf_counter()
+        index.search(query, max_results=5)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def bench_size(size: int, args, groups: List[str], scratch: str) -> Dict[str, float]:
+    """Metrics that depend on the catalog size, on one synthetic tree."""
+    from src.agent.core.script_scanner import ScriptScanner
+    from src.agent.core.semantic_index import SemanticIndex
+    from src.agent.core.service import AgentService
+    from src.agent.core.tool_catalog_manager import ToolCatalogManager
+
+    metrics: Dict[str, float] = {}
+    scripts_dir = os.path.join(scratch, f"scripts-{size}")
+    write_synthetic_tree(scripts_dir, size)
+    index_file = os.path.join(scratch, f"index-{size}", 'semantic_index.json')
+    os.makedirs(os.path.dirname(index_file))
+
+    def clear_index():
+        for name in os.listdir(os.path.dirname(index_file)):
+            os.remove(os.path.join(os.path.dirname(index_file), name))
+
+    if 'index_build' in groups:
+        metrics[f'index_build.cold.{size}'] = median_ms(
+            lambda: SemanticIndex(scripts_dir=scripts_dir, index_file=index_file),
+            args.repeat, setup=clear_index,
+        )
+    if not os.path.exists(os.path.splitext(index_file)[0] + '.bin'):
+        SemanticIndex(scripts_dir=scripts_dir, index_file=index_file)
+    if 'index_build' in groups:
+        metrics[f'index_build.warm.{size}'] = median_ms(
+            lambda: SemanticIndex(scripts_dir=scripts_dir, index_file=index_file), args.repeat,
+        )
+
+    if 'search' in groups:
+        index = SemanticIndex(scripts_dir=scripts_dir, index_file=index_file)
+        index.warm_up()
+        metrics[f'search.short.{size}'] = _query_p50(index, QUERIES_SHORT, args.iterations)
+        metrics[f'search.long.{size}'] = _query_p50(index, QUERIES_LONG, args.iterations)
+
+    manager = ToolCatalogManager(scripts_dir=scripts_dir, catalog_path=os.path.join(scratch, f"tools-{size}.json"))
+    if 'catalog' in groups:
+        metrics[f'catalog.cold.{size}'] = median_ms(manager.generate_catalog, args.repeat)
+        scanner = ScriptScanner(scripts_dir)
+        records = scanner.scan(list(scanner.iter_files()))
+        metrics[f'catalog.warm.{size}'] = median_ms(lambda: manager.generate_catalog(records=records), args.repeat)
+
+    if 'focused_tools' in groups:
+        if not os.path.exists(manager.catalog_path):
+            manager.generate_catalog()
+        service = SimpleNamespace(tools=manager.load_tools())
+        matches = SemanticIndex(scripts_dir=scripts_dir, index_file=index_file).search(QUERIES_LONG[1], 5)
+        metrics[f'focused_tools.{size}'] = median_ms(
+            lambda: AgentService._build_focused_tool_list(service, matches), args.iterations,
+        )
+    shutil.rmtree(scripts_dir, ignore_errors=True)
+    return metrics
+
+
+def bench_fixed(args, groups: List[str], scratch: str) -> Dict[str, float]:
+    """Metrics that don't depend on the catalog size."""
+    metrics: Dict[str, float] = {}
+    if 'memory' in groups:
+        from src.agent.memory.store import MemoryStore
+        store = MemoryStore(memory_dir=os.path.join(scratch, 'memory'))
+        settings = {'voice': 'default', 'volume': 40, 'recent': [f"command {i}" for i in range(20)]}
+        metrics['memory.save'] = median_ms(lambda: store.save('settings', settings), args.iterations)
+
+    if 'executor' in groups:
+        from src.agent.execution.powershell_executor import PowerShellExecutor
+        from src.agent.execution.powershell_pool import PooledPowerShellExecutor
+        executor = PowerShellExecutor(powershell_command=STUB_RUN_SCRIPT)
+        runs = max(3, args.iterations // 20)  # Each one spawns an interpreter
+        metrics['executor.process'] = median_ms(lambda: executor.run('open-calculator', {}), runs)
+        pool = PooledPowerShellExecutor(size=1, host_command=STUB_POOL_HOST)
+        try:
+            pool.run('open-calculator', {})
+            metrics['executor.pool'] = median_ms(lambda: pool.run('open-calculator', {}), args.iterations)
+        finally:
+            pool.close()
+    return metrics
+
+
+def run_suite(sizes: List[int], iterations: int = 200, repeat: int = 3,
+              groups: Optional[List[str]] = None) -> Dict[str, float]:
+    """Run the selected benchmark groups and return {metric: ms}."""
+    groups = list(groups or GROUPS)
+    args = SimpleNamespace(iterations=iterations, repeat=repeat)
+    metrics: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        if any(group in groups for group in ('search', 'index_build', 'catalog', 'focused_tools')):
+            for size in sizes:
+                metrics.update(bench_size(size, args, groups, scratch))
+        metrics.update(bench_fixed(args, groups, scratch))
+    return {name: round(ms, 4) for name, ms in metrics.items()}
+
+
+def machine() -> Dict[str, str]:
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'machine': platform.machine()}
+
+
+def save_baseline(path: str, metrics: Dict[str, float], thresholds: Optional[Dict[str, float]] = None) -> None:
+    """Write metrics as a baseline, keeping per-metric thresholds from an existing file."""
+    if thresholds is None and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            thresholds = json.load(f).get('thresholds', {})
+    baseline = {
+        'version': BASELINE_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'machine': machine(),
+        'metrics': metrics,
+        'thresholds': thresholds or {},
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def load_baseline(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version in {path}: {baseline.get('version')}")
+    return baseline
+
+
+def compare(baseline: Dict, metrics: Dict[str, float], threshold: float, min_delta_ms: float) -> List[Dict]:
+    """One row per metric: baseline, current, relative change and status."""
+    rows = []
+    base_metrics = baseline.get('metrics', {})
+    overrides = baseline.get('thresholds', {})
+    for name in sorted(set(base_metrics) | set(metrics)):
+        base, current = base_metrics.get(name), metrics.get(name)
+        row = {'metric': name, 'baseline': base, 'current': current, 'change': None}
+        if current is None:
+            row['status'] = 'not run'
+        elif base is None:
+            row['status'] = 'new'
+        else:
+            row['change'] = (current - base) / base if base else 0.0
+            limit = overrides.get(name, threshold)
+            if current > base * (1.0 + limit) and current - base > min_delta_ms:
+                row['status'] = 'REGRESSION'
+            elif current < base * (1.0 - limit) and base - current > min_delta_ms:
+                row['status'] = 'faster'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def format_rows(rows: List[Dict]) -> str:
+    lines = [f"{'metric':<28} {'baseline':>11} {'current':>11} {'change':>8}  status"]
+    for row in rows:
+        base = f"{row['baseline']:.3f}ms" if row['baseline'] is not None else '-'
+        current = f"{row['current']:.3f}ms" if row['current'] is not None else '-'
+        change = f"{row['change']:+.1%}" if row['change'] is not None else ''
+        lines.append(f"{row['metric']:<28} {base:>11} {current:>11} {change:>8}  {row['status']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks with stored baselines")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10_000])
+    parser.add_argument('--iterations', type=int, default=200, help="runs of the fast benchmarks")
+    parser.add_argument('--repeat', type=int, default=3, help="runs of the build benchmarks")
+    parser.add_argument('--only', nargs='+', choices=GROUPS, help="benchmark groups to run")
+    parser.add_argument('--save', help="write the results as a baseline")
+    parser.add_argument('--compare', help="fail on regressions against this baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05,
+                        help="slowdowns smaller than this are noise")
+    args = parser.parse_args(argv)
+    # Malformed synthetic entries and pool restarts aren't what is measured here
+    logging.disable(logging.ERROR)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    if baseline and baseline.get('machine') != machine():
+        print(f"warning: baseline recorded on {baseline.get('machine')}, running on {machine()}")
+    metrics = run_suite(args.sizes, args.iterations, args.repeat, args.only)
+    rows = compare(baseline or {}, metrics, args.threshold, args.min_delta_ms)
+    print(format_rows(rows))
+    if args.save:
+        save_baseline(args.save, metrics)
+        print(f"\nbaseline written to {args.save}")
+    regressions = [row['metric'] for row in rows if row['status'] == 'REGRESSION']
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) past {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
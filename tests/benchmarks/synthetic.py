@@ -0,0 +1,95 @@
+"""
+Synthetic script catalogs for benchmarks.
+Generates semantic-index style entries that look like the real scripts/ tree
+(verb-noun ids, short descriptions, a handful of keywords) at any size.
+"""
+import os
+import random
+from typing import Dict, List
+
+VERBS = [
+    'open', 'close', 'check', 'list', 'show', 'install', 'uninstall', 'set',
+    'turn', 'play', 'search', 'enable', 'disable', 'switch', 'minimize', 'what',
+]
+NOUNS = [
+    'calculator', 'notepad', 'chrome', 'weather', 'battery', 'time', 'windows',
+    'bluetooth', 'volume', 'music', 'settings', 'explorer', 'firefox', 'spotify',
+    'wallpaper', 'network', 'printer', 'clipboard', 'screen', 'desktop', 'mail',
+    'calendar', 'camera', 'maps', 'news', 'store', 'terminal', 'paint', 'zoom',
+]
+FILLER = [
+    'the', 'application', 'website', 'current', 'system', 'user', 'default',
+    'window', 'status', 'quickly', 'folder', 'file', 'online', 'local',
+]
+CATEGORIES = ['application', 'system-info', 'system-control', 'general', 'voice']
+
+QUERIES_SHORT = ['time', 'calculator', 'battery', 'weather', 'chrome']
+QUERIES_LONG = [
+    'what time is it right now',
+    'open the calculator application please',
+    'check the weather forecast for today',
+    'close notepad and minimize all windows',
+    'turn the volume up on the desktop speakers',
+]
+
+
+def synthetic_scripts(count: int, seed: int = 0) -> Dict[str, Dict]:
+    """Return a {script_id: entry} map shaped like semantic_index.json."""
+    rng = random.Random(seed)
+    scripts: Dict[str, Dict] = {}
+    serial = 0
+    while len(scripts) < count:
+        verb = rng.choice(VERBS)
+        words: List[str] = [rng.choice(NOUNS)]
+        if rng.random() < 0.6:
+            words.append(rng.choice(NOUNS + FILLER))
+        script_id = '-'.join([verb, *words])
+        if script_id in scripts:
+            script_id = f"{script_id}-{serial}"
+            serial += 1
+        name = script_id.replace('-', ' ')
+        description = ' '.join(
+            [verb.capitalize(), *words, *rng.sample(FILLER, 3)]
+        )
+        scripts[script_id] = {
+            'id': script_id,
+            'name': name,
+            'description': description,
+            'category': rng.choice(CATEGORIES),
+            'keywords': [name, script_id, *script_id.split('-')],
+            'risk_level': 'low',
+            'has_metadata': False,
+        }
+    return scripts
+
+
+def synthetic_script_source(script_id: str, entry: Dict) -> str:
+    """Render an entry as a .ps1 file with a YAML metadata header."""
+    return (
+        "<#\n"
+        f"id: {script_id}\n"
+        f"name: {entry['name'].title()}\n"
+        f"description: {entry['description']}\n"
+        f"category: {entry['category']}\n"
+        f"risk_level: {entry['risk_level']}\n"
+        "side_effects: none\n"
+        "parameters: []\n"
+        "examples:\n"
+        f"- description: {entry['name']}\n"
+        "  args: {}\n"
+        "#>\n"
+        "\n"
+        f"Write-Output \"{entry['name']}\"\n"
+    )
+
+
+def write_synthetic_tree(root: str, count: int, seed: int = 0, per_dir: int = 500) -> Dict[str, Dict]:
+    """Write count synthetic .ps1 scripts under root, per_dir to a folder; returns the entries."""
+    scripts = synthetic_scripts(count, seed)
+    for i, (script_id, entry) in enumerate(scripts.items()):
+        folder = os.path.join(root, f"group-{i // per_dir:04d}")
+        if i % per_dir == 0:
+            os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"{script_id}.ps1"), 'w', encoding='utf-8') as f:
+            f.write(synthetic_script_source(script_id, entry))
+    return scripts
@@ -0,0 +1,31 @@
+"""
+Stand-in for pool-host.ps1 that speaks the same stdin/stdout protocol, so the
+PowerShell pool can be tested without PowerShell. Script ids select behaviours.
+"""
+import json
+import os
+import sys
+import time
+
+
+def main():
+    print('T2W ' + json.dumps({'ready': True, 'pid': os.getpid()}), flush=True)
+    for line in sys.stdin:
+        request = json.loads(line)
+        script = request['script']
+        response = {'id': request['id'], 'exit_code': 0, 'stdout': '', 'stderr': ''}
+        if script == 'crash':
+            sys.exit(3)
+        if script == 'sleep':
+            time.sleep(float(request['args'].get('Seconds', 5)))
+        if script == 'noisy':
+            # Stray console output must not be read as a response
+            print('WARNING: something chatty', flush=True)
+        if script == 'fail':
+            response.update(exit_code=2, stderr='failed on purpose')
+        response['stdout'] = json.dumps({'pid': os.getpid(), 'script': script, 'args': request['args']})
+        print('T2W ' + json.dumps(response), flush=True)
+
+
+if __name__ == '__main__':
+    main()
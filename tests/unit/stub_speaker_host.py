@@ -0,0 +1,49 @@
+"""Stand-in for speaker-host.ps1: same JSON-lines protocol, no audio.
+
+Utterances containing "long" take 5 seconds unless stopped; others 50 ms.
+"""
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+
+def respond(payload):
+    sys.stdout.write('T2W ' + json.dumps(payload) + '\n')
+    sys.stdout.flush()
+
+
+def main():
+    requests = queue.Queue()
+
+    def read():
+        for line in sys.stdin:
+            requests.put(json.loads(line))
+        requests.put(None)
+
+    threading.Thread(target=read, daemon=True).start()
+    respond({'ready': True, 'pid': os.getpid()})
+    current, deadline = None, None
+    while True:
+        try:
+            request = requests.get(timeout=0.01)
+        except queue.Empty:
+            request = False
+        if request is None:
+            return
+        if request:
+            if request['op'] == 'say':
+                current = request['id']
+                deadline = time.monotonic() + (5 if 'long' in request['text'] else 0.05)
+            elif request['op'] == 'stop' and current is not None:
+                respond({'id': current, 'done': True, 'interrupted': True})
+                current = None
+        if current is not None and time.monotonic() >= deadline:
+            respond({'id': current, 'done': True, 'interrupted': False})
+            current = None
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+import asyncio
+import socket
+import tempfile
+import threading
+import unittest
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.integration import serenade_bridge
+from src.agent.integration.agent_daemon import (
+    AgentDaemon, DaemonError, DaemonUnavailable, read_token, send_command, send_request,
+)
+
+
+class FakeService:
+    def __init__(self):
+        self.transcripts = []
+
+    async def handle_transcript(self, transcript):
+        self.transcripts.append(transcript)
+        if transcript == 'fail':
+            raise RuntimeError('boom')
+        return f"done: {transcript}"
+
+
+class TestAgentDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.token_file = os.path.join(self.tmp.name, 'daemon.token')
+        patcher = mock.patch.dict(os.environ, {'TALK2WINDOWS_DAEMON_TOKEN_FILE': self.token_file})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def _run(self, client):
+        """Start a daemon on a free port, run client(port) in a thread, then stop."""
+        service = FakeService()
+
+        async def scenario():
+            daemon = AgentDaemon(service, host='127.0.0.1', port=0)
+            await daemon.start()
+            try:
+                return await asyncio.get_event_loop().run_in_executor(None, client, daemon.port)
+            finally:
+                await daemon.stop()
+
+        return asyncio.run(scenario()), service
+
+    def test_command_roundtrip_reuses_service(self):
+        def client(port):
+            return [send_command('open calculator', port=port), send_command('check battery', port=port)]
+
+        results, service = self._run(client)
+        self.assertEqual(results, ['done: open calculator', 'done: check battery'])
+        self.assertEqual(service.transcripts, ['open calculator', 'check battery'])
+        self.assertIsNone(read_token(self.token_file))
+
+    def test_errors_are_reported_to_client(self):
+        def client(port):
+            with self.assertRaises(RuntimeError):
+                send_command('fail', port=port)
+            return send_request({'type': 'bogus'}, port=port), send_request({'type': 'ping'}, port=port)
+
+        (unknown, ping), _ = self._run(client)
+        self.assertFalse(unknown['ok'])
+        self.assertEqual(ping, {'ok': True, 'result': 'pong'})
+
+    def test_unavailable_when_nothing_listens(self):
+        async def free_port():
+            server = await asyncio.start_server(lambda r, w: None, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            server.close()
+            await server.wait_closed()
+            return port
+
+        port = asyncio.run(free_port())
+        with open(self.token_file, 'w') as f:
+            f.write('stale')
+        with self.assertRaises(DaemonUnavailable):
+            send_command('open calculator', port=port)
+
+    def test_requests_need_the_token(self):
+        def client(port):
+            if os.name == 'posix':
+                self.assertEqual(os.stat(self.token_file).st_mode & 0o077, 0)
+            with socket.create_connection(('127.0.0.1', port)) as sock:
+                sock.sendall(b'{"type": "shutdown"}\n{"type": "shutdown"}\n')
+                with sock.makefile('rb') as reader:
+                    refused = reader.readlines()
+            with open(self.token_file, 'w') as f:
+                f.write('guessed')
+            with self.assertRaises(DaemonError):
+                send_command('open calculator', port=port)
+            return refused
+
+        refused, service = self._run(client)
+        self.assertEqual(refused, [b'{"ok": false, "error": "Unauthorized"}\n'])
+        self.assertEqual(service.transcripts, [])
+
+    def test_no_token_file_means_unavailable(self):
+        with self.assertRaises(DaemonUnavailable):
+            send_command('open calculator', port=1)
+
+    def test_failure_after_sending_is_not_unavailable(self):
+        with open(self.token_file, 'w') as f:
+            f.write('secret')
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        received = []
+
+        def silent_daemon():
+            conn, _ = listener.accept()
+            with conn:
+                received.append(conn.makefile('rb').readline())
+                conn.recv(1)  # Hold the connection open until the client gives up
+
+        thread = threading.Thread(target=silent_daemon)
+        thread.start()
+        try:
+            with self.assertRaises(DaemonError) as caught:
+                send_command('open calculator', port=listener.getsockname()[1], timeout=0.2)
+        finally:
+            thread.join()
+            listener.close()
+        self.assertNotIsInstance(caught.exception, DaemonUnavailable)
+        self.assertIn(b'"token": "secret"', received[0])
+
+    def test_bridge_does_not_rerun_after_daemon_error(self):
+        with mock.patch.object(serenade_bridge, 'send_command', side_effect=DaemonError('timed out')), \
+                mock.patch('src.agent.core.service.AgentService') as service:
+            result = asyncio.run(serenade_bridge.process_voice_command('open calculator'))
+        self.assertIsNone(result)
+        service.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
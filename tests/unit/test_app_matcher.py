@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.app_matcher import AppMatcher, compact_key, levenshtein
+from src.agent.core.fast_router import FastPathRouter, detect_app_command
+
+APPS = [
+    ('BLACKBOX.AI', 'blackbox.ai.app'),
+    ('Calculator', 'Microsoft.WindowsCalculator_8wekyb3d8bbwe!App'),
+    ('Google Chrome', 'Chrome'),
+    ('Microsoft Edge', 'MSEdge'),
+    ('Notepad', 'Microsoft.WindowsNotepad_8wekyb3d8bbwe!App'),
+    ('OneNote', 'Microsoft.Office.ONENOTE.EXE.15'),
+    ('OneDrive', 'Microsoft.SkyDrive.Desktop'),
+    ('Paint 3D', 'Microsoft.MSPaint_8wekyb3d8bbwe!Microsoft.MSPaint'),
+    ('Movies & TV', 'Microsoft.ZuneVideo_8wekyb3d8bbwe!Microsoft.ZuneVideo'),
+    ('Python 3.11 (64-bit)', 'Python.3.11'),
+    ('Python 3.12 (64-bit)', 'Python.3.12'),
+]
+
+
+class TestAppMatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmp.name, 'startapps.csv')
+        self._write(APPS)
+        self.matcher = AppMatcher(self.csv, threshold=0.8)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, apps):
+        with open(self.csv, 'w', encoding='utf-8') as f:
+            f.write('"Name","AppID"\n')
+            for name, app_id in apps:
+                f.write(f'"{name}","{app_id}"\n')
+
+    def _name(self, spoken):
+        resolved = self.matcher.resolve(spoken)
+        return resolved['name'] if resolved else None
+
+    def test_spoken_forms(self):
+        self.assertEqual(compact_key('blackbox dot ai'), compact_key('BLACKBOX.AI'))
+        self.assertEqual(self._name('blackbox dot ai'), 'BLACKBOX.AI')
+        self.assertEqual(self._name('note pad'), 'Notepad')
+        self.assertEqual(self._name('movies and tv'), 'Movies & TV')
+
+    def test_symbols_are_kept_in_the_key(self):
+        self.assertEqual(compact_key('Notepad++'), compact_key('notepad plus plus'))
+        self.assertNotEqual(compact_key('Notepad++'), compact_key('Notepad'))
+        # Not installed: must not open Windows Notepad
+        self.assertIsNone(self._name('notepad plus plus'))
+        self._write(APPS + [('Notepad++', 'notepad++')])
+        os.utime(self.csv, ns=(0, 1))
+        self.assertEqual(self._name('notepad plus plus'), 'Notepad++')
+        self.assertEqual(self._name('notepad'), 'Notepad')
+
+    def test_number_words_match_both_ways(self):
+        self.assertEqual(self._name('one note'), 'OneNote')
+        self.assertEqual(self.matcher.match('one note')[0]['method'], 'exact')
+        self.assertEqual(self._name('one drive'), 'OneDrive')
+        self.assertEqual(self._name('paint three d'), 'Paint 3D')
+
+    def test_words_prefixes_and_misspellings(self):
+        self.assertEqual(self._name('edge'), 'Microsoft Edge')
+        self.assertEqual(self._name('chrome'), 'Google Chrome')
+        self.assertEqual(self._name('calc'), 'Calculator')
+        self.assertEqual(self._name('calculater'), 'Calculator')
+        self.assertEqual(self.matcher.resolve('calculator')['app_id'], APPS[1][1])
+
+    def test_unknown_and_ambiguous_names_resolve_to_none(self):
+        self.assertIsNone(self._name('spotify'))
+        self.assertIsNone(self._name('python'))
+        self.assertEqual(self._name('python 3.12'), 'Python 3.12 (64-bit)')
+        stats = self.matcher.stats()
+        self.assertEqual((stats['unmatched'], stats['ambiguous'], stats['resolved']), (1, 1, 1))
+
+    def test_refresh_patches_changed_rows(self):
+        self.assertEqual(self.matcher.refresh(), {'added': 0, 'removed': 0})
+        self._write(APPS[1:] + [('Spotify', 'SpotifyAB.Spotify')])
+        os.utime(self.csv, ns=(0, 1))  # The size alone may not change
+        self.assertEqual(self.matcher.refresh(), {'added': 1, 'removed': 1})
+        self.assertEqual(self._name('spotify'), 'Spotify')
+        self.assertIsNone(self._name('blackbox dot ai'))
+
+    def test_missing_inventory(self):
+        matcher = AppMatcher(os.path.join(self.tmp.name, 'missing.csv'))
+        self.assertFalse(matcher.available)
+        self.assertEqual(matcher.match('calc'), [])
+
+    def test_bounded_levenshtein(self):
+        self.assertEqual(levenshtein('kitten', 'sitting'), 3)
+        self.assertEqual(levenshtein('kitten', 'sitting', max_distance=1), 2)
+        self.assertEqual(levenshtein('calc', 'calculator', max_distance=2), 3)
+
+    def test_router_dispatches_resolved_apps_only(self):
+        index = type('Index', (), {'search': lambda self, query, max_results=5: []})()
+        router = FastPathRouter(index, self.tmp.name, threshold=0.75, app_matcher=self.matcher)
+        routed = router.route('open blackbox dot ai')
+        self.assertEqual(routed['args'], {'AppName': 'BLACKBOX.AI', 'AppID': 'blackbox.ai.app'})
+        self.assertEqual(routed['confidence'], 1.0)
+        self.assertIsNone(router.route('open spotify'))
+        self.assertIsNone(router.route('open python'))
+        self.assertIsNone(detect_app_command('open spotify', self.tmp.name, self.matcher)['resolved'])
+
+
+if __name__ == '__main__':
+    unittest.main()
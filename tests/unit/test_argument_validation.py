@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.execution.argument_validation import ArgumentValidationError, ArgumentValidator
+from src.agent.execution.powershell_executor import PowerShellExecutor
+
+TOOLS = [
+    {
+        'name': 'open-app-by-name',
+        'parameters': {
+            'type': 'OBJECT',
+            'properties': {'AppName': {'type': 'STRING', 'description': 'App'}},
+            'required': ['AppName'],
+        },
+    },
+    {
+        'name': 'set-volume',
+        'parameters': {
+            'type': 'OBJECT',
+            'properties': {
+                'Level': {'type': 'INTEGER'},
+                'Mute': {'type': 'BOOLEAN'},
+                'Devices': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+            },
+            'required': ['Level'],
+        },
+    },
+    {'name': 'check-battery', 'parameters': {'type': 'OBJECT', 'properties': {}}},
+]
+
+
+class TestArgumentValidator(unittest.TestCase):
+    def setUp(self):
+        self.validator = ArgumentValidator(TOOLS)
+
+    def test_valid_arguments_keep_types(self):
+        self.assertEqual(self.validator.validate('open-app-by-name', {'AppName': 'a,b=c'}), {'AppName': 'a,b=c'})
+        self.assertEqual(
+            self.validator.validate('set-volume', {'Level': 40.0, 'Mute': False, 'Devices': ('speakers',)}),
+            {'Level': 40, 'Mute': False, 'Devices': ['speakers']},
+        )
+
+    def test_invalid_arguments(self):
+        cases = [
+            ('open-app-by-name', {}, 'missing required parameter(s) AppName'),
+            ('open-app-by-name', {'AppName': 'x', 'Extra': 1}, 'unknown parameter(s) Extra'),
+            ('set-volume', {'Level': 'loud'}, 'Level: expected integer, got str'),
+            ('set-volume', {'Level': 1, 'Mute': 'yes'}, 'Mute: expected boolean'),
+            ('set-volume', {'Level': 1, 'Devices': [1]}, 'Devices[0]: expected string'),
+            ('check-battery', {'Now': True}, 'unknown parameter(s) Now'),
+            ('check-battery', ['x'], 'arguments must be an object'),
+        ]
+        for tool, args, message in cases:
+            with self.subTest(tool=tool, args=args):
+                with self.assertRaises(ArgumentValidationError) as ctx:
+                    self.validator.validate(tool, args)
+                self.assertIn(message, str(ctx.exception))
+
+    def test_scripts_without_schema_pass_through(self):
+        self.assertEqual(self.validator.validate('tell-me-a-joke', {'Topic': 'cats'}), {'Topic': 'cats'})
+
+    @patch('subprocess.run')
+    def test_executor_rejects_before_spawning(self, mock_subprocess):
+        executor = PowerShellExecutor(validator=self.validator)
+        exit_code, _, stderr = executor.run('set-volume', {'Level': 'loud'})
+        self.assertEqual(exit_code, -1)
+        self.assertIn('Invalid arguments for set-volume', stderr)
+        mock_subprocess.assert_not_called()
+
+    @patch('subprocess.run')
+    def test_executor_sends_json(self, mock_subprocess):
+        mock_subprocess.return_value = MagicMock(
+            stdout='WARNING: chatty\n{"exit_code": 0, "stdout": "ok", "stderr": ""}', stderr='', returncode=0
+        )
+        executor = PowerShellExecutor(validator=self.validator)
+        self.assertEqual(executor.run('open-app-by-name', {'AppName': 'a,b=c'}), (0, 'ok', ''))
+        command = mock_subprocess.call_args[0][0]
+        self.assertEqual(command[command.index('-ParamsJson') + 1], '{"AppName": "a,b=c"}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tests.benchmarks import suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_compare_flags_regressions_past_the_threshold(self):
+        baseline = {'metrics': {'a': 10.0, 'b': 10.0, 'c': 10.0, 'd': 0.01, 'gone': 1.0},
+                    'thresholds': {'c': 0.5}}
+        current = {'a': 13.0, 'b': 11.0, 'c': 13.0, 'd': 0.02, 'new': 1.0}
+        status = {row['metric']: row['status'] for row in suite.compare(baseline, current, 0.25, 0.05)}
+        self.assertEqual(status, {
+            'a': 'REGRESSION', 'b': 'ok', 'c': 'ok', 'd': 'ok', 'gone': 'not run', 'new': 'new',
+        })
+
+    def test_run_save_and_compare(self):
+        metrics = suite.run_suite([60], iterations=5, repeat=1, groups=['search', 'memory'])
+        self.assertEqual(set(metrics), {'search.short.60', 'search.long.60', 'memory.save'})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            suite.save_baseline(path, {'memory.save': 1e-6}, thresholds={'memory.save': 0.5})
+            suite.save_baseline(path, {'memory.save': 1e-6})
+            self.assertEqual(suite.load_baseline(path)['thresholds'], {'memory.save': 0.5})
+            with redirect_stdout(io.StringIO()):
+                code = suite.main(['--only', 'memory', '--iterations', '5', '--compare', path,
+                                   '--min-delta-ms', '0'])
+            self.assertEqual(code, 1)
+
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 99}, f)
+            with self.assertRaises(ValueError):
+                suite.load_baseline(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
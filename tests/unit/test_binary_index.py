@@ -0,0 +1,106 @@
+import unittest
+import tempfile
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.binary_index import BinaryIndex, write_binary_index
+from src.agent.core.search_engine import InvertedIndex
+from src.agent.core.semantic_index import SemanticIndex
+from tests.benchmarks.synthetic import synthetic_scripts
+
+
+class TestBinaryIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'semantic_index.bin')
+        scripts = synthetic_scripts(300, seed=7)
+        self.index = {
+            'scripts': scripts,
+            'categories': {},
+            'keywords': {},
+            'files': {
+                f"{script_id}.ps1": {'id': script_id, 'mtime': 1, 'size': 2, 'hash': 'ab'}
+                for script_id in scripts
+            },
+            'version': '1.1',
+        }
+        for script_id, info in scripts.items():
+            self.index['categories'].setdefault(info['category'], []).append(script_id)
+            for keyword in info['keywords']:
+                self.index['keywords'].setdefault(keyword.lower(), []).append(script_id)
+        write_binary_index(self.path, self.index)
+        self.binary = BinaryIndex(self.path)
+
+    def tearDown(self):
+        self.binary.close()
+        self.tmp.cleanup()
+
+    def test_search_matches_inverted_index(self):
+        engine = InvertedIndex.from_scripts(self.index['scripts'])
+        for query in ('time', 'open calculator', 'calc', 'check the weather', 'zzz', ''):
+            self.assertEqual(self.binary.search(query, 7), engine.search(query, 7), query)
+
+    def test_round_trip_to_dict(self):
+        decoded = self.binary.to_dict()
+        self.assertEqual(decoded['scripts'], self.index['scripts'])
+        self.assertEqual(decoded['files'], self.index['files'])
+        self.assertEqual(decoded['version'], '1.1')
+        self.assertEqual(
+            {k: sorted(v) for k, v in decoded['keywords'].items()},
+            {k: sorted(v) for k, v in self.index['keywords'].items()},
+        )
+
+    def test_rejects_corrupt_file(self):
+        bad = os.path.join(self.tmp.name, 'bad.bin')
+        with open(bad, 'wb') as f:
+            f.write(b'not an index' * 20)
+        with self.assertRaises(ValueError):
+            BinaryIndex(bad)
+
+
+class TestSemanticIndexBinaryFormat(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scripts_dir = os.path.join(self.tmp.name, 'scripts')
+        self.index_file = os.path.join(self.tmp.name, 'semantic_index.json')
+        os.makedirs(self.scripts_dir)
+        with open(os.path.join(self.scripts_dir, 'check-weather.ps1'), 'w', encoding='utf-8') as f:
+            f.write("<#\n.SYNOPSIS\n\tChecks the weather.\n#>\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _index(self):
+        return SemanticIndex(scripts_dir=self.scripts_dir, index_file=self.index_file, index_format='binary')
+
+    def test_fresh_binary_is_mapped_not_decoded(self):
+        self._index()
+        index = self._index()
+        self.assertIsNotNone(index._binary)
+        self.assertIsNone(index._index)
+        self.assertEqual(index.search('weather')[0]['description'], 'Checks the weather')
+        self.assertEqual(len(index), 1)
+        index._release_binary()
+
+    def test_stale_binary_is_refreshed(self):
+        self._index()
+        with open(os.path.join(self.scripts_dir, 'check-battery.ps1'), 'w', encoding='utf-8') as f:
+            f.write("<#\n.SYNOPSIS\n\tChecks the battery.\n#>\n")
+        index = self._index()
+        self.assertIsNone(index._binary)
+        self.assertEqual(index.search('battery')[0]['id'], 'check-battery')
+        reloaded = self._index()
+        self.assertIsNotNone(reloaded._binary)
+        reloaded._release_binary()
+
+    def test_export_json(self):
+        index = self._index()
+        path = index.export_json(os.path.join(self.tmp.name, 'export.json'))
+        self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(self.index_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import asyncio
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.integration.command_queue import CommandQueue, normalize_utterance
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingHandler:
+    """Async handler that records start/end order and can block until released."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.events = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, transcript):
+        self.events.append(('start', transcript))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if transcript == 'explode':
+                raise RuntimeError('boom')
+        finally:
+            self.active -= 1
+        self.events.append(('end', transcript))
+        return transcript
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestCommandQueue(unittest.TestCase):
+    def test_commands_run_in_order_one_at_a_time(self):
+        handler = RecordingHandler()
+
+        async def main():
+            queue = CommandQueue(handler, concurrency=1, dedupe_window=0)
+            queue.start()
+            for text in ['open notepad', 'open calculator', 'check battery']:
+                queue.submit(text)
+            await queue.join()
+            await queue.close()
+            return queue.stats()
+
+        stats = run(main())
+        self.assertEqual([t for kind, t in handler.events if kind == 'start'],
+                         ['open notepad', 'open calculator', 'check battery'])
+        self.assertEqual(handler.peak, 1)
+        self.assertEqual((stats['submitted'], stats['completed'], stats['queued']), (3, 3, 0))
+        self.assertIn('latency_p95_ms', stats)
+
+    def test_concurrency_is_bounded(self):
+        handler = RecordingHandler(delay=0.02)
+
+        async def main():
+            queue = CommandQueue(handler, concurrency=2, dedupe_window=0)
+            queue.start()
+            for i in range(6):
+                queue.submit(f'command {i}')
+            await queue.join()
+            await queue.close()
+
+        run(main())
+        self.assertEqual(handler.peak, 2)
+
+    def test_duplicates_within_window_are_dropped(self):
+        clock = FakeClock()
+        handler = RecordingHandler()
+
+        async def main():
+            queue = CommandQueue(handler, dedupe_window=1.5, clock=clock)
+            queue.start()
+            results = [queue.submit('Open Notepad.'), queue.submit('open  notepad')]
+            clock.now = 2.0
+            results.append(queue.submit('open notepad'))
+            await queue.join()
+            await queue.close()
+            return results, queue.stats()
+
+        results, stats = run(main())
+        self.assertEqual(results, ['queued', 'duplicate', 'queued'])
+        self.assertEqual(stats['duplicates'], 1)
+        self.assertEqual(len([e for e in handler.events if e[0] == 'start']), 2)
+
+    def test_full_queue_drops_oldest_pending(self):
+        handler = RecordingHandler()
+
+        async def main():
+            queue = CommandQueue(handler, max_size=2, dedupe_window=0)
+            for text in ['one', 'two', 'three']:
+                queue.submit(text)
+            queue.start()
+            await queue.join()
+            await queue.close()
+            return queue.stats()
+
+        stats = run(main())
+        self.assertEqual([t for kind, t in handler.events if kind == 'start'], ['two', 'three'])
+        self.assertEqual((stats['dropped'], stats['max_queued']), (1, 2))
+
+    def test_cancel_phrase_cancels_running_and_pending(self):
+        handler = RecordingHandler(delay=5)
+
+        async def main():
+            queue = CommandQueue(handler, dedupe_window=0)
+            queue.start()
+            queue.submit('open notepad')
+            queue.submit('open calculator')
+            await asyncio.sleep(0.05)
+            status = queue.submit('never mind')
+            await queue.join()
+            await queue.close()
+            return status, queue.stats()
+
+        status, stats = run(main())
+        self.assertEqual(status, 'cancelled')
+        self.assertEqual(stats['cancelled'], 2)
+        self.assertEqual(handler.events, [('start', 'open notepad')])
+
+    def test_supersede_replaces_pending_commands(self):
+        handler = RecordingHandler()
+
+        async def main():
+            queue = CommandQueue(handler, dedupe_window=0, supersede=True)
+            for text in ['volume up', 'volume down', 'mute']:
+                queue.submit(text)
+            queue.start()
+            await queue.join()
+            await queue.close()
+
+        run(main())
+        self.assertEqual(handler.events, [('start', 'mute'), ('end', 'mute')])
+
+    def test_failures_are_counted_and_queue_keeps_going(self):
+        handler = RecordingHandler()
+
+        async def main():
+            queue = CommandQueue(handler, dedupe_window=0)
+            queue.start()
+            queue.submit('explode')
+            queue.submit('check battery')
+            await queue.join()
+            await queue.close()
+            return queue.stats()
+
+        stats = run(main())
+        self.assertEqual((stats['failed'], stats['completed']), (1, 1))
+
+    def test_close_stops_running_commands(self):
+        handler = RecordingHandler(delay=5)
+
+        async def main():
+            queue = CommandQueue(handler, dedupe_window=0)
+            queue.start()
+            queue.submit('slow')
+            await asyncio.sleep(0.02)
+            await asyncio.wait_for(queue.close(), timeout=1)
+            return queue.stats()
+
+        self.assertEqual(run(main())['running'], 0)
+
+    def test_normalize_utterance(self):
+        self.assertEqual(normalize_utterance('  Never   Mind! '), 'never mind')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import tempfile
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.fast_router import FastPathRouter, detect_app_command
+
+
+def _match(script_id, score):
+    return {'id': script_id, 'relevance_score': score}
+
+
+class FakeIndex:
+    def __init__(self, results):
+        self.results = results
+
+    def search(self, query, max_results=5):
+        return self.results.get(query, [])[:max_results]
+
+    def script_ids(self):
+        return iter({match['id'] for matches in self.results.values() for match in matches})
+
+
+class TestFastPathRouter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        install_dir = os.path.join(self.tmp.name, 'apps', 'install')
+        os.makedirs(install_dir)
+        open(os.path.join(install_dir, 'install-firefox.ps1'), 'w').close()
+        self.index = FakeIndex({
+            'open calculator': [_match('open-calculator', 25.9), _match('close-calculator', 11.2)],
+            'lock the computer': [_match('lock-computer', 26.7), _match('hibernate-computer', 10.3)],
+            'shutdown the pc': [_match('open-this-pc', 12.6), _match('open-themes-settings', 7.1)],
+            'open grok': [_match('open-app-by-name', 8.5), _match('open-street-map', 5.4)],
+            'set volume': [_match('set-volume', 30.0)],
+            'open street': [_match('open-street-map', 9.1), _match('open-app-by-name', 4.2)],
+        })
+        tools = [
+            {'name': 'open-app-by-name', 'parameters': {'type': 'OBJECT', 'required': ['AppName']}},
+            {'name': 'set-volume', 'parameters': {'type': 'OBJECT', 'required': ['Level']}},
+        ]
+        self.router = FastPathRouter(self.index, self.tmp.name, tools=tools, threshold=0.75, app_confidence=0.8)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_spelled_out_script_routes_locally(self):
+        routed = self.router.route('open calculator')
+        self.assertEqual((routed['tool'], routed['confidence']), ('open-calculator', 1.0))
+        self.assertEqual(self.router.route('lock the computer')['tool'], 'lock-computer')
+
+    def test_unspelled_top_match_escalates(self):
+        self.assertIsNone(self.router.route('shutdown the pc'))
+        self.assertEqual(self.router.stats(), {'local': 0, 'escalated': 1})
+
+    def test_open_app_and_install(self):
+        routed = self.router.route('open grok')
+        self.assertEqual((routed['tool'], routed['args']), ('open-app-by-name', {'AppName': 'grok'}))
+        self.assertEqual(self.router.route('install firefox')['tool'], 'install-firefox')
+
+    def test_app_name_that_names_a_script_escalates(self):
+        # Without an inventory, "street" and "calc" may mean open-street-map and open-calculator
+        self.assertIsNone(self.router.route('open street'))
+        self.assertIsNone(self.router.route('launch calc'))
+        self.assertEqual(self.router.stats(), {'local': 0, 'escalated': 2})
+
+    def test_required_arguments_escalate(self):
+        self.assertIsNone(self.router.route('set volume'))
+
+    def test_threshold_is_respected(self):
+        strict = FastPathRouter(self.index, self.tmp.name, threshold=0.9, app_confidence=0.8)
+        self.assertIsNone(strict.route('open grok'))
+
+    def test_detect_app_command_patterns(self):
+        self.assertEqual(detect_app_command('open the blackbox.ai app', self.tmp.name)['app_name'], 'blackbox.ai')
+        self.assertEqual(detect_app_command('launch grok please', self.tmp.name)['app_name'], 'grok')
+        self.assertIsNone(detect_app_command('install nothing-here', self.tmp.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.utils import startup_profile
+from src.agent.utils.lazy_import import lazy_import
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+class TestLazyImport(unittest.TestCase):
+    def setUp(self):
+        startup_profile.reset()
+        self.addCleanup(startup_profile.reset)
+
+    def test_imports_on_first_attribute_access(self):
+        sys.modules.pop('colorsys', None)
+        colorsys = lazy_import('colorsys')
+        self.assertNotIn('colorsys', sys.modules)
+        self.assertFalse(colorsys.is_loaded)
+        self.assertEqual(colorsys.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertIn('colorsys', sys.modules)
+        self.assertEqual([p['name'] for p in startup_profile.phases()], ['import colorsys'])
+
+    def test_patch_targets_keep_working(self):
+        module = lazy_import('colorsys')
+        original = module.rgb_to_hsv
+        with patch.object(module, 'rgb_to_hsv', return_value='patched'):
+            self.assertEqual(module.rgb_to_hsv(0, 0, 0), 'patched')
+        self.assertIs(module.rgb_to_hsv, original)
+
+    def test_missing_module_fails_on_use(self):
+        module = lazy_import('talk2windows_no_such_module')
+        with self.assertRaises(ImportError):
+            module.anything
+
+    def test_entry_points_do_not_import_heavy_modules(self):
+        code = (
+            "import sys\n"
+            "import src.agent.core.service, src.agent.integration.serenade_listener\n"
+            "import src.agent.integration.serenade_bridge\n"
+            "print(','.join(m for m in ('google.generativeai', 'yaml', 'websockets') if m in sys.modules))\n"
+        )
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(output.returncode, 0, output.stderr)
+        self.assertEqual(output.stdout.strip(), '')
+
+
+class TestStartupProfile(unittest.TestCase):
+    def setUp(self):
+        startup_profile.reset()
+        self.addCleanup(startup_profile.reset)
+
+    def test_nested_phases_and_report(self):
+        with startup_profile.phase('init'):
+            with startup_profile.phase('index'):
+                pass
+        with startup_profile.phase('first command'):
+            pass
+        self.assertEqual([(p['name'], p['depth']) for p in startup_profile.phases()],
+                         [('init', 0), ('index', 1), ('first command', 0)])
+        lines = startup_profile.report().splitlines()
+        self.assertTrue(lines[1].endswith('    index'))
+        self.assertTrue(lines[-1].endswith('total'))
+
+    def test_profile_flag(self):
+        argv = ['bridge', '--profile-startup', 'open', 'calculator']
+        self.assertTrue(startup_profile.profile_requested(argv))
+        self.assertEqual(argv, ['bridge', 'open', 'calculator'])
+        self.assertFalse(startup_profile.profile_requested(argv))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.memory.store import MemoryStore
+
+
+def _append_many(memory_dir, writer, count):
+    store = MemoryStore(memory_dir, compact_every=10**6, fsync='never')
+    for i in range(count):
+        store.append_action({'tool': f'writer-{writer}', 'args': {'i': i}, 'result': 'x' * 200})
+
+
+class TestMemoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = self.tmp.name
+
+    def _action(self, i):
+        return {'tool': 'open-calculator', 'args': {'i': i}, 'result': 'ok'}
+
+    def test_append_writes_one_journal_line(self):
+        store = MemoryStore(self.dir, keep_last=5, compact_every=100)
+        store.append_action(self._action(0))
+        store.append_actions([self._action(1), self._action(2)])
+        with open(store.journal_path, encoding='utf-8') as file:
+            self.assertEqual(len(file.readlines()), 3)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, 'recent_actions.json')))
+        self.assertEqual([a['args']['i'] for a in MemoryStore(self.dir, keep_last=5).recent_actions], [0, 1, 2])
+
+    def test_compaction_keeps_last_window(self):
+        store = MemoryStore(self.dir, keep_last=3, compact_every=4)
+        for i in range(4):
+            store.append_action(self._action(i))
+        self.assertFalse(os.path.exists(store.journal_path))
+        self.assertEqual([a['args']['i'] for a in store.load('recent_actions')], [1, 2, 3])
+        store.append_action(self._action(4))
+        reloaded = MemoryStore(self.dir, keep_last=3)
+        self.assertEqual([a['args']['i'] for a in reloaded.recent_actions], [2, 3, 4])
+
+    def test_legacy_snapshot_and_torn_line(self):
+        with open(os.path.join(self.dir, 'recent_actions.json'), 'w', encoding='utf-8') as file:
+            json.dump([self._action(0)], file)
+        with open(os.path.join(self.dir, 'recent_actions.jsonl'), 'w', encoding='utf-8') as file:
+            file.write(json.dumps(self._action(1)) + '\n{"tool": "trunc')
+        store = MemoryStore(self.dir)
+        self.assertEqual([a['args']['i'] for a in store.recent_actions], [0, 1])
+
+    def test_interrupted_compaction_is_recovered(self):
+        store = MemoryStore(self.dir, compact_every=100)
+        store.append_actions([self._action(0), self._action(1)])
+        # Crash right after the journal was rotated aside
+        os.replace(store.journal_path, store.journal_path + '.compacting')
+        store = MemoryStore(self.dir, compact_every=100)
+        self.assertEqual(len(store.recent_actions), 2)
+        self.assertTrue(store.compact())
+        self.assertEqual(len(MemoryStore(self.dir).recent_actions), 2)
+        self.assertFalse(os.path.exists(store.journal_path + '.compacting'))
+
+    def test_compaction_skipped_while_locked(self):
+        store = MemoryStore(self.dir, compact_every=100)
+        store.append_action(self._action(0))
+        open(os.path.join(self.dir, 'recent_actions.lock'), 'w').close()
+        self.assertFalse(store.compact())
+        self.assertTrue(os.path.exists(store.journal_path))
+
+    def test_save_replaces_history(self):
+        store = MemoryStore(self.dir, keep_last=2)
+        store.append_action(self._action(0))
+        store.save('recent_actions', [self._action(5), self._action(6), self._action(7)])
+        self.assertEqual([a['args']['i'] for a in MemoryStore(self.dir, keep_last=2).recent_actions], [6, 7])
+
+    def test_save_replaces_history_while_locked(self):
+        store = MemoryStore(self.dir, keep_last=2, compact_every=100)
+        store.append_action(self._action(0))
+        open(os.path.join(self.dir, 'recent_actions.lock'), 'w').close()
+        store.save('recent_actions', [self._action(5), self._action(6), self._action(7)])
+        self.assertEqual([a['args']['i'] for a in store.recent_actions], [6, 7])
+        self.assertEqual([a['args']['i'] for a in MemoryStore(self.dir, keep_last=2).recent_actions], [6, 7])
+        # The other process's lock is left alone
+        self.assertTrue(os.path.exists(os.path.join(self.dir, 'recent_actions.lock')))
+
+    def test_concurrent_writers_do_not_corrupt(self):
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            list(pool.map(_append_many, [self.dir] * 4, range(4), [50] * 4))
+        store = MemoryStore(self.dir, keep_last=1000)
+        self.assertEqual(len(store.recent_actions), 200)
+        for writer in range(4):
+            seen = [a['args']['i'] for a in store.recent_actions if a['tool'] == f'writer-{writer}']
+            self.assertEqual(seen, list(range(50)))
+
+    def test_invalid_fsync_policy(self):
+        with self.assertRaises(ValueError):
+            MemoryStore(self.dir, fsync='sometimes')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.model_cache import ModelCache, tool_set_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestModelCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.built = []
+
+    def _factory(self, name):
+        def build():
+            self.built.append(name)
+            return object()
+        return build
+
+    def test_tool_set_key_is_stable(self):
+        a = [{'name': 'open-calculator', 'parameters': {'type': 'OBJECT', 'properties': {}}}]
+        b = [{'parameters': {'properties': {}, 'type': 'OBJECT'}, 'name': 'open-calculator'}]
+        self.assertEqual(tool_set_key(a), tool_set_key(b))
+        self.assertNotEqual(tool_set_key(a), tool_set_key(a + [{'name': 'check-time'}]))
+
+    def test_hit_skips_factory(self):
+        cache = ModelCache(max_size=4, ttl=60, clock=self.clock)
+        first = cache.get_or_create('k', self._factory('k'))
+        second = cache.get_or_create('k', self._factory('k'))
+        self.assertIs(first, second)
+        self.assertEqual(self.built, ['k'])
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_lru_eviction(self):
+        cache = ModelCache(max_size=2, ttl=60, clock=self.clock)
+        cache.get_or_create('a', self._factory('a'))
+        cache.get_or_create('b', self._factory('b'))
+        cache.get_or_create('a', self._factory('a'))
+        cache.get_or_create('c', self._factory('c'))  # evicts b, the least recently used
+        cache.get_or_create('a', self._factory('a'))
+        cache.get_or_create('b', self._factory('b'))
+        self.assertEqual(self.built, ['a', 'b', 'c', 'b'])
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl_expiry(self):
+        cache = ModelCache(max_size=2, ttl=10, clock=self.clock)
+        cache.get_or_create('a', self._factory('a'))
+        self.clock.now = 11
+        cache.get_or_create('a', self._factory('a'))
+        self.assertEqual(self.built, ['a', 'a'])
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import logging
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.parallel_build import PhaseTimer, map_chunked
+
+
+def _square_and_log(value):
+    if value % 5 == 0:
+        logging.getLogger('parallel-test').warning(f"multiple of five: {value}")
+    return value * value
+
+
+class TestParallelBuild(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        items = list(range(50))
+        serial = map_chunked(_square_and_log, items, workers=1)
+        parallel = map_chunked(_square_and_log, items, workers=3, chunk_size=4)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(parallel, [i * i for i in items])
+
+    def test_worker_logs_replayed_in_order(self):
+        with self.assertLogs('parallel-test', level='WARNING') as logs:
+            map_chunked(_square_and_log, list(range(20)), workers=2, chunk_size=3)
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            [f"multiple of five: {i}" for i in (0, 5, 10, 15)],
+        )
+
+    def test_phase_timer_reports_wall_time(self):
+        timer = PhaseTimer()
+        with timer.phase('scan'):
+            pass
+        report = timer.report()
+        self.assertIn('scan', report)
+        self.assertGreaterEqual(report['wall'], report['scan'])
+
+
+if __name__ == '__main__':
+    unittest.main()
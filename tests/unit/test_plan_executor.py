@@ -0,0 +1,135 @@
+import asyncio
+import time
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.plan_executor import PlanExecutor, declares_dependencies, normalize_plan
+
+
+def make_runner(durations=None, failures=(), log=None):
+    """A fake step runner that sleeps per tool and records start/end events."""
+    durations = durations or {}
+    log = log if log is not None else []
+
+    async def run_step(step):
+        log.append(('start', step['tool']))
+        await asyncio.sleep(durations.get(step['tool'], 0.01))
+        log.append(('end', step['tool']))
+        if step['tool'] in failures:
+            return f"Failed {step['tool']}", False
+        return f"Executed {step['tool']}", True
+
+    return run_step
+
+
+class TestNormalizePlan(unittest.TestCase):
+    def test_dependencies_by_id_and_index(self):
+        steps = normalize_plan([
+            {'id': 'weather', 'tool': 'check-weather'},
+            {'tool': 'say', 'args': {'Text': 'hi'}, 'depends_on': ['weather']},
+            {'tool': 'check-battery', 'depends_on': [0, 1]},
+        ])
+        self.assertEqual([s['deps'] for s in steps], [[], [0], [0, 1]])
+        self.assertEqual(steps[1]['args'], {'Text': 'hi'})
+        self.assertTrue(all(s['error'] is None for s in steps))
+
+    def test_invalid_steps_are_flagged(self):
+        steps = normalize_plan([
+            {'args': {}},
+            {'tool': 'a', 'depends_on': ['nope']},
+            {'id': 'b', 'tool': 'b', 'depends_on': ['c']},
+            {'id': 'c', 'tool': 'c', 'depends_on': ['b']},
+            {'tool': 'd', 'depends_on': [4]},
+            'not a step',
+        ])
+        errors = [s['error'] for s in steps]
+        self.assertIn('missing tool identifier', errors[0])
+        self.assertIn("unknown dependency 'nope'", errors[1])
+        self.assertIn('dependency cycle', errors[2])
+        self.assertIn('dependency cycle', errors[3])
+        self.assertIn('depends on itself', errors[4])
+        self.assertIn('missing tool identifier', errors[5])
+
+
+class TestPlanExecutor(unittest.TestCase):
+    def test_independent_steps_take_as_long_as_slowest(self):
+        plan = [{'tool': 'open-notepad', 'depends_on': []}, {'tool': 'open-calculator', 'depends_on': []},
+                {'tool': 'check-battery', 'depends_on': []}]
+        runner = make_runner({'open-notepad': 0.2, 'open-calculator': 0.2, 'check-battery': 0.3})
+        start = time.perf_counter()
+        results = asyncio.run(PlanExecutor(max_concurrency=4).run(plan, runner))
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual([r[0] for r in results],
+                         ['Executed open-notepad', 'Executed open-calculator', 'Executed check-battery'])
+
+    def test_plain_plans_run_in_order(self):
+        log = []
+        plan = [{'tool': 'open-notepad'}, {'tool': 'open-calculator'}, {'tool': 'check-battery'}]
+        self.assertFalse(declares_dependencies(plan))
+        runner = make_runner({'open-notepad': 0.05}, failures={'open-notepad'}, log=log)
+        results = asyncio.run(PlanExecutor(max_concurrency=4).run(plan, runner))
+        self.assertEqual(log, [('start', 'open-notepad'), ('end', 'open-notepad'),
+                               ('start', 'open-calculator'), ('end', 'open-calculator'),
+                               ('start', 'check-battery'), ('end', 'check-battery')])
+        # A failed step doesn't stop the ones after it
+        self.assertEqual([r[1] for r in results], [False, True, True])
+
+    def test_dependent_steps_keep_order(self):
+        log = []
+        plan = [
+            {'tool': 'say', 'depends_on': [1]},
+            {'tool': 'check-weather'},
+        ]
+        runner = make_runner({'check-weather': 0.05, 'say': 0.01}, log=log)
+        results = asyncio.run(PlanExecutor().run(plan, runner))
+        self.assertLess(log.index(('end', 'check-weather')), log.index(('start', 'say')))
+        self.assertEqual(results, [('Executed say', True), ('Executed check-weather', True)])
+
+    def test_failed_dependency_skips_dependents(self):
+        log = []
+        plan = [
+            {'tool': 'check-weather'},
+            {'tool': 'say', 'depends_on': [0]},
+            {'tool': 'check-battery'},
+        ]
+        results = asyncio.run(PlanExecutor().run(plan, make_runner(failures={'check-weather'}, log=log)))
+        self.assertEqual(results[1], ('Skipped say: dependency check-weather did not succeed', False))
+        self.assertTrue(results[2][1])
+        self.assertNotIn(('start', 'say'), log)
+
+    def test_concurrency_is_bounded(self):
+        running, peak = [0], [0]
+
+        async def run_step(step):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.02)
+            running[0] -= 1
+            return 'ok', True
+
+        plan = [{'tool': f'tool-{i}', 'depends_on': []} for i in range(6)]
+        asyncio.run(PlanExecutor(max_concurrency=2).run(plan, run_step))
+        self.assertEqual(peak[0], 2)
+
+    def test_exclusive_steps_do_not_overlap(self):
+        log = []
+        plan = [{'id': 'a', 'tool': 'shutdown-a'}, {'tool': 'shutdown-b'}, {'tool': 'check-battery'}]
+        asyncio.run(PlanExecutor().run(
+            plan, make_runner(log=log), is_exclusive=lambda step: step['tool'].startswith('shutdown')
+        ))
+        a_end, b_start = log.index(('end', 'shutdown-a')), log.index(('start', 'shutdown-b'))
+        self.assertLess(a_end, b_start)
+        self.assertLess(log.index(('start', 'check-battery')), a_end)
+
+    def test_concurrency_from_environment(self):
+        os.environ['TALK2WINDOWS_PLAN_CONCURRENCY'] = '3'
+        self.addCleanup(os.environ.pop, 'TALK2WINDOWS_PLAN_CONCURRENCY')
+        self.assertEqual(PlanExecutor().max_concurrency, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
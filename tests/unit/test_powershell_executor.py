@@ -71,6 +71,24 @@ class TestPowerShellExecutor(unittest.TestCase):
         self.assertEqual(stdout, "")
         self.assertEqual(stderr, "Executor failed: Some error")
 
+    @patch('subprocess.run')
+    def test_resolved_path_is_passed_to_wrapper(self, mock_subprocess):
+        mock_subprocess.return_value = MagicMock(stdout='{"exit_code": 0, "stdout": "", "stderr": ""}', stderr='', returncode=0)
+        path_map = MagicMock()
+        path_map.resolve.return_value = 'C:\\scripts\\open-calculator.ps1'
+        executor = PowerShellExecutor(path_map=path_map)
+        executor.run("open-calculator", {})
+        command = mock_subprocess.call_args[0][0]
+        self.assertEqual(command[command.index("-ScriptPath") + 1], 'C:\\scripts\\open-calculator.ps1')
+
+    @patch('subprocess.run')
+    def test_unknown_script_fails_without_spawning(self, mock_subprocess):
+        path_map = MagicMock()
+        path_map.resolve.return_value = None
+        exit_code, _, stderr = PowerShellExecutor(path_map=path_map).run("no-such-script", {})
+        self.assertEqual((exit_code, stderr), (-1, "Script not found: no-such-script"))
+        mock_subprocess.assert_not_called()
+
     def test_invalid_tool_name_raises(self):
         with self.assertRaises(ValueError):
             self.executor.run("../bad", {})
@@ -0,0 +1,78 @@
+import json
+import unittest
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.execution.powershell_pool import PooledPowerShellExecutor
+
+STUB_HOST = [sys.executable, os.path.join(os.path.dirname(__file__), 'stub_ps_host.py')]
+
+
+class TestPooledPowerShellExecutor(unittest.TestCase):
+    def _pool(self, **kwargs):
+        kwargs.setdefault('size', 1)
+        kwargs.setdefault('max_uses', 100)
+        pool = PooledPowerShellExecutor(host_command=STUB_HOST, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def _run(self, pool, script, args=None):
+        exit_code, stdout, stderr = pool.run(script, args or {})
+        return exit_code, (json.loads(stdout) if stdout else None), stderr
+
+    def test_hosts_are_reused_and_args_keep_types(self):
+        pool = self._pool()
+        _, first, _ = self._run(pool, 'what-is-the-time')
+        exit_code, second, _ = self._run(pool, 'open-app-by-name', {'AppName': 'a,b=c', 'Count': 2})
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(first['pid'], second['pid'])
+        self.assertEqual(second['args'], {'AppName': 'a,b=c', 'Count': 2})
+        self.assertEqual(pool.stats['started'], 1)
+
+    def test_max_uses_recycles_host(self):
+        pool = self._pool(max_uses=2)
+        pids = [self._run(pool, 'echo')[1]['pid'] for _ in range(3)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(pool.stats['recycled'], 1)
+
+    def test_timeout_replaces_host(self):
+        pool = self._pool(timeout_seconds=0.3)
+        _, before, _ = self._run(pool, 'echo')
+        self.assertEqual(pool.run('sleep', {'Seconds': 5}), (-1, "", "Executor timed out"))
+        _, after, _ = self._run(pool, 'echo')
+        self.assertNotEqual(before['pid'], after['pid'])
+
+    def test_crash_is_reported_and_recovered(self):
+        pool = self._pool()
+        exit_code, _, stderr = pool.run('crash', {})
+        self.assertEqual(exit_code, -1)
+        self.assertIn('host exited', stderr)
+        self.assertEqual(self._run(pool, 'echo')[0], 0)
+        self.assertEqual(pool.stats['crashed'], 1)
+
+    def test_stray_output_and_script_failure(self):
+        pool = self._pool()
+        self.assertEqual(self._run(pool, 'noisy')[0], 0)
+        exit_code, _, stderr = self._run(pool, 'fail')
+        self.assertEqual((exit_code, stderr), (2, 'failed on purpose'))
+
+    def test_concurrent_requests_bounded_by_size(self):
+        pool = self._pool(size=2)
+        with ThreadPoolExecutor(max_workers=4) as threads:
+            results = list(threads.map(lambda _: self._run(pool, 'echo'), range(8)))
+        self.assertTrue(all(code == 0 for code, _, _ in results))
+        self.assertLessEqual(len({out['pid'] for _, out, _ in results}), 2)
+
+    def test_missing_host_binary(self):
+        pool = PooledPowerShellExecutor(host_command=['/nonexistent/pwsh'])
+        exit_code, _, stderr = pool.run('echo', {})
+        self.assertEqual(exit_code, -1)
+        self.assertIn('could not start PowerShell host', stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.query_normalizer import QueryNormalizer, phonetic_key
+from src.agent.core.semantic_index import SemanticIndex
+
+VOCABULARY = {
+    'open': 40, 'close': 12, 'calculator': 3, 'notepad': 2, 'note': 4, 'pad': 1, 'bluetooth': 2,
+    'weather': 5, 'check': 9, 'the': 30, 'task': 3, 'manager': 3, 'chrome': 2, 'on': 8, 'turn': 4,
+    'whats': 1, 'what': 6, 'grok': 1, 'enable': 2, 'launch': 3, 'run': 5, 'start': 4, 'exit': 1,
+}
+
+
+class TestQueryNormalizer(unittest.TestCase):
+    def setUp(self):
+        self.normalizer = QueryNormalizer(VOCABULARY)
+
+    def test_phonetic_keys(self):
+        self.assertEqual(phonetic_key('whether'), phonetic_key('weather'))
+        self.assertEqual(phonetic_key('calclater'), phonetic_key('calculator'))
+        self.assertEqual(phonetic_key('grock'), phonetic_key('grok'))
+        self.assertNotEqual(phonetic_key('chrome'), phonetic_key('close'))
+
+    def test_split_and_merged_words(self):
+        self.assertEqual(self.normalizer.normalize('open note pad'), 'open notepad')
+        self.assertEqual(self.normalizer.normalize('turn on blue tooth'), 'turn on bluetooth')
+        self.assertEqual(self.normalizer.normalize('open calc later'), 'open calculator')
+        self.assertEqual(self.normalizer.normalize('open taskmanager'), 'open task manager')
+
+    def test_homophones_and_synonyms(self):
+        self.assertEqual(self.normalizer.normalize('check the whether'), 'check the weather')
+        self.assertEqual(self.normalizer.normalize('terminate chrome'), 'close chrome')
+        self.assertEqual(self.normalizer.normalize('open grock'), 'open grok')
+
+    def test_indexed_synonyms_are_still_mapped(self):
+        self.assertEqual(self.normalizer.normalize('run calculator'), 'open calculator')
+        self.assertEqual(self.normalizer.normalize('launch notepad'), 'open notepad')
+        self.assertEqual(self.normalizer.normalize('exit chrome'), 'close chrome')
+
+    def test_synonyms_in_script_ids_or_mid_query_are_kept(self):
+        self.assertEqual(self.normalizer.normalize('open start settings'), 'open start settings')
+        normalizer = QueryNormalizer(VOCABULARY, id_words={'open', 'start', 'settings'})
+        self.assertEqual(normalizer.normalize('start calculator'), 'start calculator')
+        self.assertEqual(normalizer.normalize('launch calculator'), 'open calculator')
+
+    def test_matchable_queries_are_left_alone(self):
+        for query in ("what's the weather", 'Open Calculator', 'open calc', 'open xyz'):
+            self.assertEqual(self.normalizer.normalize(query), query)
+        self.assertEqual(self.normalizer.stats()['rewritten'], 0)
+
+
+class TestSemanticIndexNormalization(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scripts_dir = os.path.join(self.tmp.name, 'scripts')
+        os.makedirs(self.scripts_dir)
+        for name, synopsis in (('open-notepad.ps1', 'Launches Notepad'),
+                               ('open-bluetooth-settings.ps1', 'Opens the Bluetooth settings'),
+                               ('check-weather.ps1', 'Checks the weather'),
+                               ('open-calculator.ps1', 'Launch or run the calculator')):
+            with open(os.path.join(self.scripts_dir, name), 'w', encoding='utf-8') as f:
+                f.write(f"<#\n.SYNOPSIS\n\t{synopsis}.\n#>\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _search(self, query, normalize):
+        index = SemanticIndex(scripts_dir=self.scripts_dir, index_file=os.path.join(self.tmp.name, 'index.json'),
+                              retriever='keyword', normalize=normalize)
+        return [result['id'] for result in index.search(query, max_results=1)]
+
+    def test_search_repairs_transcripts(self):
+        self.assertEqual(self._search('whether', False), [])
+        self.assertEqual(self._search('whether', True), ['check-weather'])
+        self.assertEqual(self._search('blue tooth settings', True), ['open-bluetooth-settings'])
+        # Reopened from the binary index, the vocabulary comes from its term table
+        self.assertEqual(self._search('open note pad', True), ['open-notepad'])
+
+    def test_search_maps_indexed_synonyms(self):
+        index = SemanticIndex(scripts_dir=self.scripts_dir, index_file=os.path.join(self.tmp.name, 'index.json'),
+                              retriever='keyword')
+        # The calculator synopsis indexes "launch" and "run" as words of their own
+        self.assertIn('launch', index.normalizer.vocabulary)
+        self.assertIn('run', index.normalizer.vocabulary)
+        self.assertEqual(index.normalizer.normalize('launch notepad'), 'open notepad')
+        self.assertEqual(index.normalizer.normalize('run calculator'), 'open calculator')
+
+
+class TestRealIndexNormalization(unittest.TestCase):
+    """Synonym mapping against the repo's own scripts."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.index = SemanticIndex(index_file=os.path.join(cls.tmp.name, 'semantic_index.json'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def _top(self, query):
+        return self.index.search(query, max_results=1)[0]['id']
+
+    def test_script_id_words_are_not_rewritten(self):
+        self.assertEqual(self.index.normalizer.normalize('open start settings'), 'open start settings')
+        for query, script_id in (('open start settings', 'open-start-settings'),
+                                 ('open start page', 'open-start-page'),
+                                 ('open auto start folder', 'open-auto-start-folder')):
+            # "start" may be joined with its neighbour, but never becomes "open"
+            self.assertEqual(self.index.normalizer.normalize(query).split().count('open'), 1)
+            self.assertEqual(self._top(query), script_id)
+
+    def test_leading_verb_variants_still_map(self):
+        self.assertEqual(self.index.normalizer.normalize('launch calculator'), 'open calculator')
+        self.assertEqual(self._top('launch calculator'), 'open-calculator')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.utils import tracing
+from tests.benchmarks import replay
+from tests.benchmarks.fakes import FakeExecutor, FakeModelFactory
+
+
+class TestFakes(unittest.TestCase):
+    def test_model_answers_with_the_expected_tool_when_offered(self):
+        factory = FakeModelFactory({'Open Calculator': 'open-calculator'})
+        model = factory([{'name': 'close-calculator'}, {'name': 'open-calculator'}])
+        call = model.generate_content('open calculator').candidates[0].content.parts[0].function_call
+        self.assertEqual(call.name, 'open-calculator')
+        other = factory([{'name': 'check-weather'}]).generate_content('open calculator')
+        self.assertEqual(other.candidates[0].content.parts[0].function_call.name, 'check-weather')
+        self.assertEqual(factory.stats(), {'models': 2, 'calls': 2})
+
+    def test_failures_are_deterministic(self):
+        def failures(seed):
+            executor = FakeExecutor(failure_rate=0.3, seed=seed)
+            return [executor.run('x')[0] for _ in range(50)]
+        self.assertEqual(failures(1), failures(1))
+        self.assertIn(1, failures(1))
+
+
+class TestReplay(unittest.TestCase):
+    def tearDown(self):
+        tracing.configure([])
+        logging.disable(logging.NOTSET)
+
+    def test_corpus_formats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('2026-01-01 - agent - INFO - [ab12] Transcript: open notepad\n'
+                        '2026-01-01 - agent - INFO - Fast path: local open-notepad\n'
+                        '{"transcript": "check weather", "tool": "check-weather"}\n'
+                        '# comment\n'
+                        'lock the computer\n')
+            self.assertEqual(replay.load_corpus(path), [
+                ('open notepad', None), ('check weather', 'check-weather'), ('lock the computer', None),
+            ])
+
+    def test_replay_reports_stages_and_outcomes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'report.json')
+            with redirect_stdout(io.StringIO()):
+                result = replay.main([
+                    '--requests', '20', '--concurrency', '4', '--model-latency', '1', '--model-jitter', '0',
+                    '--exec-latency', '1', '--exec-jitter', '0', '--exec-failure-rate', '0.5', '--json', out,
+                ])
+            with open(out, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['requests'], 20)
+        self.assertEqual(sum(result['outcomes'].values()), 20)
+        self.assertGreater(result['outcomes']['failed'], 0)
+        self.assertEqual(result['executor_calls'], 20)
+        self.assertEqual(result['stages']['transcript']['count'], 20)
+        self.assertIn('execute', result['stages'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import tempfile
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.result_cache import ResultCache, normalize_transcript
+
+
+class TestNormalizeTranscript(unittest.TestCase):
+    def test_strips_case_punctuation_and_fillers(self):
+        self.assertEqual(normalize_transcript("What time is it?"), "what time is it")
+        self.assertEqual(normalize_transcript("Please, open the Calculator now!"), "open the calculator")
+        self.assertEqual(normalize_transcript("Can you open blackbox.ai"), "open blackbox.ai")
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'result_cache.json')
+        self.catalog = os.path.join(self.tmp.name, 'tools.json')
+        self._write_catalog('{"tools": []}')
+        self.now = 1000.0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_catalog(self, content):
+        with open(self.catalog, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def _cache(self, **kwargs):
+        kwargs.setdefault('fuzzy_threshold', 0)
+        return ResultCache(path=self.path, catalog_path=self.catalog, clock=lambda: self.now, **kwargs)
+
+    def test_hit_after_put_and_persisted(self):
+        cache = self._cache()
+        self.assertIsNone(cache.get('what time is it'))
+        cache.put('What time is it?', 'check-time', {})
+        hit = self._cache().get('what time is it please')
+        self.assertEqual((hit['tool'], hit['args']), ('check-time', {}))
+
+    def test_stats_report_hit_rate(self):
+        cache = self._cache()
+        cache.get('open calculator')
+        cache.put('open calculator', 'open-calculator', {})
+        cache.get('open calculator')
+        self.assertEqual(cache.stats()['hit_rate'], 0.5)
+
+    def test_catalog_change_invalidates(self):
+        self._cache().put('open calculator', 'open-calculator', {})
+        self._write_catalog('{"tools": [{"name": "open-calculator"}]}')
+        self.assertIsNone(self._cache().get('open calculator'))
+
+    def test_ttl_and_lru(self):
+        cache = self._cache(max_size=2, ttl=60)
+        cache.put('a', 'tool-a', {})
+        cache.put('b', 'tool-b', {})
+        cache.get('a')
+        cache.put('c', 'tool-c', {})
+        self.assertIsNone(cache.get('b'))
+        self.now += 61
+        self.assertIsNone(cache.get('a'))
+
+    def test_fuzzy_match_is_opt_in(self):
+        self._cache().put('open the calculator', 'open-calculator', {})
+        self.assertIsNone(self._cache().get('open the calculater'))
+        hit = self._cache(fuzzy_threshold=0.9).get('open the calculater')
+        self.assertTrue(hit['fuzzy'])
+        self.assertEqual(hit['key'], 'open the calculator')
+
+
+if __name__ == '__main__':
+    unittest.main()
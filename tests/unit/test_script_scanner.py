@@ -0,0 +1,114 @@
+import unittest
+import tempfile
+import os
+import json
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.script_scanner import ScriptPathMap, ScriptScanner, extract_synopsis
+from src.agent.core.semantic_index import SemanticIndex
+from src.agent.core.tool_catalog_manager import ToolCatalogManager
+
+HELP_THEN_YAML = """<#
+.SYNOPSIS
+\tOpens the calculator
+.DESCRIPTION
+\tLaunches calc.
+#>
+
+<#
+id: open-calculator
+name: Open Calculator
+description: Launches the Windows Calculator application
+category: utility
+risk_level: low
+side_effects: Launches a new application window
+parameters: []
+examples:
+- description: Open the calculator application
+  args: {}
+#>
+Start-Process ms-calculator:
+"""
+
+
+class TestScriptScanner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scripts_dir = os.path.join(self.tmp.name, 'scripts')
+        os.makedirs(os.path.join(self.scripts_dir, 'apps', 'open'))
+        self._write('apps/open/open-calculator.ps1', HELP_THEN_YAML.encode('utf-8'))
+        # ANSI-encoded help text, as saved by Windows PowerShell ISE
+        self._write('insert-euro-sign.ps1', '<#\n.SYNOPSIS\n\tInserts the € sign.\n#>\n'.encode('cp1252'))
+        self._write('_internal.ps1', b'# not indexed\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rel_path, data):
+        with open(os.path.join(self.scripts_dir, rel_path), 'wb') as f:
+            f.write(data)
+
+    def test_walk_is_sorted_and_skips_internal(self):
+        paths = [rel for rel, _ in ScriptScanner(self.scripts_dir).iter_files()]
+        self.assertEqual(paths, ['insert-euro-sign.ps1', 'apps/open/open-calculator.ps1'])
+
+    def test_yaml_header_found_after_help_block(self):
+        records = {r['id']: r for r in ScriptScanner(self.scripts_dir).scan()}
+        calculator = records['open-calculator']
+        self.assertEqual(calculator['metadata']['name'], 'Open Calculator')
+        self.assertEqual(calculator['synopsis'], 'Opens the calculator')
+        self.assertEqual(len(calculator['hash']), 64)
+        self.assertEqual(records['insert-euro-sign']['synopsis'], 'Inserts the € sign')
+
+    def test_extract_synopsis_without_help(self):
+        self.assertIsNone(extract_synopsis('Write-Output "hi"'))
+
+    def test_catalog_and_index_share_records(self):
+        records = ScriptScanner(self.scripts_dir).scan()
+        catalog_path = os.path.join(self.tmp.name, 'tools.json')
+        manager = ToolCatalogManager(scripts_dir=self.scripts_dir, catalog_path=catalog_path)
+        catalog = manager.generate_catalog(records=records)
+        index = SemanticIndex(
+            scripts_dir=self.scripts_dir,
+            index_file=os.path.join(self.tmp.name, 'semantic_index.json'),
+            records=records,
+        )
+        self.assertEqual([tool['name'] for tool in catalog['tools']], ['open-calculator'])
+        with open(catalog_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), catalog)
+        entry = index.index['scripts']['open-calculator']
+        self.assertTrue(entry['has_metadata'])
+        self.assertEqual(entry['category'], 'utility')
+        self.assertIn('Open the calculator application', entry['keywords'])
+        self.assertIn('insert-euro-sign', index.index['scripts'])
+
+
+    def test_path_map_resolves_and_rebuilds_on_miss(self):
+        path_map = ScriptPathMap(self.scripts_dir, min_rebuild_interval=0)
+        self.assertEqual(
+            path_map.resolve('open-calculator'),
+            os.path.abspath(os.path.join(self.scripts_dir, 'apps', 'open', 'open-calculator.ps1')),
+        )
+        self.assertIsNone(path_map.resolve('check-weather'))
+        self._write('apps/check-weather.ps1', b'# new\n')
+        self.assertTrue(path_map.resolve('check-weather').endswith('check-weather.ps1'))
+
+    def test_duplicate_ids_detected_at_build(self):
+        self._write('apps/open-calculator.ps1', HELP_THEN_YAML.encode('utf-8'))
+        path_map = ScriptPathMap(self.scripts_dir)
+        with self.assertLogs('src.agent.core.script_scanner', level='WARNING'):
+            path_map.build()
+        self.assertEqual(
+            path_map.duplicates,
+            {'open-calculator': ['apps/open-calculator.ps1', 'apps/open/open-calculator.ps1']},
+        )
+        manager = ToolCatalogManager(scripts_dir=self.scripts_dir, catalog_path=os.path.join(self.tmp.name, 'tools.json'))
+        with self.assertLogs('src.agent.core.tool_catalog_manager', level='WARNING'):
+            catalog = manager.generate_catalog()
+        self.assertEqual([tool['name'] for tool in catalog['tools']], ['open-calculator'])
+
+
+if __name__ == '__main__':
+    unittest.main()
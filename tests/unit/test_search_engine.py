@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.search_engine import InvertedIndex, tokenize
+
+
+def _entry(script_id, description, keywords=None):
+    return {
+        'id': script_id,
+        'name': script_id.replace('-', ' '),
+        'description': description,
+        'category': 'general',
+        'keywords': keywords or [script_id.replace('-', ' ')],
+        'risk_level': 'low',
+    }
+
+
+class TestInvertedIndex(unittest.TestCase):
+    def setUp(self):
+        self.engine = InvertedIndex.from_scripts({
+            'open-calculator': _entry('open-calculator', 'Launches the calculator'),
+            'close-calculator': _entry('close-calculator', 'Closes the calculator'),
+            'what-is-the-time': _entry('what-is-the-time', 'Speaks the current time'),
+            'check-weather': _entry('check-weather', 'Reports the weather forecast'),
+        })
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("What's the TIME, now?"), ['what', 's', 'the', 'time', 'now'])
+
+    def test_best_match_first(self):
+        results = self.engine.search('open calculator', max_results=5)
+        self.assertEqual(results[0][0], 'open-calculator')
+        self.assertIn('close-calculator', [doc_id for doc_id, _ in results])
+
+    def test_only_candidates_from_postings(self):
+        results = self.engine.search('weather')
+        self.assertEqual([doc_id for doc_id, _ in results], ['check-weather'])
+
+    def test_prefix_expansion(self):
+        results = self.engine.search('calc')
+        self.assertEqual(
+            sorted(doc_id for doc_id, _ in results),
+            ['close-calculator', 'open-calculator'],
+        )
+
+    def test_max_results_and_no_match(self):
+        self.assertEqual(len(self.engine.search('the', max_results=2)), 2)
+        self.assertEqual(self.engine.search('bluetooth'), [])
+        self.assertEqual(self.engine.search(''), [])
+
+    def test_example_dicts_in_keywords(self):
+        engine = InvertedIndex.from_scripts({
+            'check-battery': _entry(
+                'check-battery', 'Checks power', [{'description': 'how much juice is left', 'args': {}}]
+            ),
+        })
+        self.assertEqual(engine.search('juice')[0][0], 'check-battery')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import tempfile
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.semantic_index import SemanticIndex
+
+
+class TestSemanticIndexRefresh(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scripts_dir = os.path.join(self.tmp.name, 'scripts')
+        self.index_file = os.path.join(self.tmp.name, 'semantic_index.json')
+        os.makedirs(os.path.join(self.scripts_dir, 'apps', 'open'))
+        self._write('apps/open/open-calculator.ps1', 'Opens the calculator')
+        self._write('check-battery.ps1', 'Checks the battery')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rel_path, synopsis):
+        path = os.path.join(self.scripts_dir, rel_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"<#\n.SYNOPSIS\n\t{synopsis}.\n#>\n")
+        return path
+
+    def _index(self):
+        return SemanticIndex(scripts_dir=self.scripts_dir, index_file=self.index_file)
+
+    def test_cold_build_records_manifest(self):
+        index = self._index()
+        self.assertEqual(set(index.index['scripts']), {'open-calculator', 'check-battery'})
+        record = index.index['files']['apps/open/open-calculator.ps1']
+        self.assertEqual(record['id'], 'open-calculator')
+        self.assertEqual(len(record['hash']), 64)
+
+    def test_unchanged_tree_is_not_reextracted(self):
+        self._index()
+        index = self._index()
+        self.assertEqual(index.refresh(), {'added': 0, 'changed': 0, 'removed': 0})
+
+    def test_added_changed_removed(self):
+        index = self._index()
+        self.assertEqual(index.search('weather'), [])
+
+        self._write('apps/open/check-weather.ps1', 'Checks the weather')
+        changed = self._write('check-battery.ps1', 'Reports remaining power')
+        os.utime(changed, ns=(1, 1))
+        os.remove(os.path.join(self.scripts_dir, 'apps', 'open', 'open-calculator.ps1'))
+
+        index = self._index()
+        self.assertEqual(index.search('weather')[0]['id'], 'check-weather')
+        self.assertEqual(index.index['scripts']['check-battery']['description'], 'Reports remaining power')
+        self.assertNotIn('open-calculator', index.index['scripts'])
+        self.assertNotIn('calculator', index.index['keywords'])
+        self.assertEqual(index.search('calculator'), [])
+
+    def test_script_ids_from_built_and_mapped_index(self):
+        self.assertEqual(sorted(self._index().script_ids()), ['check-battery', 'open-calculator'])
+        reopened = self._index()
+        self.assertEqual(sorted(reopened.script_ids()), ['check-battery', 'open-calculator'])
+        self.assertIsNone(reopened._index)
+
+    def test_refresh_patches_built_engine(self):
+        index = self._index()
+        self.assertEqual(index.search('weather'), [])
+        self._write('check-weather.ps1', 'Checks the weather')
+        counts = index.refresh()
+        self.assertEqual(counts['added'], 1)
+        self.assertEqual(index.search('weather')[0]['id'], 'check-weather')
+
+
+if __name__ == '__main__':
+    unittest.main()
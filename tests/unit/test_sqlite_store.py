@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.memory.sqlite_store import SQLiteMemoryStore
+from src.agent.memory.store import create_memory_store
+
+DAY = 86400
+
+
+class FakeClock:
+    def __init__(self, now=100 * DAY):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestSQLiteMemoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'memory.db')
+        self.clock = FakeClock()
+
+    def _store(self, **kwargs):
+        kwargs.setdefault('retention_days', 0)
+        store = SQLiteMemoryStore(self.path, clock=self.clock, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_same_api_as_json_store(self):
+        store = self._store(keep_last=2)
+        store.save('config', {'a': 1})
+        store.append_action({'tool': 'open-notepad', 'args': {}, 'result': 'ok'})
+        store.append_actions([
+            {'tool': 'set-volume', 'args': {'Level': 40}, 'result': 'ok'},
+            {'tool': 'open-calculator', 'args': {}, 'result': 'ok'},
+        ])
+        self.assertEqual(store.load('config'), {'a': 1})
+        self.assertIsNone(store.load('missing'))
+        self.assertEqual([a['tool'] for a in store.recent_actions], ['set-volume', 'open-calculator'])
+        self.assertEqual(store.recent_actions[0]['args'], {'Level': 40})
+        self.assertEqual(store.count_actions(), 3)
+        store.set_passphrase('secret')
+        self.assertEqual(len(self._store().get_passphrase_hash()), 64)
+
+    def test_wal_mode(self):
+        store = self._store()
+        self.assertEqual(store._conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+    def test_queries(self):
+        store = self._store()
+        for day, tool in [(1, 'open-notepad'), (95, 'open-notepad'), (96, 'check-battery'),
+                          (97, 'open-notepad'), (98, 'check-battery'), (99, 'lock-computer')]:
+            self.clock.now = day * DAY
+            store.append_action({'tool': tool, 'args': {'day': day}, 'result': 'ok'})
+        self.assertEqual([a['args']['day'] for a in store.last_runs('open-notepad', limit=2)], [97, 95])
+        self.assertEqual(store.last_action()['tool'], 'lock-computer')
+        self.assertEqual(store.last_action('check-battery')['args'], {'day': 98})
+        self.assertEqual(store.most_used_tools(), [
+            {'tool': 'check-battery', 'runs': 2},
+            {'tool': 'open-notepad', 'runs': 2},
+            {'tool': 'lock-computer', 'runs': 1},
+        ])
+        self.assertEqual(store.most_used_tools(since=0, limit=1), [{'tool': 'open-notepad', 'runs': 3}])
+
+    def test_queries_use_indexes(self):
+        store = self._store()
+        plan = ' '.join(row[-1] for row in store._conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM actions WHERE tool = ? ORDER BY ts DESC', ('x',)))
+        self.assertIn('idx_actions_tool_ts', plan)
+
+    def test_time_based_pruning(self):
+        store = self._store()
+        self.clock.now = 10 * DAY
+        store.append_action({'tool': 'old', 'args': {}})
+        self.clock.now = 100 * DAY
+        store.append_action({'tool': 'new', 'args': {}})
+        self.assertEqual(store.prune(older_than_days=30), 1)
+        self.assertEqual([a['tool'] for a in store.recent_actions], ['new'])
+        # Retention from the environment is applied on open
+        self.clock.now = 200 * DAY
+        with patch.dict(os.environ, {'TALK2WINDOWS_MEMORY_RETENTION_DAYS': '30'}):
+            reopened = SQLiteMemoryStore(self.path, clock=self.clock)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.count_actions(), 0)
+
+    def test_save_recent_actions_replaces_history(self):
+        store = self._store()
+        store.append_action({'tool': 'a', 'args': {}})
+        store.save('recent_actions', [{'tool': 'b', 'args': {}}])
+        self.assertEqual([a['tool'] for a in store.load('recent_actions')], ['b'])
+
+    def test_backend_selection(self):
+        with patch.dict(os.environ, {'TALK2WINDOWS_MEMORY_BACKEND': 'sqlite'}), \
+                patch('src.agent.memory.sqlite_store.SQLiteMemoryStore') as sqlite_store:
+            self.assertIs(create_memory_store(), sqlite_store.return_value)
+        with patch.dict(os.environ, {'TALK2WINDOWS_MEMORY_BACKEND': 'json'}), \
+                patch('src.agent.memory.store.MemoryStore') as json_store:
+            self.assertIs(create_memory_store(), json_store.return_value)
+        with patch.dict(os.environ, {'TALK2WINDOWS_MEMORY_BACKEND': 'redis'}):
+            with self.assertRaises(ValueError):
+                create_memory_store()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.execution.powershell_executor import PowerShellExecutor
+from src.agent.integration.command_queue import CommandQueue
+from src.agent.utils import tracing
+
+
+class ListSink:
+    def __init__(self):
+        self.spans = []
+
+    def emit(self, span):
+        self.spans.append(span)
+
+
+class TracingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.sink = ListSink()
+        tracing.configure([self.sink])
+
+    def tearDown(self):
+        tracing.configure([])
+
+    def stages(self):
+        return [span['stage'] for span in self.sink.spans]
+
+
+class TestSpans(TracingTestCase):
+    def test_request_ids_nest_and_reset(self):
+        self.assertIsNone(tracing.current_request_id())
+        with tracing.request('outer') as outer:
+            self.assertEqual(outer, 'outer')
+            # Without an explicit id the current one is kept
+            with tracing.request() as inner:
+                self.assertEqual(inner, 'outer')
+            with tracing.request('other'):
+                self.assertEqual(tracing.current_request_id(), 'other')
+            self.assertEqual(tracing.current_request_id(), 'outer')
+        self.assertIsNone(tracing.current_request_id())
+        with tracing.request() as generated:
+            self.assertTrue(generated)
+
+    def test_span_records_duration_attributes_and_errors(self):
+        with tracing.request('r1'):
+            with tracing.span('fast_path') as span:
+                span['hit'] = True
+            with self.assertRaises(ValueError):
+                with tracing.span('gemini'):
+                    raise ValueError('quota')
+        ok, failed = self.sink.spans
+        self.assertEqual((ok['stage'], ok['request_id'], ok['hit'], ok['status']), ('fast_path', 'r1', True, 'ok'))
+        self.assertGreaterEqual(ok['ms'], 0)
+        self.assertEqual((failed['stage'], failed['status']), ('gemini', 'error'))
+
+    def test_failing_sink_does_not_break_the_pipeline(self):
+        broken = MagicMock()
+        broken.emit.side_effect = OSError('disk full')
+        tracing.configure([broken, self.sink])
+        tracing.record('execute', 5.0)
+        self.assertEqual(self.stages(), ['execute'])
+
+    def test_configure_from_env_rejects_unknown_sinks(self):
+        tracing._configured = False
+        with patch.dict(os.environ, {'TALK2WINDOWS_TRACE_SINKS': 'log,statsd'}):
+            with self.assertRaises(ValueError):
+                tracing.configure_from_env()
+
+
+class TestSinks(TracingTestCase):
+    def test_jsonl_sink_and_summary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'spans.jsonl')
+            tracing.configure([tracing.JsonlSink(path)])
+            with tracing.request('abc'):
+                for ms in range(1, 101):
+                    tracing.record('gemini', float(ms))
+                tracing.record('execute', 7.0)
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write('{"torn')
+
+            summary = tracing.summarize(tracing.load_spans(path))
+            self.assertEqual(summary['gemini']['count'], 100)
+            self.assertEqual(
+                [summary['gemini'][k] for k in ('p50', 'p95', 'p99', 'max')], [50.0, 95.0, 99.0, 100.0]
+            )
+            self.assertEqual(summary['execute']['p99'], 7.0)
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                tracing.main([path])
+            lines = output.getvalue().splitlines()
+            self.assertTrue(lines[1].startswith('gemini'))
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                tracing.main([path, '--request', 'abc'])
+            self.assertEqual(len(output.getvalue().splitlines()), 101)
+
+    def test_prometheus_histogram_is_served(self):
+        sink = tracing.PrometheusSink(buckets=(0.01, 0.1))
+        tracing.configure([sink])
+        tracing.record('execute', 5.0)
+        tracing.record('execute', 50.0)
+        tracing.record('execute', 500.0)
+        server = sink.serve(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+        finally:
+            server.shutdown()
+            server.server_close()
+        name = 'talk2windows_stage_duration_seconds'
+        self.assertIn(f'{name}_bucket{{stage="execute",le="0.01"}} 1', body)
+        self.assertIn(f'{name}_bucket{{stage="execute",le="0.1"}} 2', body)
+        self.assertIn(f'{name}_bucket{{stage="execute",le="+Inf"}} 3', body)
+        self.assertIn(f'{name}_count{{stage="execute"}} 3', body)
+
+
+class TestPropagation(TracingTestCase):
+    def test_command_queue_runs_handler_under_request_id(self):
+        seen = []
+
+        async def handler(transcript):
+            seen.append((transcript, tracing.current_request_id()))
+
+        async def scenario():
+            queue = CommandQueue(handler, dedupe_window=0)
+            queue.start()
+            queue.submit('open calculator', request_id='listener-1')
+            queue.submit('check battery')
+            await queue.join()
+            await queue.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(seen[0], ('open calculator', 'listener-1'))
+        self.assertTrue(seen[1][1] and seen[1][1] != 'listener-1')
+        waits = [span for span in self.sink.spans if span['stage'] == 'queue_wait']
+        self.assertEqual([span['request_id'] for span in waits], [seen[0][1], seen[1][1]])
+
+    @patch('subprocess.run')
+    def test_executor_passes_request_id_and_splits_script_time(self, mock_run):
+        mock_run.return_value = MagicMock(
+            stdout='{"exit_code": 0, "stdout": "ok", "stderr": "", "duration_ms": 0.5}',
+            stderr='', returncode=0,
+        )
+        with tracing.request('req-7'):
+            PowerShellExecutor().run('what-is-the-time', {})
+        self.assertEqual(mock_run.call_args.kwargs['env']['TALK2WINDOWS_REQUEST_ID'], 'req-7')
+        self.assertEqual(self.stages(), ['powershell', 'json_decode', 'script', 'powershell_overhead'])
+        self.assertTrue(all(span['request_id'] == 'req-7' for span in self.sink.spans))
+        self.assertEqual(self.sink.spans[2]['ms'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
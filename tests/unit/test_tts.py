@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.utils.tts import HIGH, LOW, NullSpeaker, PowerShellSpeaker, TTS, default_speaker
+
+STUB_HOST = [sys.executable, os.path.join(os.path.dirname(__file__), 'stub_speaker_host.py')]
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.005)
+
+
+class TestTTS(unittest.TestCase):
+    def _tts(self, delay=0.0, **kwargs):
+        speaker = NullSpeaker(delay=delay, echo=False)
+        tts = TTS(speaker=speaker, **kwargs)
+        self.addCleanup(tts.close, 0)
+        return tts, speaker
+
+    def test_say_returns_before_speech_finishes(self):
+        tts, speaker = self._tts(delay=0.5)
+        start = time.perf_counter()
+        tts.say('Completed plan: opened notepad')
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertTrue(tts.wait(2))
+        self.assertEqual(speaker.spoken, ['Completed plan: opened notepad'])
+
+    def test_priority_and_merging(self):
+        tts, speaker = self._tts(delay=0.1)
+        tts.say('first')
+        wait_until(lambda: speaker.spoken)
+        tts.say('low one', priority=LOW)
+        tts.say('result one')
+        tts.say('Proceed?', priority=HIGH)
+        tts.say('result two.')
+        tts.say('result three')
+        self.assertTrue(tts.wait(2))
+        self.assertEqual(speaker.spoken, ['first', 'Proceed?', 'result one. result two. result three', 'low one'])
+        self.assertEqual(tts.stats()['merged'], 2)
+
+    def test_merge_limit(self):
+        tts, speaker = self._tts(delay=0.05, merge_limit=20)
+        tts.say('busy')
+        wait_until(lambda: speaker.spoken)
+        tts.say('a' * 15)
+        tts.say('b' * 15)
+        self.assertTrue(tts.wait(2))
+        self.assertEqual(speaker.spoken[1:], ['a' * 15, 'b' * 15])
+
+    def test_barge_in_stops_speech_and_drops_queue(self):
+        tts, speaker = self._tts(delay=5)
+        tts.say('a very long summary')
+        wait_until(lambda: speaker.spoken)
+        tts.say('queued')
+        start = time.perf_counter()
+        tts.say('new command result', interrupt=True)
+        wait_until(lambda: speaker.spoken[-1] == 'new command result')
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertNotIn('queued', speaker.spoken)
+        tts.interrupt()
+        self.assertTrue(tts.wait(2))
+        stats = tts.stats()
+        self.assertEqual((stats['interrupted'], stats['dropped']), (2, 1))
+
+    def test_backend_selection(self):
+        with patch.dict(os.environ, {'TALK2WINDOWS_TTS_BACKEND': 'null'}):
+            self.assertIsInstance(default_speaker(), NullSpeaker)
+        with patch.dict(os.environ, {'TALK2WINDOWS_TTS_BACKEND': 'festival'}):
+            with self.assertRaises(ValueError):
+                default_speaker()
+        with patch.dict(os.environ, {'TALK2WINDOWS_DISABLE_TTS': '1'}):
+            os.environ.pop('TALK2WINDOWS_TTS_BACKEND', None)
+            self.assertIsInstance(default_speaker(), NullSpeaker)
+
+
+class TestPowerShellSpeaker(unittest.TestCase):
+    def test_persistent_host_speaks_and_stops(self):
+        speaker = PowerShellSpeaker(host_command=STUB_HOST)
+        tts = TTS(speaker=speaker)
+        self.addCleanup(tts.close, 0)
+        tts.say('hello')
+        self.assertTrue(tts.wait(5))
+        pid = speaker._process.pid
+        tts.say('a long sentence')
+        time.sleep(0.2)
+        start = time.perf_counter()
+        tts.interrupt()
+        self.assertTrue(tts.wait(2))
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(speaker._process.pid, pid)
+        self.assertEqual(tts.stats()['interrupted'], 1)
+
+    def test_missing_host_fails_softly(self):
+        speaker = PowerShellSpeaker(host_command=['/nonexistent/powershell'])
+        self.assertFalse(speaker.speak('hello'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core import vector_index
+from src.agent.core.semantic_index import SemanticIndex
+from src.agent.core.vector_index import VectorIndex, blend
+
+SCRIPTS = {
+    'open-calculator': {'name': 'Open Calculator', 'description': 'Launches the Windows Calculator',
+                        'keywords': ['open calculator']},
+    'close-chrome': {'name': 'Close Chrome', 'description': 'Closes the Google Chrome browser',
+                     'keywords': ['close chrome', 'kill chrome']},
+    'check-weather': {'name': 'Check Weather', 'description': 'Announces the current weather',
+                      'keywords': ['check weather']},
+    'what-is-the-time': {'name': 'What is the time', 'description': 'Tells the current time',
+                         'keywords': ['what time is it']},
+}
+
+
+class TestVectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = VectorIndex.from_scripts(SCRIPTS)
+
+    def test_shortened_words_match_through_char_ngrams(self):
+        self.assertEqual(self.index.search('launch calc', 2)[0][0], 'open-calculator')
+        self.assertEqual(self.index.search('kill browsers', 2)[0][0], 'close-chrome')
+
+    def test_unrelated_queries_return_nothing(self):
+        self.assertEqual(self.index.search('xylophone'), [])
+        self.assertEqual(self.index.search(''), [])
+
+    def test_scores_are_cosines(self):
+        score = self.index.search('check weather', 1)[0][1]
+        self.assertGreater(score, 0.5)
+        self.assertLessEqual(score, 1.0 + 1e-6)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'index.vec')
+            self.index.fingerprint = b'\x01' * 32
+            self.index.save(path)
+            loaded = VectorIndex.load(path)
+            self.assertEqual(loaded.fingerprint, b'\x01' * 32)
+            for query in ('launch calc', 'what time is it', 'weather'):
+                expected = self.index.search(query)
+                actual = loaded.search(query)
+                self.assertEqual([d for d, _ in actual], [d for d, _ in expected])
+                for (_, a), (_, b) in zip(actual, expected):
+                    self.assertAlmostEqual(a, b, places=5)
+
+            with open(path, 'r+b') as f:
+                f.truncate(os.path.getsize(path) - 4)
+            with self.assertRaises(ValueError):
+                VectorIndex.load(path)
+
+    def test_batch_matches_single_queries(self):
+        queries = ['launch calc', 'kill browsers', 'time']
+        batch = self.index.search_batch(queries, 3)
+        self.assertEqual(batch, [self.index.search(q, 3) for q in queries])
+
+    def test_numpy_and_python_scoring_agree(self):
+        if vector_index.load_numpy() is None:
+            self.skipTest('NumPy is not installed')
+        queries = ['launch calc', 'kill browsers', 'check the weather', 'xylophone']
+        with_numpy = self.index.search_batch(queries, 4)
+        with patch.object(vector_index, '_numpy', lambda load: None):
+            without = self.index.search_batch(queries, 4)
+        for a, b in zip(with_numpy, without):
+            self.assertEqual([d for d, _ in a], [d for d, _ in b])
+
+    def test_blend_scales_bm25_to_the_top_hit(self):
+        keyword = [('a', 10.0), ('b', 5.0)]
+        vector = [('c', 0.9), ('b', 0.6)]
+        ranked = blend(keyword, vector, 0.5, 3)
+        self.assertEqual([d for d, _ in ranked], ['b', 'a', 'c'])
+        self.assertAlmostEqual(dict(ranked)['b'], 0.25 + 0.3)
+
+
+class TestSemanticIndexRetrievers(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scripts_dir = os.path.join(self.tmp.name, 'scripts')
+        self.index_file = os.path.join(self.tmp.name, 'semantic_index.json')
+        os.makedirs(self.scripts_dir)
+        self._write('open-calculator.ps1', 'Launches the calculator')
+        self._write('check-battery.ps1', 'Checks the battery')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, synopsis):
+        with open(os.path.join(self.scripts_dir, name), 'w', encoding='utf-8') as f:
+            f.write(f"<#\n.SYNOPSIS\n\t{synopsis}.\n#>\n")
+
+    def _index(self, retriever='hybrid'):
+        # Without query normalization, which would repair 'calculater' for every retriever
+        return SemanticIndex(scripts_dir=self.scripts_dir, index_file=self.index_file, retriever=retriever,
+                             normalize=False)
+
+    def test_hybrid_finds_misspellings_keyword_misses(self):
+        self.assertEqual(self._index('keyword').search('calculater'), [])
+        results = self._index('hybrid').search('calculater')
+        self.assertEqual(results[0]['id'], 'open-calculator')
+        self.assertEqual(results[0]['description'], 'Launches the calculator')
+
+    def test_vectors_are_persisted_and_rebuilt_when_scripts_change(self):
+        index = self._index()
+        index.search('battery')
+        vector_file = index.vector_file
+        self.assertTrue(os.path.exists(vector_file))
+
+        with patch.object(VectorIndex, 'from_scripts', side_effect=AssertionError('rebuilt')):
+            self.assertEqual(self._index().search('battery')[0]['id'], 'check-battery')
+
+        self._write('check-weather.ps1', 'Checks the weather')
+        self.assertEqual(self._index('vector').search('weathr')[0]['id'], 'check-weather')
+
+    def test_unknown_retriever_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._index('neural')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.agent.core.worker_pools import InstrumentedThreadPool, WorkerPools
+
+
+class TestInstrumentedThreadPool(unittest.TestCase):
+    def test_queue_depth_and_wait_time(self):
+        pool = InstrumentedThreadPool('test', max_workers=1)
+        self.addCleanup(pool.shutdown)
+        release = threading.Event()
+        blocker = pool.submit(release.wait)
+        queued = [pool.submit(time.sleep, 0) for _ in range(3)]
+        time.sleep(0.05)
+        stats = pool.stats()
+        self.assertEqual((stats['active'], stats['queued']), (1, 3))
+        release.set()
+        for future in [blocker] + queued:
+            future.result(timeout=1)
+        stats = pool.stats()
+        self.assertEqual((stats['submitted'], stats['completed'], stats['queued']), (4, 4, 0))
+        self.assertGreaterEqual(stats['max_wait_ms'], 40)
+
+    def test_failures_are_counted(self):
+        pool = InstrumentedThreadPool('test', max_workers=1)
+        self.addCleanup(pool.shutdown)
+        with self.assertRaises(ZeroDivisionError):
+            pool.submit(lambda: 1 / 0).result()
+        self.assertEqual(pool.stats()['failed'], 1)
+
+    def test_works_with_run_in_executor(self):
+        pool = InstrumentedThreadPool('test', max_workers=2)
+        self.addCleanup(pool.shutdown)
+
+        async def main():
+            return await asyncio.get_event_loop().run_in_executor(pool, threading.current_thread)
+
+        self.assertTrue(asyncio.run(main()).name.startswith('t2w-test'))
+
+
+class TestWorkerPools(unittest.TestCase):
+    def test_pending_prompt_does_not_starve_scripts(self):
+        pools = WorkerPools()
+        self.addCleanup(pools.shutdown)
+        release = threading.Event()
+        pools.get('prompt').submit(release.wait)
+        pools.get('prompt').submit(release.wait)
+        start = time.perf_counter()
+        self.assertEqual(pools.get('script').submit(lambda: 'ran').result(timeout=1), 'ran')
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(pools.stats()['prompt']['queued'], 1)
+        release.set()
+
+    @patch.dict(os.environ, {'TALK2WINDOWS_SCRIPT_WORKERS': '7'})
+    def test_sizes_from_environment(self):
+        pools = WorkerPools(sizes={'prompt': 2})
+        self.addCleanup(pools.shutdown)
+        self.assertEqual(pools.get('script').max_workers, 7)
+        self.assertEqual(pools.get('prompt').max_workers, 2)
+        self.assertEqual(pools.get('llm').max_workers, 4)
+
+    def test_shutdown(self):
+        pools = WorkerPools()
+        pools.get('llm').submit(time.sleep, 0).result()
+        pools.shutdown()
+        with self.assertRaises(RuntimeError):
+            pools.get('llm')
+        with self.assertRaises(KeyError):
+            WorkerPools().get('gpu')
+
+
+if __name__ == '__main__':
+    unittest.main()